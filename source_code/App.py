@@ -6,25 +6,36 @@ Date/version: 08/04/05 v2
 Purpose: 
 """
 from Ship import Ship
-from StarMap import StarMap
 from Control_Panel import Control_Panel
-from celestial_map import get_initial_planets
-from celestial_map import celestial_map
-from load_artifacts import get_game_data
+from GameEngine import GameEngine
+from Replay import record_session
+import instrumentation
+import shared_items
 
 class App:
-    def __init__(self):
-        game_data = get_game_data()     # Fn short, - consider removing this
-        initial_planets = get_initial_planets(game_data)
-        self.ship = Ship("G.S.S. Old Spice", (0, 0))
-        self.star_map = StarMap(game_data["planets"], game_data["target"], game_data["artifacts"])
-        self.cel_map = celestial_map(initial_planets)
-        self.control_panel = Control_Panel(self.ship)
+    def __init__(self, record_path=None):
+        # Time the hot paths for the STATS panel, written to shared_items.stats_file on exit
+        if shared_items.instrumentation:
+            instrumentation.enable()
+        # The engine owns the ship, star map and celestial map, the control panel is a view on it
+        self.engine = GameEngine(Ship("G.S.S. Old Spice", (0, 0), headless=True))
+        # Optionally log every command so the session can be replayed (see Replay.py)
+        self.recorder = record_session(self.engine, record_path) if record_path else None
+        self.ship = self.engine.ship
+        self.star_map = self.engine.star_map
+        self.cel_map = self.engine.cel_map
+        self.control_panel = Control_Panel(self.ship, self.engine)
 
     def run(self):
         if self.ship and self.star_map:
             # Start the GUI control panel
-            self.control_panel.start_gui_loop()
+            try:
+                self.control_panel.start_gui_loop()
+            finally:
+                if self.recorder:
+                    self.recorder.close()
+                if instrumentation.is_enabled():
+                    instrumentation.export_json(shared_items.stats_file)
         else:
             # Show error dialog if initialization failed
             try:
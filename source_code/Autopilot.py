@@ -0,0 +1,164 @@
+"""
+Autopilot Class
+
+Plans energy-optimal routes with A* over the unit grid the ship can fly
+without hitting a wormhole (every cell within +-shared_items.max) and flies
+them through the GameEngine. Each unit step costs the energy of the ship's
+engine (Ship.engine_type) and its supply usage, so the cheapest route is the
+shortest one that avoids hazards: ASTEROID and BAD-MAX artifacts are never
+flown through (unless they sit on the goal itself).
+
+Routes are cached per (start, goal, engine type, map boundary) and dropped
+only when the star map changes (StarMap.revision, bumped by
+StarMap.invalidate_index).
+
+Methods:
+    plan(start, goal): Cheapest Route between two cells, None when unreachable
+    plan_to_target(): Route from the ship to the star map's target
+    engage(goal): Fly the route in one batched loop, return the events
+"""
+import heapq
+from typing import NamedTuple
+
+import shared_items
+
+# Artifact types the autopilot steers around
+HAZARDS = ("ASTEROID", "BAD-MAX")
+
+# Direction -> unit step, in the order neighbours are expanded
+_STEPS = {
+    "up": (0, 1),
+    "down": (0, -1),
+    "left": (-1, 0),
+    "right": (1, 0),
+}
+
+
+class Route(NamedTuple):
+    """A planned flight"""
+    directions: tuple       # one GameEngine direction per unit step
+    energy: float           # energy the flight will use
+    supplies: float         # supplies the flight will use
+
+
+class Autopilot:
+
+    def __init__(self, engine):
+        """ Autopilot for the ship of a GameEngine
+
+            Args:
+                engine (GameEngine): Game whose ship and star map are used
+        """
+        self.engine = engine
+        self._routes = {}
+        self._hazards = None
+        self._revision = None
+
+    def _check_revision(self):
+        star_map = self.engine.star_map
+        if self._revision != star_map.revision:
+            self._routes = {}
+            self._hazards = {(data["x"], data["y"]) for data in star_map.artifacts.values()
+                             if data["type"] in HAZARDS}
+            self._revision = star_map.revision
+
+    def plan(self, start, goal):
+        """ Cheapest route from start to goal with the ship's current engine
+
+            Args:
+                start (tuple): (x, y) cell to leave from
+                goal (tuple): (x, y) cell to reach
+
+            Returns:
+                Route: The route, None when goal is outside the boundary or walled in by hazards
+        """
+        self._check_revision()
+        start = (int(start[0]), int(start[1]))
+        goal = (int(goal[0]), int(goal[1]))
+        engine_type = self.engine.ship._engine_type
+        key = (start, goal, engine_type, shared_items.max)
+        if key in self._routes:
+            return self._routes[key]
+
+        step_energy = self.engine.ship.engine_type(engine_type)
+        directions = self._search(start, goal, shared_items.max)
+        route = None
+        if directions is not None:
+            route = Route(directions, step_energy * len(directions),
+                          shared_items.supply_useage * len(directions))
+        self._routes[key] = route
+        return route
+
+    def _search(self, start, goal, boundary):
+        # Uniform step cost, so A* runs on step counts with the Manhattan distance as heuristic
+        def inside(cell):
+            return -boundary <= cell[0] <= boundary and -boundary <= cell[1] <= boundary
+
+        if not inside(start) or not inside(goal):
+            return None
+        hazards = self._hazards
+        gx, gy = goal
+        came_from = {start: None}
+        cost = {start: 0}
+        frontier = [(abs(gx - start[0]) + abs(gy - start[1]), 0, start)]
+        while frontier:
+            _, steps, cell = heapq.heappop(frontier)
+            if cell == goal:
+                break
+            if steps > cost[cell]:
+                continue
+            for direction, (dx, dy) in _STEPS.items():
+                nxt = (cell[0] + dx, cell[1] + dy)
+                if not inside(nxt) or (nxt in hazards and nxt != goal):
+                    continue
+                if nxt not in cost or steps + 1 < cost[nxt]:
+                    cost[nxt] = steps + 1
+                    came_from[nxt] = (cell, direction)
+                    heapq.heappush(frontier, (steps + 1 + abs(gx - nxt[0]) + abs(gy - nxt[1]), steps + 1, nxt))
+        else:
+            return None
+
+        directions = []
+        cell = goal
+        while came_from[cell] is not None:
+            cell, direction = came_from[cell]
+            directions.append(direction)
+        return tuple(reversed(directions))
+
+    def plan_to_target(self):
+        """Route from the ship's position to the target planet, None when there is none"""
+        star_map = self.engine.star_map
+        if star_map.target not in star_map.planets:
+            return None
+        return self.plan(self.engine.ship.debug_position(), star_map.planets[star_map.target])
+
+    def engage(self, goal=None) -> list:
+        """ Fly to goal (the target planet when None)
+
+            Consecutive steps in one direction are flown as a single multi-unit
+            engine step. The flight stops early when the ship dies or a wormhole
+            moves it off the route.
+
+            Returns:
+                list: Events of the flight, empty when there is no route
+        """
+        if goal is None:
+            route = self.plan_to_target()
+        else:
+            route = self.plan(self.engine.ship.debug_position(), goal)
+        if route is None:
+            return []
+
+        events = []
+        directions = route.directions
+        i = 0
+        while i < len(directions) and not self.engine.game_over:
+            run = 1
+            while i + run < len(directions) and directions[i + run] == directions[i]:
+                run += 1
+            step_events = self.engine.step(directions[i], run)
+            events.extend(step_events)
+            if any(event["type"] == "wormhole" for event in step_events):
+                break
+            i += run
+        return events
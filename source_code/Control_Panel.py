@@ -13,34 +13,48 @@ NOTE: When you add more functionality to the control panel, if it is supposed to
 - Hayden Chalin
 """
 
+import time
+from collections import deque
 import tkinter as tk
-from tkinter import messagebox
 from tkinter import Toplevel
 from Sensor import Sensor
-import load_artifacts
-from celestial_map import celestial_map
-from celestial_map import get_initial_planets
-import Ship
+from MapView import MapView
+from Autopilot import Autopilot
+import instrumentation
+import GameEngine
+
+# Display changes are flushed at most once per frame
+FRAME_MS = 16
+# Lines kept in the event log
+LOG_LINES = 100
+# Movement keys, arrows and WASD
+KEY_DIRECTIONS = {
+    "Up": "up", "w": "up", "W": "up",
+    "Down": "down", "s": "down", "S": "down",
+    "Left": "left", "a": "left", "A": "left",
+    "Right": "right", "d": "right", "D": "right",
+}
 
 # TODO: Consder making the control panel a derived ship class so you're not redefining ship location, supplies etc...
 
 class Control_Panel:
-    def __init__(self, ship):
-        self.ship = ship # Ship.Ship()
+    def __init__(self, ship, engine=None):
+        # The control panel is a view, the engine runs the game (see GameEngine.py)
+        self.engine = engine if engine is not None else GameEngine.GameEngine(ship)
+        self.engine.on_event = self._handle_event
+        self.ship = self.engine.ship # Ship.Ship()
         self.sensor = Sensor()
         self.running = False
         self.gui_root = None
-        
-        # Load game data
-        game_data = load_artifacts.get_game_data()          # This is redundant, but kept for clarity
-
-        # Load the celestial map
-        initial_planets = get_initial_planets(game_data)
-        self.artifacts = game_data["artifacts"]
-        self.planets = game_data["planets"]
-        self.target_planet = game_data["target"]
-        
-        self.map = celestial_map(initial_planets)
+        self.map_view = None
+
+        self.artifacts = self.engine.star_map.artifacts
+        self.planets = self.engine.star_map.planets
+        self.target_planet = self.engine.star_map.target
+
+        # The celestial map is owned by the engine
+        self.map = self.engine.cel_map
+        self.autopilot = Autopilot(self.engine)
 
         # GUI elements (will be set when GUI is created)
         self.location_field = self.ship.debug_position()
@@ -48,6 +62,23 @@ class Control_Panel:
         self.supplies_field = self.ship.debug_supplies()
         self.money_field = self.ship.debug_money()
         self.message_field = None
+        self.nearest_field = None
+
+        # Batched display updates: fields marked dirty are redrawn once per frame
+        self._dirty = set()
+        self._shown = {}                    # field -> text currently on screen
+        self._message = "Control panel ready"
+        self._flush_pending = False
+        self._last_flush = 0.0
+
+        # Event log: notifications are queued here and shown without blocking the game
+        self.log_field = None
+        self._notifications = deque(maxlen=LOG_LINES)
+        self._game_over_popup = None
+
+        # Key presses (and key repeats) collected per direction until the next frame
+        self._held_moves = {}
+        self._moves_pending = False
 
     
     def start_gui_loop(self):
@@ -70,25 +101,75 @@ class Control_Panel:
         """Handle ship movement in specified direction"""
 
         try:
-            match direction.lower():
-                case "up":
-                    self.ship.move(1, 90)
-                case "down":
-                    self.ship.move(1, 270)
-                case "left":
-                    self.ship.move(1, 180)
-                case "right":
-                    self.ship.move(1, 0)
-                #TODO default to raising an error
+            self.engine.step(direction.lower())
         except ValueError as msg:
             print(f"{msg} There is a value in the configuration file that is not correct")
-        except Ship.DeathException:
-            if (self.ship.debug_energy() <= 0):
-                cause = "Energy"
-            else:
-                cause = "Supplies"
 
+        self.update_display()
+        if not self.engine.game_over:
+            self._set_message(f"Move {direction.lower()}!")
+
+    def _handle_autopilot(self):
+        """Fly to the target planet, or explain why there is no route"""
+        target = self.engine.star_map.target
+        route = self.autopilot.plan_to_target()
+        if route is None:
+            self._set_message(f"No safe route to {target} inside the map boundary")
+            return
+        self.autopilot.engage()
+        self.update_display()
+        if not self.engine.game_over:
+            self._set_message(f"Autopilot: {len(route.directions)} steps to {target}, {route.energy} energy")
+
+    def _handle_key(self, event):
+        """Collect a movement key press, repeats of a held key add up until the next frame"""
+        direction = KEY_DIRECTIONS.get(event.keysym)
+        if direction is None:
+            return
+        self._held_moves[direction] = self._held_moves.get(direction, 0) + 1
+        if not self._moves_pending:
+            self._moves_pending = True
+            self.gui_root.after(FRAME_MS, self._apply_held_moves)
+
+    def _apply_held_moves(self):
+        """Apply the key presses of the last frame as one multi-unit move per direction"""
+        self._moves_pending = False
+        held, self._held_moves = self._held_moves, {}
+        for direction, count in held.items():
+            try:
+                self.engine.step(direction, count)
+            except ValueError as msg:
+                print(f"{msg} There is a value in the configuration file that is not correct")
+            if self.engine.game_over:
+                break
+            self._set_message(f"Move {direction} x{count}!" if count > 1 else f"Move {direction}!")
+        self.update_display()
+
+    def _handle_event(self, event):
+        """Present a game event published by the engine in the event log"""
+        match event["type"]:
+            case "frieghtor":
+                self.notify(f"Found an abandon frieghtor containg {event['energy']} energy and {event['supplies']} supplies")
+            case "wormhole":
+                self.notify(f"Hit a wormhole! Now at {event['position']}")
+            case "sensor":
+                if event["added"]:
+                    self.notify(f"Sensor deployed at {event['position']}")
+            case "death":
+                self.notify(f"{event['cause']} has run out. Game over.")
+                self._display_game_over(event["cause"])
+
+    def notify(self, text):
+        """Queue a line for the event log, it is drawn with the next display flush"""
+        self._notifications.append(text)
+        self._dirty.add("log")
+        self._schedule_flush()
+
+    def _display_game_over(self, cause):
+        """Show the game over popup, only one is ever created"""
+        if self.gui_root and self._game_over_popup is None:
             popup = Toplevel()
+            self._game_over_popup = popup
             popup.title("Game Over")
             popup.geometry("200x200")
 
@@ -101,13 +182,7 @@ class Control_Panel:
             close_button = tk.Button(popup, text="Close", command=self.stop)
             close_button.pack(pady=5)
 
-            self.message_field.config(text=f"You have run out of {cause}! Game over.")
-        except Ship.WormholeException:
-            print("Hit a wormhole")
-
-        self.update_display()
-        if self.message_field:
-            self.message_field.config(text=f"Move {direction.lower()}!")
+        self._set_message(f"You have run out of {cause}! Game over.")
 
     '''
     Add Sensors 
@@ -115,40 +190,50 @@ class Control_Panel:
     def _handle_sensor_deployment(self):
         """Handle sensor deployment at current ship position"""
         if self.message_field:
-            if (self.ship.addSensor(self.map)):
-                self.message_field.config(text=f"Sensor added at {self.ship.debug_position()}!!")
+            events = self.engine.step("sensor")
+            if not events:
+                return                                          # Game is over
+            if events[-1]["added"]:
+                self._set_message(f"Sensor added at {self.ship.debug_position()}!!")
             else:
-                self.message_field.config(text=f"Failed to add sensor at {self.ship.debug_position()}! Sensor already exists.")
+                self._set_message(f"Failed to add sensor at {self.ship.debug_position()}! Sensor already exists.")
+            self.update_display()
 
     
     def _display_status(self):
-        """Display current ship status in a popup window"""
+        """Post the current ship status to the event log"""
         if self.gui_root:
             status_info = (
-                f"Ship: {self.ship.debug_name()}\n"
-                f"Position: {self.ship.debug_position()}\n"
-                f"Energy: *energy*\n"
-                f"Supplies: *supplies*\n"
-                f"Money: *money*\n"
-                f"Target Planet: {self.target_planet}\n"
-                f"Planets in system: {len(self.planets)}\n"
+                f"Ship: {self.ship.debug_name()}",
+                f"Position: {self.ship.debug_position()}",
+                f"Energy: {self.ship.debug_energy()}",
+                f"Supplies: {self.ship.debug_supplies()}",
+                f"Money: {self.ship.debug_money()}",
+                f"Target Planet: {self.target_planet}",
+                f"Planets in system: {len(self.planets)}",
                 f"Artifacts detected: {len(self.artifacts)}"
             )
-            messagebox.showinfo("Ship Status", status_info)
+            self.notify("--- Ship Status ---")
+            for line in status_info:
+                self.notify(line)
             
+    def _display_stats(self):
+        """Post the instrumentation counters and timings to the event log"""
+        if self.gui_root:
+            self.notify("--- Session Stats ---")
+            if not instrumentation.is_enabled():
+                self.notify("Instrumentation is off (shared_items.instrumentation)")
+                return
+            for line in instrumentation.format_stats() or ["Nothing timed yet"]:
+                self.notify(line)
+
     def _display_cel_map(self):
-        """Display celestial map in a popup window"""
+        """Display celestial map in a persistent window that only renders the visible rows"""
         if self.gui_root:
-            info_str = self.map.print_celestial_map()
-            popup = tk.Toplevel(self.gui_root)
-            popup.title("Celestial Map")
-            popup.geometry("600x400")
-            text_widget = tk.Text(popup, wrap="none", font=("Consolas", 12))
-            text_widget.insert("1.0", info_str)
-            text_widget.config(state="disabled")
-            text_widget.pack(expand=True, fill="both", padx=10, pady=10)
-            close_btn = tk.Button(popup, text="Close", command=popup.destroy)
-            close_btn.pack(pady=5)
+            if self.map_view is None:
+                self.map_view = MapView(self.gui_root, self.map)
+            else:
+                self.map_view.show()
         
     
     def _create_gui(self):
@@ -159,7 +244,7 @@ class Control_Panel:
             self.gui_root.geometry("600x600")
             
             # Configure grid
-            for i in range(9):
+            for i in range(10):
                 self.gui_root.rowconfigure(i, weight=1)
             for i in range(9):
                 self.gui_root.columnconfigure(i, weight=1)
@@ -201,6 +286,16 @@ class Control_Panel:
             map_button = tk.Button(self.gui_root, text="Map",
                                     command=self._display_cel_map)
             map_button.grid(column=5, row=2)
+
+            # Autopilot button, flies the cheapest route to the target planet
+            autopilot_button = tk.Button(self.gui_root, text="Autopilot",
+                                    command=self._handle_autopilot)
+            autopilot_button.grid(column=6, row=2)
+
+            # Stats button, posts the instrumentation counters and timings
+            stats_button = tk.Button(self.gui_root, text="STATS",
+                                    command=self._display_stats)
+            stats_button.grid(column=7, row=2)
             
             # Information display
             tk.Label(self.gui_root, text="Current Location").grid(column=0, row=4)
@@ -219,14 +314,35 @@ class Control_Panel:
             self.money_field = tk.Label(self.gui_root, text="1000")
             self.money_field.grid(column=1, row=7, sticky="W")
             
+            # Nearest known planet, from the celestial map's k-d tree of recorded planets
+            tk.Label(self.gui_root, text="Nearest Planet").grid(column=3, row=4)
+            self.nearest_field = tk.Label(self.gui_root, text="")
+            self.nearest_field.grid(column=4, row=4, columnspan=5, sticky="W")
+
             tk.Label(self.gui_root, text="Message").grid(column=0, row=8)
-            self.message_field = tk.Label(self.gui_root, text="Control panel ready")
+            self.message_field = tk.Label(self.gui_root, text=self._message)
             self.message_field.grid(column=1, row=8, sticky="W")
             
             # Quit button
             quit_button = tk.Button(self.gui_root, text="QUIT", 
                                   command=self.stop, bg="red", fg="white")
             quit_button.grid(column=4, row=8)                   # Assign quit button to last row
+
+            # Event log, freighter finds, wormholes, status etc. land here instead of popups
+            tk.Label(self.gui_root, text="Events").grid(column=0, row=9, sticky="N")
+            log_frame = tk.Frame(self.gui_root)
+            log_frame.grid(column=1, row=9, columnspan=8, sticky="NSEW")
+            log_scrollbar = tk.Scrollbar(log_frame, orient="vertical")
+            log_scrollbar.pack(side="right", fill="y")
+            self.log_field = tk.Listbox(log_frame, height=6, yscrollcommand=log_scrollbar.set)
+            self.log_field.pack(side="left", expand=True, fill="both")
+            log_scrollbar.config(command=self.log_field.yview)
+            self._dirty.add("log")                              # Show anything queued before the GUI existed
+
+            # Arrow keys and WASD move the ship too
+            self.gui_root.bind("<KeyPress>", self._handle_key)
+
+            self.update_display()                               # First frame shows the live values
             
         except Exception as e:
             # If GUI creation fails, create a simple error dialog
@@ -242,20 +358,64 @@ class Control_Panel:
             self.gui_root = None
     
     def update_display(self):
-        """Update the display fields (useful for external updates)"""
-        # Update location
-        if self.location_field:
-            self.location_field.config(text=str(self.ship.debug_position()))
+        """Mark the ship fields for redraw (useful for external updates).
+        Redraws are coalesced and flushed once per frame, see _flush_display"""
+        self._dirty.update(("location", "energy", "supplies", "money", "nearest"))
+        self._schedule_flush()
+
+    def _set_message(self, text):
+        """Show text in the message field on the next frame"""
+        self._message = text
+        self._dirty.add("message")
+        self._schedule_flush()
 
-        # Update energy field
-        if self.energy_field:
-            self.energy_field.config(text=str(self.ship.debug_energy()))
+    def _schedule_flush(self):
+        if not self.gui_root or self._flush_pending:
+            return
+        self._flush_pending = True
+        wait_ms = FRAME_MS - int((time.monotonic() - self._last_flush) * 1000)
+        if wait_ms > 0:
+            self.gui_root.after(wait_ms, self._flush_display)
+        else:
+            self.gui_root.after_idle(self._flush_display)
 
-        # Update supplies field
-        if self.supplies_field:
-            self.supplies_field.config(text=f"{self.ship.debug_supplies()}")
+    def _flush_display(self):
+        """Redraw the dirty fields whose text actually changed"""
+        self._flush_pending = False
+        self._last_flush = time.monotonic()
+        fields = {
+            "location": (self.location_field, lambda: str(self.ship.debug_position())),
+            "energy": (self.energy_field, lambda: str(self.ship.debug_energy())),
+            "supplies": (self.supplies_field, lambda: f"{self.ship.debug_supplies()}"),
+            "money": (self.money_field, lambda: str(self.ship.debug_money())),
+            "nearest": (self.nearest_field, self._nearest_planet_text),
+            "message": (self.message_field, lambda: self._message),
+        }
+        if "log" in self._dirty:
+            self._dirty.discard("log")
+            self._flush_log()
+        for field in self._dirty:
+            widget, value = fields[field]
+            text = value()
+            if self._shown.get(field) != text:
+                widget.config(text=text)
+                self._shown[field] = text
+        self._dirty.clear()
 
-        # Update money field
-        if self.money_field:
-            self.money_field.config(text=str(self.ship.debug_money()))
+    def _nearest_planet_text(self):
+        found = self.map.nearest_planet(self.ship.debug_position())
+        if found is None:
+            return "None"
+        name, position, distance = found
+        return f"{name} at {position}, {distance:.1f} away"
 
+    def _flush_log(self):
+        """Append the queued notifications to the event log in one batch"""
+        if not self._notifications:
+            return
+        self.log_field.insert("end", *self._notifications)
+        self._notifications.clear()
+        overflow = self.log_field.size() - LOG_LINES
+        if overflow > 0:
+            self.log_field.delete(0, overflow - 1)
+        self.log_field.see("end")
@@ -0,0 +1,126 @@
+"""
+CoverageMap Class
+
+Bitmap of the map cells the ship's sensors have already scanned. A sensor
+with a CoverageMap only looks at the cells of its window that no earlier
+scan covered, so a dense carpet of overlapping sensors costs work
+proportional to the new area instead of the full window every time.
+
+The bitmap is split into TILE x TILE numpy tiles that are allocated the
+first time a window touches them, so it covers the shared_items.max
+boundary, the StarMap extent or any generated universe without reserving
+memory for cells nobody scanned.
+
+Methods:
+    claim(x_min, x_max, y_min, y_max): Mark a window covered, return its new cells
+    claim_cells(cells): Mark arbitrary cells (a footprint) covered, return the new ones
+    mark_windows(positions, radius, footprint): Mark many sensor footprints at once
+    is_covered(position): Whether a cell was scanned
+    clear(): Forget every scanned cell
+    snapshot() / restore(state): Copy and roll back the bitmap
+"""
+import numpy as np
+
+from sensor_masks import footprint_offsets
+
+# Cells per tile side
+TILE = 64
+
+
+class CoverageMap:
+
+    def __init__(self):
+        self._tiles = {}            # (tile x, tile y) -> bool[TILE, TILE] indexed [x, y]
+
+    def __len__(self):
+        """Number of covered cells"""
+        return int(sum(np.count_nonzero(tile) for tile in self._tiles.values()))
+
+    def _windows(self, x_min, x_max, y_min, y_max):
+        # (tile, x slice, y slice, cell x of slice start, cell y of slice start) per overlapped tile
+        for tx in range(x_min // TILE, x_max // TILE + 1):
+            x0 = max(x_min, tx * TILE)
+            x1 = min(x_max, tx * TILE + TILE - 1)
+            for ty in range(y_min // TILE, y_max // TILE + 1):
+                y0 = max(y_min, ty * TILE)
+                y1 = min(y_max, ty * TILE + TILE - 1)
+                tile = self._tiles.get((tx, ty))
+                if tile is None:
+                    tile = np.zeros((TILE, TILE), dtype=bool)
+                    self._tiles[(tx, ty)] = tile
+                yield (tile, slice(x0 - tx * TILE, x1 - tx * TILE + 1),
+                       slice(y0 - ty * TILE, y1 - ty * TILE + 1), x0, y0)
+
+    def claim(self, x_min, x_max, y_min, y_max) -> np.ndarray:
+        """ Mark the window covered, bounds inclusive
+
+            Returns:
+                np.ndarray: (N, 2) int array of the (x, y) cells that weren't covered yet
+        """
+        fresh = []
+        for tile, xs, ys, x0, y0 in self._windows(x_min, x_max, y_min, y_max):
+            view = tile[xs, ys]
+            new = np.argwhere(~view)
+            if len(new):
+                view[...] = True
+                new += (x0, y0)
+                fresh.append(new)
+        if not fresh:
+            return np.empty((0, 2), dtype=np.int64)
+        return np.concatenate(fresh) if len(fresh) > 1 else fresh[0]
+
+    def claim_cells(self, cells) -> np.ndarray:
+        """ Mark the given cells covered
+
+            Args:
+                cells: (N, 2) int array of distinct (x, y) cells
+
+            Returns:
+                np.ndarray: The rows of cells that weren't covered yet
+        """
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        tile_x = cells[:, 0] // TILE
+        tile_y = cells[:, 1] // TILE
+        fresh = np.zeros(len(cells), dtype=bool)
+        for key in set(zip(tile_x.tolist(), tile_y.tolist())):
+            tile = self._tiles.get(key)
+            if tile is None:
+                tile = np.zeros((TILE, TILE), dtype=bool)
+                self._tiles[key] = tile
+            rows = np.nonzero((tile_x == key[0]) & (tile_y == key[1]))[0]
+            local_x = cells[rows, 0] - key[0] * TILE
+            local_y = cells[rows, 1] - key[1] * TILE
+            fresh[rows] = ~tile[local_x, local_y]
+            tile[local_x, local_y] = True
+        return cells[fresh]
+
+    def mark_windows(self, positions, radius, footprint="square") -> None:
+        """Mark the footprint of radius around every position, without reporting new cells"""
+        if footprint != "square":
+            offsets = footprint_offsets(radius, footprint)
+            for x, y in positions:
+                self.claim_cells(offsets + (x, y))
+            return
+        for x, y in positions:
+            for tile, xs, ys, _, _ in self._windows(x - radius, x + radius, y - radius, y + radius):
+                tile[xs, ys] = True
+
+    def is_covered(self, position) -> bool:
+        x, y = int(position[0]), int(position[1])
+        tile = self._tiles.get((x // TILE, y // TILE))
+        return tile is not None and bool(tile[x % TILE, y % TILE])
+
+    def clear(self) -> None:
+        self._tiles = {}
+
+    def snapshot(self) -> dict:
+        """Packed copy of the bitmap, (tile x, tile y) -> bytes"""
+        return {key: np.packbits(tile).tobytes() for key, tile in self._tiles.items()}
+
+    def restore(self, state: dict) -> None:
+        """Replace the bitmap with a snapshot() copy"""
+        self._tiles = {
+            key: np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=TILE * TILE)
+                   .astype(bool).reshape(TILE, TILE)
+            for key, bits in state.items()
+        }
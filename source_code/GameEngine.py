@@ -0,0 +1,164 @@
+"""
+GameEngine Class
+
+Headless simulation of one game of the G.S.S. Old Spice. The engine owns the
+Ship, its StarMap, the celestial map and the ship's sensors, and turns
+commands into events without touching tkinter, so games can be simulated
+without a display (tests, CI, load tests). Control_Panel is a view on top of it.
+
+Commands:
+    'up', 'down', 'left', 'right': Move the ship one unit (or repeat units) in that direction
+    'sensor': Deploy a sensor at the ship's current position
+
+Events are dicts with a 'type' key:
+    {'type': 'move', 'direction': str, 'position': (x, y)}
+    {'type': 'frieghtor', 'energy': float, 'supplies': float}
+    {'type': 'wormhole', 'position': (x, y)}
+    {'type': 'death', 'cause': 'Energy' | 'Supplies'}
+    {'type': 'sensor', 'position': (x, y), 'added': bool}
+
+Methods:
+    step(command, repeat): Run one command, return the list of events it produced
+    run(commands): Run commands until they run out or the ship dies, return all events
+    add_command_listener(listener): Get every command once it ran (see Replay.py)
+    snapshot() / restore(state): Copy and roll back the whole game state
+"""
+import secrets
+
+import Ship
+from GameRNG import GameRNG
+from celestial_map import celestial_map, get_initial_planets
+
+# Movement command -> Ship.move angle
+DIRECTIONS = {
+    "up": 90,
+    "down": 270,
+    "left": 180,
+    "right": 0,
+}
+
+
+class GameEngine:
+
+    def __init__(self, ship=None, name="G.S.S. Old Spice", on_event=None, seed=None, rng=None, star_map=None):
+        """ Build a game around an existing ship or a new headless one
+
+            Args:
+                ship (Ship): Ship to drive, a headless Ship is created when None
+                name (str): Name of the ship created when ship is None
+                on_event (callable): Called with every event as it happens
+                seed: Seed for a new GameRNG, the same seed and commands replay the same game.
+                      A random seed is picked when None, it is kept in engine.seed
+                rng (GameRNG): Stream to use instead of seeding a new one
+                star_map (StarMap): Star map for the ship created when ship is None,
+                                    ARTIFACT.TXT is not read when one is given
+        """
+        if rng is None:
+            if seed is None:
+                seed = secrets.randbits(63)
+            rng = GameRNG(seed)
+        if ship is None:
+            ship = Ship.Ship(name, (0, 0), headless=True, rng=rng, star_map=star_map)
+        else:
+            ship.set_rng(rng)
+        self.ship = ship
+        self.rng = rng
+        self.seed = seed
+        self.star_map = ship.star_map
+        # Always the planets of the map the ship flies on, which may not be ARTIFACT.TXT
+        self.cel_map = celestial_map(get_initial_planets({"planets": self.star_map.planets}))
+        self.on_event = on_event
+        self.game_over = False
+        self.steps = 0
+        self._events = None
+        self._command_listeners = []
+
+        self.ship.set_event_handler(self._emit)
+
+    @property
+    def sensors(self):
+        """The ship's SensorRegistry"""
+        return self.ship._sensors
+
+    def _emit(self, event: dict):
+        if self._events is not None:
+            self._events.append(event)
+        if self.on_event:
+            self.on_event(event)
+
+    def add_command_listener(self, listener):
+        """Call listener(command, units) after every valid command, units being the
+        units a move actually flew (fewer than asked when the ship died) and 1 otherwise"""
+        self._command_listeners.append(listener)
+
+    def step(self, command: str, repeat: int = 1) -> list:
+        """Run a single command and return the events it produced.
+        Moves with repeat > 1 travel that many units, each one paying supplies and
+        checking freighters, vitals and wormholes like a single move, so the game
+        ends up exactly where repeat single moves would take it"""
+        if self.game_over:
+            return []
+        if command not in DIRECTIONS and command != "sensor":
+            raise ValueError(f"Unknown command {command!r}")
+
+        events = []
+        self._events = events
+        units = 1
+        try:
+            if command in DIRECTIONS:
+                units = self._move(command, repeat)
+            elif command == "sensor":
+                added = bool(self.ship.addSensor(self.cel_map))
+                self._emit({"type": "sensor", "position": tuple(self.ship.debug_position()), "added": added})
+        finally:
+            self._events = None
+        self.steps += 1
+        for listener in self._command_listeners:
+            listener(command, units)
+        return events
+
+    def _move(self, direction: str, repeat: int) -> int:
+        # A wormhole doesn't end the batch, the remaining units are flown from the exit,
+        # only death does. Returns the units flown.
+        angle = DIRECTIONS[direction]
+        flown = 0
+        while flown < repeat:
+            flown += 1
+            try:
+                self.ship.move(1, angle)
+            except Ship.DeathException:
+                self.game_over = True
+                cause = "Energy" if self.ship.debug_energy() <= 0 else "Supplies"
+                self._emit({"type": "death", "cause": cause})
+                break
+            except Ship.WormholeException:
+                self._emit({"type": "wormhole", "position": tuple(self.ship.debug_position())})
+        self._emit({"type": "move", "direction": direction, "position": tuple(self.ship.debug_position())})
+        return flown
+
+    def snapshot(self) -> dict:
+        """Copy of the ship, sensors, celestial map, random stream and progress"""
+        return {
+            "ship": self.ship.get_state(),
+            "cel_map": self.cel_map.snapshot(),
+            "rng": self.rng.getstate(),
+            "game_over": self.game_over,
+            "steps": self.steps,
+        }
+
+    def restore(self, state: dict):
+        """Roll the game back (or forward) to a snapshot() copy"""
+        self.ship.set_state(state["ship"])
+        self.cel_map.restore(state["cel_map"])
+        self.rng.setstate(state["rng"])
+        self.game_over = state["game_over"]
+        self.steps = state["steps"]
+
+    def run(self, commands) -> list:
+        """Run commands in order until they run out or the game ends"""
+        events = []
+        for command in commands:
+            if self.game_over:
+                break
+            events.extend(self.step(command))
+        return events
@@ -0,0 +1,61 @@
+"""
+GameRNG Class
+
+Random number stream for one game. Ship, AbandonFrieghtor and MovingEntity
+draw from the GameRNG they were given instead of the global random module,
+so a game played with the same seed and the same commands is reproduced
+bit for bit, and games running side by side (param_sweep, tests) don't
+disturb each other.
+
+Draws come from a random.Random. The game draws one number at a time and a
+multi-unit move has to draw exactly what the single moves would, so there is
+no batched mode: monte_carlo draws its vectors from NumPy directly.
+
+Methods:
+    seed(seed): Restart the stream
+    random(): Float in [0.0, 1.0)
+    choice(seq): Random element of a non-empty sequence
+    getstate() / setstate(state): Snapshot and restore the stream position
+"""
+import hashlib
+import random as _random
+
+
+def _stream_seed(seed):
+    # random.Random seeds with abs(n), -n would repeat the stream of n, so negative seeds are digested
+    if isinstance(seed, int) and seed < 0:
+        return int.from_bytes(hashlib.sha256(str(seed).encode()).digest(), "big")
+    return seed
+
+
+class GameRNG:
+
+    def __init__(self, seed=None):
+        """ Create a stream
+
+            Args:
+                seed: Any int or str, None seeds from the operating system
+        """
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Restart the stream from seed"""
+        self._random = _random.Random(_stream_seed(seed))
+
+    def random(self) -> float:
+        """Next float in [0.0, 1.0)"""
+        return self._random.random()
+
+    def choice(self, seq):
+        """Random element of a non-empty sequence"""
+        if not seq:
+            raise IndexError("Cannot choose from an empty sequence")
+        return seq[int(self.random() * len(seq))]
+
+    def getstate(self):
+        """Snapshot of the stream position as a random.Random state, setstate() continues from it"""
+        return self._random.getstate()
+
+    def setstate(self, state):
+        """Continue the stream from a getstate() snapshot"""
+        self._random.setstate(state)
@@ -0,0 +1,116 @@
+"""
+KDTree Class
+
+Static 2-d tree over a set of (x, y) points for nearest-neighbour and
+radius queries in O(log N) instead of a pass over every point. The tree is
+balanced (median splits on the axis with the larger spread) and stored in
+flat lists, node i holding the point index, split axis and child nodes.
+
+Distances are Euclidean. Ties are broken by point index so results are
+deterministic.
+
+Methods:
+    __init__(points): Build the tree over an (N, 2) array-like of points
+    nearest(x, y, k): The k closest (distance, index) pairs, closest first
+    within(x, y, radius): Indices of the points at most radius away, ascending
+"""
+import heapq
+import math
+
+import numpy as np
+
+# Subtrees this small are built with a plain sort instead of numpy partitioning
+_SMALL = 16
+
+
+class KDTree:
+
+    def __init__(self, points):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._xs = points[:, 0].tolist()
+        self._ys = points[:, 1].tolist()
+        n = len(points)
+        self._point = [0] * n           # node -> point index
+        self._axis = [0] * n            # node -> 0 split on x, 1 split on y
+        self._left = [-1] * n           # node -> left child node, -1 for none
+        self._right = [-1] * n
+        self._next = 0
+        self._root = self._build(points, np.arange(n)) if n else -1
+
+    def __len__(self):
+        return len(self._point)
+
+    def _build(self, points, indices):
+        node = self._next
+        self._next += 1
+        spread = np.ptp(points[indices], axis=0)
+        axis = 0 if spread[0] >= spread[1] else 1
+        mid = len(indices) // 2
+        if len(indices) <= _SMALL:
+            coords = self._xs if axis == 0 else self._ys
+            ordered = sorted(indices.tolist(), key=lambda i: (coords[i], i))
+            indices = np.array(ordered, dtype=np.int64)
+        else:
+            indices = indices[np.argpartition(points[indices, axis], mid)]
+        self._point[node] = int(indices[mid])
+        self._axis[node] = axis
+        if mid > 0:
+            self._left[node] = self._build(points, indices[:mid])
+        if mid + 1 < len(indices):
+            self._right[node] = self._build(points, indices[mid + 1:])
+        return node
+
+    def nearest(self, x, y, k: int = 1) -> list:
+        """ The k points closest to (x, y)
+
+            Returns:
+                list: (distance, point index) pairs, closest first, at most k of them
+        """
+        if k < 1 or self._root < 0:
+            return []
+        xs, ys, point, axis, left, right = self._xs, self._ys, self._point, self._axis, self._left, self._right
+        best = []                       # max-heap of (-squared distance, -index)
+        stack = [(self._root, 0.0)]
+        while stack:
+            node, bound = stack.pop()
+            if len(best) == k and bound > -best[0][0]:
+                continue
+            i = point[node]
+            dx = xs[i] - x
+            dy = ys[i] - y
+            item = (-(dx * dx + dy * dy), -i)
+            if len(best) < k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+            diff = dx if axis[node] == 0 else dy          # split coordinate - query coordinate
+            near, far = (left[node], right[node]) if diff > 0 else (right[node], left[node])
+            if far >= 0:
+                stack.append((far, diff * diff))
+            if near >= 0:
+                stack.append((near, 0.0))
+        return [(math.sqrt(-d), -i) for d, i in sorted(best, reverse=True)]
+
+    def within(self, x, y, radius) -> list:
+        """Indices of the points at most radius from (x, y), in ascending order"""
+        if self._root < 0 or radius < 0:
+            return []
+        xs, ys, point, axis, left, right = self._xs, self._ys, self._point, self._axis, self._left, self._right
+        limit = radius * radius
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            i = point[node]
+            dx = xs[i] - x
+            dy = ys[i] - y
+            if dx * dx + dy * dy <= limit:
+                found.append(i)
+            diff = dx if axis[node] == 0 else dy
+            if left[node] >= 0 and diff >= -radius:       # left side holds coordinates <= the split
+                stack.append(left[node])
+            if right[node] >= 0 and diff <= radius:
+                stack.append(right[node])
+        found.sort()
+        return found
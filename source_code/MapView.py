@@ -0,0 +1,126 @@
+"""
+MapView Class
+
+Persistent, virtualized window for the celestial map. Only the rows that fit in
+the window are put into the Text widget, the scrollbar is driven by hand over
+the full line count, and new discoveries arrive through
+celestial_map.add_line_listener instead of rebuilding the whole map string;
+a restored map (a loaded game, a replay seek) redraws the visible rows.
+Closing the window only hides it, pressing Map again shows it with any lines
+added in the meantime.
+
+Methods:
+    __init__(root, cel_map): Create the window and subscribe to map updates
+    show(): Bring the (possibly hidden) window back
+    refresh(): Schedule a redraw of the visible rows
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+
+
+class MapView:
+
+    def __init__(self, root, cel_map):
+        self.cel_map = cel_map
+        self._root = root
+        self._top = 0                   # index of the first visible line
+        self._follow = True             # keep the newest lines in view while at the bottom
+        self._redraw_pending = False
+
+        self.window = tk.Toplevel(root)
+        self.window.title("Celestial Map")
+        self.window.geometry("600x400")
+        self.window.protocol("WM_DELETE_WINDOW", self.hide)
+
+        tk.Label(self.window, text="=== CELESTIAL MAP VISITS ===", font=("Consolas", 12)).pack(pady=(10, 0))
+        body = tk.Frame(self.window)
+        body.pack(expand=True, fill="both", padx=10, pady=10)
+        self.scrollbar = tk.Scrollbar(body, orient="vertical", command=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
+        self.text_widget = tk.Text(body, wrap="none", font=("Consolas", 12))
+        self.text_widget.pack(side="left", expand=True, fill="both")
+        self._line_height = tkfont.Font(root=root, font=self.text_widget.cget("font")).metrics("linespace")
+        # Rows that fit, kept by <Configure> so map updates don't query the geometry;
+        # the widget's configured height until it has been laid out
+        self._rows = int(self.text_widget.cget("height"))
+        self.text_widget.bind("<Configure>", self._on_configure)
+        self.text_widget.bind("<MouseWheel>", lambda event: self._scroll_by(-1 if event.delta > 0 else 1, "units"))
+        self.text_widget.bind("<Button-4>", lambda event: self._scroll_by(-1, "units"))
+        self.text_widget.bind("<Button-5>", lambda event: self._scroll_by(1, "units"))
+        close_btn = tk.Button(self.window, text="Close", command=self.hide)
+        close_btn.pack(pady=5)
+
+        self.cel_map.add_line_listener(self._on_line)
+        self.refresh()
+
+    def show(self):
+        """Show the window again after it was closed"""
+        self.window.deiconify()
+        self.window.lift()
+        self.refresh()
+
+    def hide(self):
+        self.window.withdraw()
+
+    def _on_configure(self, event):
+        if event.height > 1:
+            self._rows = max(1, event.height // self._line_height)
+        self.refresh()
+
+    def _visible_rows(self):
+        return self._rows
+
+    def _on_line(self, index, appended):
+        rows = self._visible_rows()
+        if index is None:               # The map was restored, every line may have changed
+            if self._follow:
+                self._top = max(0, self.cel_map.line_count() - rows)
+            self.refresh()
+        elif appended and self._follow:
+            self._top = max(0, self.cel_map.line_count() - rows)
+            self.refresh()
+        elif appended or self._top <= index < self._top + rows:
+            self.refresh()              # New lines below only move the scrollbar
+
+    def refresh(self):
+        """Redraw the visible rows once the event loop is idle, repeated calls coalesce"""
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.window.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        if self.window.state() == "withdrawn":
+            return                      # Redrawn by show()
+        total = self.cel_map.line_count()
+        rows = self._visible_rows()
+        self._top = max(0, min(self._top, total - rows))
+        lines = self.cel_map.rendered_lines(self._top, self._top + rows)
+        if not lines and total == 0:
+            lines = ["No locations visited yet."]
+
+        self.text_widget.config(state="normal")
+        self.text_widget.delete("1.0", "end")
+        self.text_widget.insert("1.0", "\n".join(lines))
+        self.text_widget.config(state="disabled")
+
+        if total:
+            self.scrollbar.set(self._top / total, min(1.0, (self._top + rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self._follow = self._top + rows >= total
+
+    def _scroll_by(self, amount, what):
+        rows = self._visible_rows()
+        step = rows if what.startswith("page") else 1
+        self._top = max(0, self._top + int(amount) * step)
+        self._follow = False
+        self.refresh()
+
+    def _on_scroll(self, action, *args):
+        if action == "moveto":
+            self._top = int(float(args[0]) * self.cel_map.line_count())
+            self._follow = False
+            self.refresh()
+        elif action == "scroll":
+            self._scroll_by(args[0], args[1])
@@ -0,0 +1,177 @@
+"""
+Session recording and replay
+
+A session is stored as a compact binary input log: a header with the
+GameRNG seed, then one byte per command in the order the player
+gave them (a held key batched into one multi-unit move is stored as the
+single moves it actually flew, the outcome is the same). Replaying the log against a
+fresh GameEngine with the same seed, the same ARTIFACT.TXT and the same
+shared_items reproduces the session exactly, without a display and as fast
+as the engine runs.
+
+File layout (little-endian):
+    header: magic b"OSREPLAY", version u2, seed i8
+    body:   one command code per byte, see COMMANDS
+
+Classes:
+    InputRecorder(path, seed): Append commands to a new log
+    InputLog: A log read back into memory
+    ReplayEngine(log, checkpoint_interval): Play a log, seek anywhere in it
+
+Functions:
+    record_session(engine, path): Record every command the engine runs
+    read_input_log(path): Load a log file
+"""
+import contextlib
+import os
+import struct
+
+from GameEngine import GameEngine
+from GameRNG import GameRNG
+
+MAGIC = b"OSREPLAY"
+VERSION = 1
+_HEADER = struct.Struct("<8sHq")
+
+# Command -> byte code, the order is part of the file format
+COMMANDS = ("up", "down", "left", "right", "sensor")
+_CODES = {command: code for code, command in enumerate(COMMANDS)}
+
+
+class InputRecorder:
+
+    def __init__(self, path, seed: int):
+        """ Start a new log, an existing file at path is replaced
+
+            Args:
+                path (str): Where to write the log
+                seed (int): Seed of the game's GameRNG
+        """
+        if not isinstance(seed, int):
+            raise ValueError("Sessions can only be recorded for games with an integer seed")
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(_HEADER.pack(MAGIC, VERSION, seed))
+        self._file.flush()
+
+    def record(self, command: str, units: int = 1):
+        """Append a command, a move of several units is stored as that many single moves"""
+        self._file.write(bytes([_CODES[command]]) * (units if command != "sensor" else 1))
+        self._file.flush()              # A crashed session still leaves a usable log
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def record_session(engine: GameEngine, path) -> InputRecorder:
+    """ Record every command run by engine from now on
+
+        Args:
+            engine (GameEngine): Game to record, it must have been started with a known seed
+            path (str): Where to write the log
+
+        Returns:
+            InputRecorder: Close it when the session ends
+    """
+    if engine.steps:
+        raise ValueError("Recording has to start before the first command")
+    recorder = InputRecorder(path, engine.seed)
+    engine.add_command_listener(recorder.record)
+    return recorder
+
+
+class InputLog:
+
+    def __init__(self, seed: int, commands: bytes):
+        self.seed = seed
+        self.commands = commands
+
+    def __len__(self):
+        return len(self.commands)
+
+    def command(self, index: int) -> str:
+        return COMMANDS[self.commands[index]]
+
+
+def read_input_log(path) -> InputLog:
+    """ Load a log written by InputRecorder
+
+        Args:
+            path (str): Log file
+
+        Returns:
+            InputLog: Seed and the command bytes
+    """
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a session log")
+    magic, version, seed = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} session log")
+    commands = data[_HEADER.size:]
+    if commands and max(commands) >= len(COMMANDS):
+        raise ValueError(f"{path} holds an unknown command code")
+    return InputLog(seed, commands)
+
+
+class ReplayEngine:
+
+    def __init__(self, log, checkpoint_interval: int = 0):
+        """ Prepare a headless replay positioned before the first command
+
+            Args:
+                log (InputLog | str): Log to play, or the path of one
+                checkpoint_interval (int): Keep a GameEngine snapshot every this many
+                    commands so seek() only replays from the nearest one, 0 for none
+        """
+        if not isinstance(log, InputLog):
+            log = read_input_log(log)
+        if checkpoint_interval < 0:
+            raise ValueError("checkpoint_interval can't be negative")
+        self.log = log
+        self.checkpoint_interval = checkpoint_interval
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            self.engine = GameEngine(seed=log.seed, rng=GameRNG(log.seed))
+        self.position = 0               # commands replayed so far
+        self._checkpoints = {0: self.engine.snapshot()}
+
+    def step(self) -> list:
+        """Replay the next command and return its events"""
+        if self.position >= len(self.log):
+            raise IndexError("End of the session log")
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return self._step()
+
+    def _step(self) -> list:
+        events = self.engine.step(self.log.command(self.position))
+        self.position += 1
+        if self.checkpoint_interval and self.position % self.checkpoint_interval == 0:
+            self._checkpoints.setdefault(self.position, self.engine.snapshot())
+        return events
+
+    def seek(self, index: int):
+        """ Put the game in the state it had after the first index commands
+
+            Starts from the closest checkpoint at or before index (or from the
+            current position when that is closer) and replays the rest.
+        """
+        if not 0 <= index <= len(self.log):
+            raise IndexError(f"Seek outside the session log (0..{len(self.log)})")
+        start = max(point for point in self._checkpoints if point <= index)
+        if index < self.position or start > self.position:
+            self.engine.restore(self._checkpoints[start])
+            self.position = start
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            while self.position < index:
+                self._step()
+
+    def run(self):
+        """Fast-forward to the end of the log"""
+        self.seek(len(self.log))
@@ -11,97 +11,140 @@ Attributes:
     search_radius (int): The detection range of the sensor in units
     star_map (StarMap): Reference to the star map containing known celestial objects
     celestial_map (celestial_map): Reference to the celestial map for recording discoveries
+    coverage (CoverageMap): Cells already scanned by the ship's sensors, None to always scan the whole window
+    footprint (str): "square" or "circle", defaults to shared_items.sensor_footprint
 
 Methods:
-    __init__(pos, search_radius, star_map, celestial_map): Initialize sensor with position and both maps
-    scan(pos): Scan for celestial objects within search radius and update celestial map
+    __init__(pos, search_radius, star_map, celestial_map, coverage, footprint): Initialize sensor with position and both maps
+    scan(pos, celestial_map): Scan for celestial objects within search radius and update celestial map
+    upgrade(search_radius, celestial_map): Grow the radius, scanning only the newly covered ring
+
+Scan logging is printed only while shared_items.verbose is set.
 """
 import StarMap
+import shared_items
+from sensor_masks import footprint_offsets, ring_offsets, in_footprint
 
 class Sensor:
 
-  def __init__(self, pos=(0, 0), search_radius=2, star_map: StarMap = None, celestial_map=None):
+  def __init__(self, pos=(0, 0), search_radius=2, star_map: StarMap = None, celestial_map=None, coverage=None, footprint=None):
     self.pos = pos            # Position of the Sensor
     self.search_radius = search_radius  # This will be 2 CP's in every direction
     self.star_map = star_map
     self.celestial_map = celestial_map
+    self.coverage = coverage
+    self.footprint = footprint or shared_items.sensor_footprint   # "square" or "circle", see sensor_masks
 
     # After sensor creation, start the scan
     # Then send the data to the celestial map
     ##self.scan(self.pos)
 
-  def scan(self, pos: tuple)->list:
+  def scan(self, pos: tuple, celestial_map=None)->list:
     '''
     Scan for celestial objects within the sensor's search radius.
-    Returns a list of detected objects and adds them to the celestial map.
+    Returns a list of detected objects and adds them to the celestial map
+    (the one given for this scan, otherwise the sensor's own).
+    With a coverage map only cells no earlier scan covered are looked at,
+    so only new discoveries are returned and recorded.
 
     '''
 
-    print(f'\nStart scan at position {self.pos} with radius {self.search_radius}')
+    if shared_items.verbose:
+      print(f'\nStart scan at position {self.pos} with radius {self.search_radius}')
 
-    detected_objects = []
-    
     if not self.star_map:
-      print('No star map available for scanning')
-      return detected_objects
+      if shared_items.verbose:
+        print('No star map available for scanning')
+      return []
 
     x, y = self.pos[0], self.pos[1]
-    
+
     # Define scan boundaries, search radius is 2 until upgraded
     x_min = x - self.search_radius
     x_max = x + self.search_radius
     y_min = y - self.search_radius
     y_max = y + self.search_radius
-    
-    planet_found: bool = False
-    artifact_found: bool = False
-    
-    # Check planets within range
-    for planet_name, planet_pos in self.star_map.planets.items():   # use the items method to iterate the dictionary!
-      px, py = planet_pos   # define positions
-      if x_min <= px <= x_max and y_min <= py <= y_max:
-        detected_objects.append({
-          'type': 'PLANET',
-          'name': planet_name,
-          'position': planet_pos
-        })
-        planet_found = True
-        print(f"Detected planet: {planet_name} at {planet_pos}")
-    
-    # Check artifacts within range
-    for artifact_name, artifact_data in self.star_map.artifacts.items():
-      ax, ay = artifact_data['x'], artifact_data['y']
-      if x_min <= ax <= x_max and y_min <= ay <= y_max:
-        detected_objects.append({
-          'type': artifact_data['type'],
-          'name': artifact_name, 'position': (ax, ay) })
-        artifact_found = True
-        print(f"Detected {artifact_data['type']}: {artifact_name} at ({ax}, {ay})")
-    
+
+    # Only the grid cells overlapping the window are checked, planets come back before artifacts
+    if self.footprint != "square":
+      entries = self._query_offsets(footprint_offsets(self.search_radius, self.footprint))
+    elif self.coverage is not None:
+      entries = self.star_map.query_cells(self.coverage.claim(x_min, x_max, y_min, y_max).tolist())
+    else:
+      entries = self.star_map.query_window(x, y, self.search_radius)
+    detected_objects = self._report(entries, celestial_map or self.celestial_map)
+
     '''
       Check if target is within range
     '''
     if self.star_map.target in self.star_map.planets:
       target_pos = self.star_map.planets[self.star_map.target]
       tx, ty = target_pos
-      if x_min <= tx <= x_max and y_min <= ty <= y_max:
-        print(f"TARGET DETECTED: {self.star_map.target} at {target_pos}")
-    
+      if in_footprint(tx - x, ty - y, self.search_radius, self.footprint):
+        if shared_items.verbose:
+          print(f"TARGET DETECTED: {self.star_map.target} at {target_pos}")
+
+    if shared_items.verbose:
+      print(f"Scan complete. Found {len(detected_objects)} objects.")
+    return detected_objects
+
+  def upgrade(self, search_radius: int, celestial_map=None) -> list:
+    '''
+    Grow the search radius and scan only the ring of cells the bigger footprint adds.
+    Returns the objects found in the ring.
+    '''
+    if search_radius < self.search_radius:
+      raise ValueError("A sensor upgrade can't shrink its radius")
+    ring = ring_offsets(self.search_radius, search_radius, self.footprint)
+    self.search_radius = search_radius
+    if shared_items.verbose:
+      print(f'\nUpgraded sensor at {self.pos} to radius {self.search_radius}')
+    if not self.star_map:
+      return []
+    detected_objects = self._report(self._query_offsets(ring), celestial_map or self.celestial_map)
+    if shared_items.verbose:
+      print(f"Ring scan complete. Found {len(detected_objects)} objects.")
+    return detected_objects
+
+  def _query_offsets(self, offsets) -> list:
+    # Footprint table shifted to the sensor, minus whatever the coverage map says was already scanned
+    cells = offsets + (self.pos[0], self.pos[1])
+    if self.coverage is not None:
+      cells = self.coverage.claim_cells(cells)
+    return self.star_map.query_cells(cells.tolist())
+
+  def _report(self, entries, celestial_map) -> list:
+    detected_objects = []
+    planet_found: bool = False
+    artifact_found: bool = False
+
+    for _, obj_type, obj_name, obj_pos in entries:
+      detected_objects.append({
+        'type': obj_type,
+        'name': obj_name,
+        'position': obj_pos
+      })
+      if obj_type == 'PLANET':
+        planet_found = True
+        if shared_items.verbose:
+          print(f"Detected planet: {obj_name} at {obj_pos}")
+      else:
+        artifact_found = True
+        if shared_items.verbose:
+          print(f"Detected {obj_type}: {obj_name} at ({obj_pos[0]}, {obj_pos[1]})")
+
     '''
      Add detected objects to celestial map
     '''
-    if self.celestial_map and (planet_found or artifact_found):
+    if celestial_map and (planet_found or artifact_found):
       
       # Add each object found as a separate entry
       for obj in detected_objects:
         if obj['type'] == 'PLANET':
-          self.celestial_map.visit(obj['position'], obj['name'], None)
+          celestial_map.visit(obj['position'], obj['name'], None)
         else:
-          self.celestial_map.visit(obj['position'], None, obj['name'])
-      print(f"Added scan results to celestial map at position {self.pos}")
+          celestial_map.visit(obj['position'], None, obj['name'])
+      if shared_items.verbose:
+        print(f"Added scan results to celestial map at position {self.pos}")
 
-    print(f"Scan complete. Found {len(detected_objects)} objects.")
     return detected_objects
-
-
-
@@ -0,0 +1,168 @@
+"""
+SensorRegistry Class
+
+The ship's deployed sensors keyed by (x, y) position, so checking for a
+sensor at a coordinate, fetching it, removing it or changing its radius are
+all O(1) instead of a walk over every sensor. Only positions and radii are
+stored, with the footprint each sensor was deployed with; the Sensor object
+for a position is built the first time it is asked for, so restoring a saved
+game with many sensors doesn't construct them all. A saved game can hand its
+sensors over as NumPy columns (load_columns); the position index is then only
+built by the first call that needs it.
+
+Iteration and len() follow deployment order, like the list Ship used to keep.
+
+Methods:
+    add(position, radius, footprint): Register a sensor, False when the position is taken
+    get(position): Sensor at position or None
+    remove(position): Drop the sensor at position
+    set_radius(position, radius): Change a sensor's radius in place
+    radii() / footprints(): Read-only position -> radius / footprint views
+    load(entries): Replace every sensor from (position, radius, footprint) entries
+    load_columns(positions, radii, footprints): Replace every sensor from arrays, indexed lazily
+"""
+from types import MappingProxyType
+
+import numpy as np
+
+import shared_items
+from Sensor import Sensor
+from sensor_masks import FOOTPRINTS
+
+
+class SensorRegistry:
+
+    def __init__(self, star_map=None, coverage=None):
+        self.star_map = star_map
+        self.coverage = coverage    # CoverageMap shared by every sensor, see Sensor.scan
+        self._radii = {}            # (x, y) -> search radius, in deployment order
+        self._footprints = {}       # (x, y) -> "square" or "circle", see sensor_masks
+        self._sensors = {}          # (x, y) -> Sensor, only for positions asked for so far
+        self._columns = None        # (positions, radii, footprints) from load_columns, not indexed yet
+
+    @staticmethod
+    def _key(position) -> tuple:
+        return (int(position[0]), int(position[1]))
+
+    def _index(self):
+        # Turn load_columns arrays into the position-keyed dicts
+        xy, radii, footprints = self._columns
+        self._columns = None
+        positions = list(zip(xy[:, 0].tolist(), xy[:, 1].tolist()))
+        self._radii = dict(zip(positions, radii.tolist()))
+        self._footprints = dict(zip(positions, np.array(FOOTPRINTS, dtype=object)[footprints].tolist()))
+
+    def __len__(self):
+        if self._columns is not None:
+            return len(self._columns[1])
+        return len(self._radii)
+
+    def __contains__(self, position):
+        if self._columns is not None:
+            self._index()
+        return self._key(position) in self._radii
+
+    def __iter__(self):
+        """Sensors in deployment order"""
+        if self._columns is not None:
+            self._index()
+        for position in self._radii:
+            yield self.get(position)
+
+    def add(self, position, radius: int, footprint: str = None) -> bool:
+        """ Register a sensor, its Sensor object is only built by get()
+
+            Args:
+                footprint (str): Footprint the sensor keeps, defaults to shared_items.sensor_footprint
+
+            Returns:
+                bool: False when position already holds a sensor
+        """
+        if self._columns is not None:
+            self._index()
+        key = self._key(position)
+        if key in self._radii:
+            return False
+        self._radii[key] = radius
+        self._footprints[key] = footprint or shared_items.sensor_footprint
+        return True
+
+    def get(self, position):
+        """Sensor at position, or None when there is none"""
+        if self._columns is not None:
+            self._index()
+        key = self._key(position)
+        sensor = self._sensors.get(key)
+        if sensor is None:
+            radius = self._radii.get(key)
+            if radius is None:
+                return None
+            sensor = Sensor(key, radius, self.star_map, coverage=self.coverage,
+                            footprint=self._footprints[key])
+            self._sensors[key] = sensor
+        return sensor
+
+    def remove(self, position) -> bool:
+        """Drop the sensor at position, False when there was none"""
+        if self._columns is not None:
+            self._index()
+        key = self._key(position)
+        if self._radii.pop(key, None) is None:
+            return False
+        del self._footprints[key]
+        self._sensors.pop(key, None)
+        return True
+
+    def set_radius(self, position, radius: int):
+        """ Change the radius of the sensor at position in place
+
+            Returns:
+                Sensor: The updated sensor, None when position holds no sensor
+        """
+        if self._columns is not None:
+            self._index()
+        key = self._key(position)
+        if key not in self._radii:
+            return None
+        self._radii[key] = radius
+        sensor = self.get(key)
+        sensor.search_radius = radius
+        return sensor
+
+    def radii(self):
+        """Read-only position -> radius view in deployment order"""
+        if self._columns is not None:
+            self._index()
+        return MappingProxyType(self._radii)
+
+    def footprints(self):
+        """Read-only position -> footprint view in deployment order"""
+        if self._columns is not None:
+            self._index()
+        return MappingProxyType(self._footprints)
+
+    def load(self, entries):
+        """ Replace every sensor, no Sensor is built yet
+
+            Args:
+                entries: ((x, y), radius, footprint) entries
+        """
+        # Transposed once so both dicts are built by dict(zip())
+        positions, radii, footprints = list(zip(*entries)) or [(), (), ()]
+        self._radii = dict(zip(positions, radii))
+        self._footprints = dict(zip(positions, footprints))
+        self._sensors = {}
+        self._columns = None
+
+    def load_columns(self, positions, radii, footprints):
+        """ Replace every sensor from arrays without building any per-sensor object yet
+
+            Args:
+                positions: (N, 2) int array of sensor cells, in deployment order
+                radii: N search radii
+                footprints: N indices into sensor_masks.FOOTPRINTS
+        """
+        self._radii = {}
+        self._footprints = {}
+        self._sensors = {}
+        self._columns = (np.asarray(positions).reshape(-1, 2), np.asarray(radii), np.asarray(footprints))
@@ -1,12 +1,21 @@
 from load_artifacts import get_game_data
 from StarMap import StarMap
-from Sensor import Sensor
-from Control_Panel import Control_Panel
+from SensorRegistry import SensorRegistry
+from CoverageMap import CoverageMap
+from sensor_masks import next_radius
+import Control_Panel
 from celestial_map import celestial_map, get_initial_planets
 import shared_items
 import math
-import random
-from tkinter import messagebox
+import numpy as np
+from GameRNG import GameRNG
+
+# Energy used per unit moved for each engine type, see shared_items.starting_engine
+ENGINE_COSTS = {
+  "basic": 10,
+  "upgraded": 5,
+  "pro": 1,
+}
 
 class DeathException(Exception):
     def __init__(self, message):
@@ -19,7 +28,9 @@ class WormholeException(Exception):
         super().__init__(self.__message)
 
 class MovingEntity:
-  def __init__(self, use_rand):
+  def __init__(self, use_rand, rng: GameRNG = None):
+    # Every random draw comes from this stream so seeded games can be reproduced
+    self._rng = rng if rng is not None else GameRNG()
     if shared_items.min_energy < 0 or shared_items.min_supplies < 0:
        raise ValueError("Shared_items configuration error: can't have negative minimum vitals")
     if shared_items.max < 1:
@@ -30,11 +41,11 @@ class MovingEntity:
     self._boundary = shared_items.max
     if use_rand:
       # uses average of 2 randoms because middle should be prioritized statistically
-      self._supplies = round((random.random() * (shared_items.max_supplies - shared_items.min_supplies) 
-                               + random.random() * (shared_items.max_supplies - shared_items.min_supplies)) 
+      self._supplies = round((self._rng.random() * (shared_items.max_supplies - shared_items.min_supplies) 
+                               + self._rng.random() * (shared_items.max_supplies - shared_items.min_supplies)) 
                                / 2 + shared_items.min_supplies)
-      self._energy = round((random.random() * (shared_items.max_energy - shared_items.min_energy) 
-                      + random.random() * (shared_items.max_energy - shared_items.min_energy)) 
+      self._energy = round((self._rng.random() * (shared_items.max_energy - shared_items.min_energy) 
+                      + self._rng.random() * (shared_items.max_energy - shared_items.min_energy)) 
                       / 2 + shared_items.min_energy)
       self.randomize_position()
     else:
@@ -44,6 +55,10 @@ class MovingEntity:
 
   def debug_position(self):
     return self._position
+
+  def set_rng(self, rng: GameRNG):
+    """Draw from rng from now on, e.g. the stream of the game this entity belongs to"""
+    self._rng = rng
   
   def use_supplies(self, amount: float):
     self._supplies -= amount
@@ -68,7 +83,7 @@ class MovingEntity:
     self._position[1] += round(distance*math.sin(math.radians(angle)))
 
   def randomize_position(self):
-      self._position = [round(random.random() * self._boundary * 2 - self._boundary), round(random.random() * self._boundary * 2 - self._boundary)]
+      self._position = [round(self._rng.random() * self._boundary * 2 - self._boundary), round(self._rng.random() * self._boundary * 2 - self._boundary)]
 
   def check_position(self):
       if self._position[0] > self._boundary or self._position[0] < -self._boundary or self._position[1] > self._boundary or self._position[1] < -self._boundary:
@@ -81,9 +96,9 @@ class MovingEntity:
           raise WormholeException("Hit a wormhole due to being out of bounds")
         
 class AbandonFrieghtor(MovingEntity):
-  def __init__(self):
-     super().__init__(True)
-     self._velocity = [round(random.random() * shared_items.max_velocity), round(random.random()*360)]
+  def __init__(self, rng: GameRNG = None):
+     super().__init__(True, rng)
+     self._velocity = [round(self._rng.random() * shared_items.max_velocity), round(self._rng.random()*360)]
 
   def apply_velocity(self):
     self.change_position(self._velocity[0], self._velocity[1])
@@ -94,25 +109,31 @@ class AbandonFrieghtor(MovingEntity):
 
   def transfer_items(self):
     ret = [self.debug_energy(), self.debug_supplies()]
-    messagebox.showinfo("Abandoned Frieghtor Found", f"Found an abandon frieghtor containg {self.debug_energy()} energy and {self.debug_supplies()} supplies")
     self.use_energy(self.debug_energy())
     self.use_supplies(self.debug_supplies())
     return ret
 
 class Ship(MovingEntity):
-  def __init__(self, name: str, position: tuple):
+  def __init__(self, name: str, position: tuple, headless: bool = False, rng: GameRNG = None, star_map: StarMap = None):
     # set ship status
-    super().__init__(False)
+    super().__init__(False, rng)
     self._supply_useage = shared_items.supply_useage
     self._engine_type = shared_items.starting_engine
     self._money = shared_items.starting_cash
     self._name = name
-    self._sensors: list[Sensor] = []  # Initialize sensors array as empty list
-    self._control_panel = Control_Panel(self)
+    self._event_handler = None        # Receives event dicts (freighter finds), see GameEngine
 
-    # Initialize star map
-    game_data = get_game_data()
-    self.star_map = StarMap(game_data["planets"], game_data["target"], game_data["artifacts"])
+    # Initialize star map, unless one was handed in (e.g. from a compiled map, see save_game)
+    if star_map is None:
+      game_data = get_game_data()
+      star_map = StarMap(game_data["planets"], game_data["target"], game_data["artifacts"])
+    self.star_map = star_map
+    self._coverage = CoverageMap()    # Cells the sensors already scanned, new scans skip them
+    self.star_map.track_coverage(self._coverage)   # Cleared when the star map is edited
+    self._sensors = SensorRegistry(self.star_map, coverage=self._coverage)   # Deployed sensors keyed by (x, y) position
+
+    # Headless ships (simulations, tests) never build the tkinter control panel
+    self._control_panel = None if headless else Control_Panel.Control_Panel(self)
     
     print(f"Ship {self._name} initialized at position {self.debug_position()}")
 
@@ -130,6 +151,10 @@ class Ship(MovingEntity):
   def debug_name(self):
      return self._name
 
+  def set_event_handler(self, handler):
+     """Route game events (dicts with a 'type' key) to handler instead of popping up dialogs"""
+     self._event_handler = handler
+
   def check_vitals(self):
       if self.debug_energy() <= 0 or self.debug_supplies() <= 0:
           if shared_items.playstyle == "regular play":
@@ -140,15 +165,10 @@ class Ship(MovingEntity):
               raise ValueError
 
   def engine_type(self, type: str) -> float:
-      if type == "basic":
-            return 10
-          # verify names and stats later
-      elif type == "upgraded":
-            return 5
-      elif type == "pro":
-            return 1
-      else:
+      # verify names and stats later
+      if type not in ENGINE_COSTS:
             raise ValueError
+      return ENGINE_COSTS[type]
 
   def move(self, distance: float, angle: float):
       self.use_supplies(self._supply_useage)
@@ -163,30 +183,127 @@ class Ship(MovingEntity):
     #TODO - Get movement to work with sensors to detect celestial objects
 
   def encounter_frieghtor(self):
-     if random.random() * 100 < shared_items.frieghtor_rate:
-      new_frieghtor = AbandonFrieghtor()
+     if self._rng.random() * 100 < shared_items.frieghtor_rate:
+      new_frieghtor = AbandonFrieghtor(self._rng)
       ret = new_frieghtor.transfer_items()
       new_frieghtor = None
       self.gain_energy(ret[0])
       self.gain_supplies(ret[1])
+      if self._event_handler:
+        self._event_handler({"type": "frieghtor", "energy": ret[0], "supplies": ret[1]})
         
 
   def addSensor(self, celestial_map) -> bool:
-    """Add a sensor to the ship's sensors array and consume 2% supplies"""
+    """Add a sensor at the ship's position and consume 2% supplies.
+    Returns False when a sensor is already deployed there."""
 
-    # Loop through all the sensors and check to see if there is a sensor at current location
-    for sensor in self._sensors:
-      if hasattr(sensor, '_Sensor__position') and sensor._Sensor__position == self._position:
-        return None  # Sensor already exists
+    # O(1) check in the position-keyed registry for a sensor at the current location
+    position = tuple(self._position)     # A copy, the sensor stays put when the ship moves on
+    if position in self._sensors:
+      return False  # Sensor already exists
 
     # Consume 2% of supplies for sensor deployment
     self.use_supplies(shared_items.sensor_cost)  # 98% remaining (2% consumed)
-    
-    new_sensor = Sensor(self._position, 2, self.star_map, celestial_map)   # Initialize sensor at current position
-    new_sensor.scan(self._position)
-    self._sensors.append(new_sensor)                                                   # Added double underscore for fix
+
+    self._sensors.add(position, shared_items.sensor_radius_tiers[0], shared_items.sensor_footprint)   # Initialize sensor at current position
+    self._sensors.get(position).scan(position, celestial_map)
+    return True
+
+  def addSensors(self, positions, celestial_map) -> int:
+    """Deploy sensors at many positions with one StarMap.scan_many pass.
+    Each new sensor costs sensor_cost supplies, positions that already hold a sensor are skipped.
+    Returns the number of sensors added."""
+    radius = shared_items.sensor_radius_tiers[0]
+    footprint = shared_items.sensor_footprint
+    new_positions = []
+    for pos in positions:
+      pos = (int(pos[0]), int(pos[1]))
+      if self._sensors.add(pos, radius, footprint):
+        new_positions.append(pos)
+    if not new_positions:
+      return 0
+
+    self.use_supplies(shared_items.sensor_cost * len(new_positions))
+    if not celestial_map:
+      self._coverage.mark_windows(new_positions, radius, footprint)
+      return len(new_positions)
+
+    # Like addSensor, each sensor only reports the objects in cells no earlier scan
+    # covered: its hits are checked against the coverage before its window is marked
+    results = self.star_map.scan_many(new_positions, radius, footprint=footprint)
+    planet_names = self.star_map.planet_names
+    artifact_names = self.star_map.artifact_names
+    is_covered = self._coverage.is_covered
+    fresh = []
+    for pos, (planet_indices, artifact_indices) in zip(new_positions, results):
+      planet_new = np.fromiter((not is_covered(self.star_map.planets[planet_names[i]])
+                                for i in planet_indices.tolist()), dtype=bool, count=len(planet_indices))
+      artifact_new = np.fromiter((not is_covered((self.star_map.artifacts[artifact_names[i]]["x"],
+                                                  self.star_map.artifacts[artifact_names[i]]["y"]))
+                                  for i in artifact_indices.tolist()), dtype=bool, count=len(artifact_indices))
+      fresh.append((planet_indices[planet_new], artifact_indices[artifact_new]))
+      self._coverage.mark_windows([pos], radius, footprint)
+    celestial_map.record_scan_results(self.star_map, fresh)
+    return len(new_positions)
+
+  def get_sensor(self, position):
+    """Sensor deployed at position, None when there is none"""
+    return self._sensors.get(position)
+
+  def removeSensor(self, position) -> bool:
+    """Take back the sensor at position, what it found stays on the celestial map.
+    Returns False when there is no sensor there."""
+    return self._sensors.remove(position)
+
+  def upgradeSensor(self, position, radius: int = None, celestial_map=None) -> bool:
+    """Grow the search radius of the sensor at position, to the next tier of
+    shared_items.sensor_radius_tiers unless a radius is given. Only the ring of
+    new cells is scanned, its finds go to celestial_map. Returns False when there
+    is no sensor there or it can't grow any further."""
+    sensor = self._sensors.get(position)
+    if sensor is None:
+      return False
+    if radius is None:
+      radius = next_radius(sensor.search_radius)
+    if radius is None or radius <= sensor.search_radius:
+      return False
+    sensor.upgrade(radius, celestial_map)
+    self._sensors.set_radius(position, radius)
     return True
 
+  def get_state(self) -> dict:
+    """Copy of the ship's vitals, position and sensors, see set_state"""
+    footprints = self._sensors.footprints()
+    return {
+      "name": self._name,
+      "position": tuple(self._position),
+      "energy": self._energy,
+      "supplies": self._supplies,
+      "money": self._money,
+      "engine_type": self._engine_type,
+      "sensors": [(position, radius, footprints[position]) for position, radius in self._sensors.radii().items()],
+      "coverage": self._coverage.snapshot(),
+    }
+
+  def set_state(self, state: dict):
+    """Put the ship back to a get_state() copy, sensors are restored without rescanning.
+    Instead of 'sensors' the state may hold 'sensor_columns', the arguments of
+    SensorRegistry.load_columns (see save_game)"""
+    self._name = state["name"]
+    self._position = list(state["position"])
+    self._energy = state["energy"]
+    self._supplies = state["supplies"]
+    self._money = state["money"]
+    self._engine_type = state["engine_type"]
+    self._coverage = CoverageMap()
+    self.star_map.track_coverage(self._coverage)
+    self._coverage.restore(state["coverage"])
+    self._sensors = SensorRegistry(self.star_map, self._coverage)
+    if "sensor_columns" in state:
+      self._sensors.load_columns(*state["sensor_columns"])
+    else:
+      self._sensors.load(state["sensors"])
+
   def start(self):
     """Start the control panel for the ship"""
     if self._control_panel is not None:
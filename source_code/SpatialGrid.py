@@ -0,0 +1,70 @@
+"""
+SpatialGrid Class
+
+Uniform-grid (spatial hash) index over the planets and artifacts of a StarMap.
+Objects are bucketed into square cells so a square window query only has to
+look at the handful of cells the window overlaps instead of every object.
+
+Entries are (order, type, name, position) tuples where order is the object's
+position in the star map (planets first, then artifacts) and type is 'PLANET'
+or the artifact's type. Query results are returned in that order so they match
+a linear pass over star_map.planets followed by star_map.artifacts.
+
+Methods:
+    __init__(cell_size, planets, artifacts): Bucket every object into its cell
+    query(x_min, x_max, y_min, y_max): Entries inside the window, bounds inclusive
+    cell(cx, cy): Entries bucketed into one cell
+"""
+
+
+class SpatialGrid:
+
+    def __init__(self, cell_size: int, planets, artifacts):
+        if cell_size < 1:
+            raise ValueError("SpatialGrid cell size must be at least 1")
+        self.cell_size = cell_size
+        self._cells = {}
+
+        order = 0
+        for planet_name, planet_pos in planets.items():
+            self._add((order, 'PLANET', planet_name, tuple(planet_pos)))
+            order += 1
+        for artifact_name, artifact_data in artifacts.items():
+            self._add((order, artifact_data['type'], artifact_name, (artifact_data['x'], artifact_data['y'])))
+            order += 1
+
+    def _add(self, entry):
+        x, y = entry[3]
+        key = (x // self.cell_size, y // self.cell_size)
+        bucket = self._cells.get(key)
+        if bucket is None:
+            self._cells[key] = [entry]
+        else:
+            bucket.append(entry)
+
+    def cell(self, cx, cy) -> list:
+        """Entries in grid cell (cx, cy), with cell size 1 that is the objects at (cx, cy)"""
+        return self._cells.get((cx, cy), ())
+
+    def query(self, x_min, x_max, y_min, y_max) -> list:
+        """ Return every entry with x_min <= x <= x_max and y_min <= y <= y_max
+
+            Args:
+                x_min, x_max, y_min, y_max: Inclusive window bounds
+
+            Returns:
+                list: Matching entries in star map order
+        """
+        found = []
+        cells = self._cells
+        for cx in range(x_min // self.cell_size, x_max // self.cell_size + 1):
+            for cy in range(y_min // self.cell_size, y_max // self.cell_size + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                for entry in bucket:
+                    px, py = entry[3]
+                    if x_min <= px <= x_max and y_min <= py <= y_max:
+                        found.append(entry)
+        found.sort()
+        return found
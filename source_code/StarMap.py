@@ -1,11 +1,296 @@
+import weakref
+
+import numpy as np
+from SpatialGrid import SpatialGrid
+from KDTree import KDTree
+from sensor_masks import in_footprint
+
+# Metrics for the planet tables: "manhattan" matches unit moves along the axes
+METRICS = ("manhattan", "euclidean")
+# Dense planet tables are P x P float32, 16 MB at the limit, refuse to build them for more planets
+DENSE_TABLE_LIMIT = 2000
+# Most sensor x object pairs scan_many compares in one broadcast, bounds its temporary arrays
+SCAN_BUDGET = 1 << 20
+
+
 class StarMap:
-    def __init__(self, planets, target, artifacts):
+    def __init__(self, planets, target, artifacts, coordinate_arrays=None):
         self.planets = planets
         self.target = target
         self.artifacts = artifacts
+        self._grids = {}        # cell size -> SpatialGrid, built on first query
+        self.revision = 0       # bumped by invalidate_index, lets planners drop cached routes
+        # contiguous coordinate arrays, built on first scan_many unless handed in (see map_compiler)
+        self._arrays = coordinate_arrays
+        self._trees = {}        # "planets", "artifacts" or ("artifacts", type) -> (KDTree, names, positions, indices)
+        self._tables = {}       # "distance_<metric>" -> planet x planet float32 array
+        self._planet_index = None
+        self._coverage_maps = weakref.WeakSet()     # CoverageMaps cleared by invalidate_index
 
     def display(self):
         print("Displaying StarMap:")
         print("Planets:", self.planets)
         print("Target:", self.target)
-        print("Artifacts:", self.artifacts)
\ No newline at end of file
+        print("Artifacts:", self.artifacts)
+
+    def invalidate_index(self):
+        """Drop the spatial indexes and the tracked sensor coverage, call this after
+        editing planets or artifacts"""
+        self.revision += 1
+        for coverage in self._coverage_maps:
+            coverage.clear()
+        self._grids = {}
+        self._arrays = None
+        self._trees = {}
+        self._tables = {}
+        self._planet_index = None
+
+    def track_coverage(self, coverage):
+        """Clear coverage (a CoverageMap scanned against this map) whenever the map is
+        invalidated, so edited cells are scanned again. The map is held weakly."""
+        self._coverage_maps.add(coverage)
+
+    def _grid(self, cell_size) -> SpatialGrid:
+        grid = self._grids.get(cell_size)
+        if grid is None:
+            grid = SpatialGrid(cell_size, self.planets, self.artifacts)
+            self._grids[cell_size] = grid
+        return grid
+
+    def query_window(self, x, y, search_radius) -> list:
+        """Return (order, type, name, position) entries within the square window
+        around (x, y), bounds inclusive, in planets-then-artifacts order.
+        The grid cell size is tied to the radius so a window covers at most 2x2 cells."""
+        grid = self._grid(max(1, 2 * search_radius + 1))
+        return grid.query(x - search_radius, x + search_radius, y - search_radius, y + search_radius)
+
+    def query_cells(self, cells) -> list:
+        """Return the (order, type, name, position) entries located exactly on the
+        given (x, y) cells, in planets-then-artifacts order. Used by coverage-aware
+        scans, which only look at the cells no earlier scan covered."""
+        grid = self._grid(1)
+        found = []
+        for x, y in cells:
+            found.extend(grid.cell(x, y))
+        found.sort()
+        return found
+
+    '''
+    Batch scanning
+    '''
+    def _coordinate_arrays(self):
+        if self._arrays is None:
+            planet_names = tuple(self.planets)
+            artifact_names = tuple(self.artifacts)
+            planet_x = np.fromiter((pos[0] for pos in self.planets.values()), dtype=np.int64, count=len(planet_names))
+            planet_y = np.fromiter((pos[1] for pos in self.planets.values()), dtype=np.int64, count=len(planet_names))
+            artifact_x = np.fromiter((data['x'] for data in self.artifacts.values()), dtype=np.int64, count=len(artifact_names))
+            artifact_y = np.fromiter((data['y'] for data in self.artifacts.values()), dtype=np.int64, count=len(artifact_names))
+            self._arrays = {
+                "planet_names": planet_names,
+                "artifact_names": artifact_names,
+                "planets": self._sorted_by_x(planet_x, planet_y),
+                "artifacts": self._sorted_by_x(artifact_x, artifact_y),
+            }
+        return self._arrays
+
+    @staticmethod
+    def _sorted_by_x(xs, ys):
+        order = np.argsort(xs, kind="stable")
+        return np.ascontiguousarray(xs[order]), np.ascontiguousarray(ys[order]), order
+
+    @property
+    def planet_names(self) -> tuple:
+        """Planet names indexed the same way as the scan_many planet indices"""
+        return self._coordinate_arrays()["planet_names"]
+
+    @property
+    def artifact_names(self) -> tuple:
+        """Artifact names indexed the same way as the scan_many artifact indices"""
+        return self._coordinate_arrays()["artifact_names"]
+
+    def scan_many(self, positions, radius, chunk_size=256, footprint="square") -> list:
+        """Scan the square window of every sensor position in one vectorized pass.
+
+        Args:
+            positions: Sequence or (M, 2) array of sensor (x, y) positions
+            radius: Search radius shared by every sensor, bounds inclusive like Sensor.scan
+            chunk_size: Most sensors compared against the map per broadcast, fewer when
+                        chunk_size x x band would exceed SCAN_BUDGET
+            footprint: 'square' or 'circle', see sensor_masks
+
+        Returns:
+            list: One (planet_indices, artifact_indices) pair of sorted int arrays per
+                  position, indexing planet_names and artifact_names
+        """
+        arrays = self._coordinate_arrays()
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        planet_hits = self._scan_kind(arrays["planets"], positions, radius, chunk_size, footprint)
+        artifact_hits = self._scan_kind(arrays["artifacts"], positions, radius, chunk_size, footprint)
+        return list(zip(planet_hits, artifact_hits))
+
+    @staticmethod
+    def _scan_kind(kind_arrays, positions, radius, chunk_size, footprint):
+        xs, ys, order = kind_arrays
+        empty = np.empty(0, dtype=np.int64)
+        results = [empty] * len(positions)
+        if len(xs) == 0 or len(positions) == 0:
+            return results
+
+        # Sensors are processed in x order so each chunk only broadcasts against
+        # the objects inside its own x band. Chunks are halved until chunk x band fits
+        # SCAN_BUDGET, and a lone sensor's band wider than that is compared in slices.
+        sensor_order = np.argsort(positions[:, 0], kind="stable")
+        start = 0
+        while start < len(positions):
+            count = min(chunk_size, len(positions) - start)
+            while True:
+                chunk = sensor_order[start:start + count]
+                sx = positions[chunk, 0]
+                sy = positions[chunk, 1]
+                lo = np.searchsorted(xs, sx.min() - radius, side="left")
+                hi = np.searchsorted(xs, sx.max() + radius, side="right")
+                if count == 1 or count * (hi - lo) <= SCAN_BUDGET:
+                    break
+                count //= 2
+            start += count
+            if lo == hi:
+                continue
+            step = max(1, SCAN_BUDGET // count)
+            rows, hits = [], []
+            for band_lo in range(lo, hi, step):
+                band_hi = min(hi, band_lo + step)
+                inside = in_footprint(xs[None, band_lo:band_hi] - sx[:, None], ys[None, band_lo:band_hi] - sy[:, None],
+                                      radius, footprint)
+                slice_rows, cols = np.nonzero(inside)
+                rows.append(slice_rows)
+                hits.append(order[cols + band_lo])
+            if len(rows) == 1:
+                rows, hits = rows[0], hits[0]
+            else:
+                # Slices each come out grouped by sensor, regroup them all
+                rows, hits = np.concatenate(rows), np.concatenate(hits)
+                by_row = np.argsort(rows, kind="stable")
+                rows, hits = rows[by_row], hits[by_row]
+            counts = np.bincount(rows, minlength=len(chunk))
+            for sensor_index, sensor_hits in zip(chunk, np.split(hits, np.cumsum(counts)[:-1])):
+                if len(sensor_hits):
+                    results[sensor_index] = np.sort(sensor_hits)
+        return results
+
+    '''
+    Nearest-object queries
+    '''
+    def _tree(self, key):
+        tree = self._trees.get(key)
+        if tree is None:
+            arrays = self._coordinate_arrays()
+            kind = key if isinstance(key, str) else key[0]
+            xs, ys, order = arrays[kind]
+            names = arrays["planet_names" if kind == "planets" else "artifact_names"]
+            if isinstance(key, tuple):
+                # Only the artifacts of one type
+                keep = np.array([self.artifacts[names[i]]["type"] == key[1] for i in order.tolist()], dtype=bool)
+                xs, ys, order = xs[keep], ys[keep], order[keep]
+            indices = order.tolist()
+            slot_names = [names[i] for i in indices]
+            positions = list(zip(xs.tolist(), ys.tolist()))
+            tree = (KDTree(np.column_stack((xs, ys))), slot_names, positions, indices)
+            self._trees[key] = tree
+        return tree
+
+    def _nearest(self, key, position, k):
+        tree, names, positions, _ = self._tree(key)
+        return [(names[i], positions[i], distance) for distance, i in tree.nearest(position[0], position[1], k)]
+
+    def nearest_planets(self, position, k=1) -> list:
+        """The k planets closest to position as (name, (x, y), distance), closest first"""
+        return self._nearest("planets", position, k)
+
+    def nearest_artifacts(self, position, k=1, artifact_type=None) -> list:
+        """The k artifacts closest to position, optionally only of artifact_type, as (name, (x, y), distance)"""
+        return self._nearest("artifacts" if artifact_type is None else ("artifacts", artifact_type), position, k)
+
+    def closest_artifact(self, position, artifact_type=None):
+        """(name, (x, y), distance) of the closest artifact (of artifact_type), None when there is none"""
+        found = self.nearest_artifacts(position, 1, artifact_type)
+        return found[0] if found else None
+
+    def planets_within(self, position, radius) -> list:
+        """(name, (x, y), distance) of every planet at most radius away, in star map order"""
+        tree, names, positions, indices = self._tree("planets")
+        slots = sorted(tree.within(position[0], position[1], radius), key=indices.__getitem__)
+        return [(names[i], positions[i], float(np.hypot(positions[i][0] - position[0], positions[i][1] - position[1])))
+                for i in slots]
+
+    def distance_to_target(self, position):
+        """Straight-line distance from position to the target planet, None without a target"""
+        if self.target not in self.planets:
+            return None
+        tx, ty = self.planets[self.target]
+        return float(np.hypot(tx - position[0], ty - position[1]))
+
+    '''
+    Planet distance and energy tables
+    '''
+    def distance_table(self, metric="manhattan") -> np.ndarray:
+        """Read-only planet x planet distance matrix in planet_names order, built on first use"""
+        key = f"distance_{metric}"
+        table = self._tables.get(key)
+        if table is None:
+            if metric not in METRICS:
+                raise ValueError(f"Unknown metric {metric!r}")
+            if len(self.planets) > DENSE_TABLE_LIMIT:
+                raise ValueError(f"{len(self.planets)} planets is too many for a dense table")
+            xs, ys, order = self._coordinate_arrays()["planets"]
+            px = np.empty(len(order), dtype=np.float32)
+            py = np.empty(len(order), dtype=np.float32)
+            px[order] = xs
+            py[order] = ys
+            dx = px[:, None] - px[None, :]
+            dy = py[:, None] - py[None, :]
+            table = np.abs(dx) + np.abs(dy) if metric == "manhattan" else np.hypot(dx, dy)
+            table.setflags(write=False)
+            self._tables[key] = table
+        return table
+
+    def energy_table(self, engine_type, metric="manhattan") -> np.ndarray:
+        """Planet x planet energy cost matrix for an engine type (distance x Ship.engine_type cost),
+        computed from the distance table on every call rather than kept"""
+        return self.distance_table(metric) * self._engine_cost(engine_type)
+
+    @staticmethod
+    def _engine_cost(engine_type):
+        from Ship import ENGINE_COSTS       # Ship imports StarMap, so not at module level
+        if engine_type not in ENGINE_COSTS:
+            raise ValueError(f"Unknown engine type {engine_type!r}")
+        return ENGINE_COSTS[engine_type]
+
+    def planet_index(self, name) -> int:
+        """Row/column of a planet in the distance and energy tables"""
+        if self._planet_index is None:
+            self._planet_index = {planet: i for i, planet in enumerate(self.planet_names)}
+        return self._planet_index[name]
+
+    def planet_distance(self, a, b, metric="manhattan") -> float:
+        """Distance between two planets, a table lookup"""
+        return float(self.distance_table(metric)[self.planet_index(a), self.planet_index(b)])
+
+    def travel_energy(self, a, b, engine_type, metric="manhattan") -> float:
+        """Energy an engine type needs to fly from planet a to planet b, a distance table lookup"""
+        return self.planet_distance(a, b, metric) * self._engine_cost(engine_type)
+
+    def export_tables(self) -> dict:
+        """The tables built so far, name -> array, for saving next to the compiled map"""
+        return dict(self._tables)
+
+    def import_tables(self, tables) -> None:
+        """Adopt previously exported distance tables instead of building them again"""
+        for key, table in tables.items():
+            if not key.startswith("distance_"):
+                continue
+            table = np.asarray(table, dtype=np.float32)
+            if table.shape != (len(self.planets), len(self.planets)):
+                raise ValueError(f"Table {key} doesn't match this star map")
+            table.setflags(write=False)
+            self._tables[key] = table
@@ -9,12 +9,22 @@ Purpose:
         
 Current Methods:
     - visit(position, planet, artifact)
+    - record_scan_results(star_map, results)
     - print_celestial_map()
+    - is_visited(position)
+    - nearest_planet(position)
+    - snapshot() / restore(state)
+    - add_line_listener(listener) / line_count() / rendered_lines(start, stop)
     - get_initial_planets(game_data) -> Standalone function
 """
 
+from array import array
+from collections.abc import Mapping
 from typing import Dict, Tuple, Any
 
+import shared_items
+from KDTree import KDTree
+
 
 # Standalone utility functions
 def get_initial_planets(game_data: Dict) -> Dict:
@@ -27,30 +37,97 @@ def get_initial_planets(game_data: Dict) -> Dict:
     return initial_planets
 
 
+# Compact storage helpers
+def _pack_position(x: int, y: int) -> int:
+    """ Pack an (x, y) cell into one int key, y is kept to 32 bits """
+    return (x << 32) ^ (y & 0xFFFFFFFF)
+
+
+_PLANET = 0
+_ARTIFACT = 1
+
+
+class _MapDataView(Mapping):
+    """ Read-only map_data view in the original shape:
+
+            {"visited": set of (x, y), "visited_info": {(x, y): {"planets": [...], "artifacts": [...]}}}
+
+        Built lazily from the compact storage into immutable tuples, reused until
+        the next visit. Every lookup hands out a fresh set or dict built from those,
+        so editing what it returns changes neither the map nor later lookups.
+    """
+
+    def __init__(self, cel_map: "celestial_map") -> None:
+        self._cel_map = cel_map
+        self._revision = -1
+        self._visited = frozenset()
+        self._info = ()                     # ((x, y), planets tuple, artifacts tuple) per cell
+
+    def _build(self) -> None:
+        if self._revision != self._cel_map._revision:
+            self._visited = frozenset(self._cel_map._positions())
+            self._info = tuple((position, tuple(info["planets"]), tuple(info["artifacts"]))
+                               for position, info in self._cel_map._cell_info().items())
+            self._revision = self._cel_map._revision
+
+    def __getitem__(self, key: str) -> Any:
+        self._build()
+        if key == "visited":
+            return set(self._visited)
+        if key == "visited_info":
+            return {position: {"planets": list(planets), "artifacts": list(artifacts)}
+                    for position, planets, artifacts in self._info}
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(("visited", "visited_info"))
+
+    def __len__(self) -> int:
+        return 2
+
+
 # Classes
 class celestial_map:
     
     def __init__(self, initial_planets: Dict) -> None:
         """ Default constructor
 
+            Visits are stored compactly: names are interned to integer ids, cells are
+            keyed by packed (x, y) ints, and every (cell, name) entry lives in parallel
+            arrays with a set of packed entries for O(1) de-duplication.
+
             Args:
                 initial_planets (Dict): List of initial planets for initialization
                                         of celestial map
             
             Returns: None
         """
-        self.map_data = {
-            "visited": set(),
-            "visited_info": {}
-        }
+        self._names = []                    # name id -> name
+        self._name_ids = {}                 # name -> name id
+        self._cells = {}                    # packed (x, y) -> cell index, in visit order
+        self._cell_x = array("q")
+        self._cell_y = array("q")
+        self._entry_cell = array("I")       # one entry per (cell, planet/artifact) found
+        self._entry_name = array("I")
+        self._entry_kind = array("B")
+        self._entries = set()               # packed (cell, name, kind) entries already stored
+        self._revision = 0
+        self._view = _MapDataView(self)
+        self._planet_tree = None            # (KDTree, names, positions) of the known planets, built on first use
+
+        # Rendered print_celestial_map lines, one per cell, kept up to date by _record
+        self._planet_text = []
+        self._artifact_text = []
+        self._lines = []
+        self._line_listeners = []
 
         for name, coords in initial_planets.items():
-            coords_tuple = tuple(coords)
-            self.map_data["visited"].add(coords_tuple)
-            self.map_data["visited_info"][coords_tuple] = {
-                "planets": [name],                                                                                   # changed these to lists
-                "artifacts": []                                                                                      # changed these to lists
-            }
+            self._record(coords, name, None)
+
+    @property
+    def map_data(self) -> Mapping:
+        """ Lazy read-only view of the visits in the original dict/set shape """
+        return self._view
 
     
     def visit(self, position: Tuple, planet: str, artifact: str) -> None:
@@ -63,26 +140,197 @@ class celestial_map:
         
             Returns: None
         """
-        print(f"{position}, {planet}, {artifact}")
+        if shared_items.verbose:
+            print(f"{position}, {planet}, {artifact}")
+        self._record(position, planet, artifact)
 
-        pos_tuple = tuple(position)
-        self.map_data["visited"].add(pos_tuple)
     
-        # Initialize an entry if the pos_tuple does not already exist
-        if pos_tuple not in self.map_data["visited_info"]:
-            self.map_data["visited_info"][pos_tuple] = {
-                "planets": [],
-                "artifacts": []
-            }
+    def _record(self, position: Tuple, planet: str, artifact: str) -> None:
+        """ Store a visit without logging it, shared by visit() and the bulk paths """
+        x, y = int(position[0]), int(position[1])
+        key = _pack_position(x, y)
+        cell = self._cells.get(key)
+        if cell is None:
+            cell = len(self._cell_x)
+            self._cells[key] = cell
+            self._cell_x.append(x)
+            self._cell_y.append(y)
+            self._revision += 1
+            self._planet_text.append("")
+            self._artifact_text.append("")
+            self._lines.append(None)
+            changed = True
+        else:
+            changed = False
+
+        # Add the planet/artifact if this cell doesn't have it yet
+        if planet and self._add_entry(cell, planet, _PLANET):
+            self._planet_text[cell] = f"{self._planet_text[cell]}, {planet}" if self._planet_text[cell] else planet
+            changed = True
+        if artifact and self._add_entry(cell, artifact, _ARTIFACT):
+            self._artifact_text[cell] = f"{self._artifact_text[cell]}, {artifact}" if self._artifact_text[cell] else artifact
+            changed = True
+
+        if changed:
+            self._render_line(cell)
+
+    def _render_line(self, cell: int) -> None:
+        appended = self._lines[cell] is None
+        self._lines[cell] = (f"Position: ({self._cell_x[cell]}, {self._cell_y[cell]}) | "
+                             f"Planets: {self._planet_text[cell] or 'None'} | "
+                             f"Artifacts: {self._artifact_text[cell] or 'None'}")
+        for listener in self._line_listeners:
+            listener(cell, appended)
+
+    def add_line_listener(self, listener) -> None:
+        """ Call listener(line_index, appended) whenever a rendered line is added or changed,
+            and listener(None, False) when restore() replaced every line
+
+            Args:
+                listener (callable): Receives the line index and True for new lines
         
-        # Append the lists if planets/artifacts are found
-        if planet and planet not in self.map_data["visited_info"][pos_tuple]["planets"]:
-            self.map_data["visited_info"][pos_tuple]["planets"].append(planet)
+            Returns: None
+        """
+        self._line_listeners.append(listener)
 
-        if artifact and artifact not in self.map_data["visited_info"][pos_tuple]["artifacts"]:
-            self.map_data["visited_info"][pos_tuple]["artifacts"].append(artifact)
+    def remove_line_listener(self, listener) -> None:
+        """ Stop calling a listener registered with add_line_listener """
+        self._line_listeners.remove(listener)
+
+    def line_count(self) -> int:
+        """ Number of rendered position lines, one per visited cell """
+        return len(self._lines)
+
+    def rendered_lines(self, start: int = 0, stop: int = None) -> list:
+        """ Rendered position lines start..stop, without rebuilding any of them
+
+            Args:
+                start (int): First line index
+                stop (int): Line index to stop before, None for the end
+        
+            Returns:
+                list: Lines as they appear in print_celestial_map
+        """
+        return self._lines[start:stop]
+
+    def _add_entry(self, cell: int, name: str, kind: int) -> bool:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = len(self._names)
+            self._name_ids[name] = name_id
+            self._names.append(name)
+        packed = (cell << 33) | (name_id << 1) | kind
+        if packed in self._entries:
+            return False
+        self._entries.add(packed)
+        self._entry_cell.append(cell)
+        self._entry_name.append(name_id)
+        self._entry_kind.append(kind)
+        self._revision += 1
+        if kind == _PLANET:
+            self._planet_tree = None
+        return True
+
+    def snapshot(self) -> tuple:
+        """ Copy of everything visited so far, restore() rolls the map back to it
+
+            Args: None
+
+            Returns:
+                tuple: (names, cell_x, cell_y, entry_cell, entry_name, entry_kind,
+                        planet_text, artifact_text, lines), the lookup tables are
+                        rebuilt from these by restore()
+        """
+        return (list(self._names), array("q", self._cell_x), array("q", self._cell_y),
+                array("I", self._entry_cell), array("I", self._entry_name), array("B", self._entry_kind),
+                list(self._planet_text), list(self._artifact_text), list(self._lines))
+
+    def restore(self, state: tuple) -> None:
+        """ Put the map back to a snapshot() state, line listeners get (None, False)
+
+            Args:
+                state (tuple): Value returned by snapshot(), or the same columns read from a save file
+
+            Returns: None
+        """
+        (names, cell_x, cell_y, entry_cell, entry_name, entry_kind,
+         planet_text, artifact_text, lines) = state
+        self._names = list(names)
+        self._name_ids = {name: name_id for name_id, name in enumerate(self._names)}
+        self._cell_x = array("q", cell_x)
+        self._cell_y = array("q", cell_y)
+        self._cells = {_pack_position(x, y): cell
+                       for cell, (x, y) in enumerate(zip(self._cell_x, self._cell_y))}
+        self._entry_cell = array("I", entry_cell)
+        self._entry_name = array("I", entry_name)
+        self._entry_kind = array("B", entry_kind)
+        self._entries = {(cell << 33) | (name_id << 1) | kind
+                         for cell, name_id, kind in zip(self._entry_cell, self._entry_name, self._entry_kind)}
+        self._planet_text = list(planet_text)
+        self._artifact_text = list(artifact_text)
+        self._lines = list(lines)
+        self._revision += 1
+        self._planet_tree = None
+        for listener in self._line_listeners:
+            listener(None, False)
+
+    def is_visited(self, position: Tuple) -> bool:
+        """ O(1) check whether a cell is on the map """
+        return _pack_position(position[0], position[1]) in self._cells
+
+    def nearest_planet(self, position: Tuple):
+        """ The known planet closest to position, only planets on this map are considered
+
+            Args:
+                position (Tuple): (x, y) to measure from
+
+            Returns:
+                tuple: (name, (x, y), distance), None when no planet is known yet
+        """
+        if self._planet_tree is None:
+            names, positions = [], []
+            for cell, name_id, kind in zip(self._entry_cell, self._entry_name, self._entry_kind):
+                if kind == _PLANET:
+                    names.append(self._names[name_id])
+                    positions.append((self._cell_x[cell], self._cell_y[cell]))
+            self._planet_tree = (KDTree(positions), names, positions)
+        tree, names, positions = self._planet_tree
+        found = tree.nearest(position[0], position[1], 1)
+        if not found:
+            return None
+        distance, i = found[0]
+        return names[i], positions[i], distance
+
+    def _positions(self) -> list:
+        return list(zip(self._cell_x, self._cell_y))
+
+    def _cell_info(self) -> Dict:
+        info = [{"planets": [], "artifacts": []} for _ in range(len(self._cell_x))]
+        for cell, name_id, kind in zip(self._entry_cell, self._entry_name, self._entry_kind):
+            info[cell]["planets" if kind == _PLANET else "artifacts"].append(self._names[name_id])
+        return dict(zip(self._positions(), info))
+
+
+    def record_scan_results(self, star_map: Any, results: list) -> None:
+        """ Add the output of StarMap.scan_many to the celestial map in bulk
+
+            Args:
+                star_map (StarMap): Star map the scan was run against
+                results (list): (planet_indices, artifact_indices) pair per sensor
+        
+            Returns: None
+        """
+        planet_names = star_map.planet_names
+        artifact_names = star_map.artifact_names
+        for planet_indices, artifact_indices in results:
+            for index in planet_indices.tolist():
+                name = planet_names[index]
+                self._record(star_map.planets[name], name, None)
+            for index in artifact_indices.tolist():
+                name = artifact_names[index]
+                artifact_data = star_map.artifacts[name]
+                self._record((artifact_data["x"], artifact_data["y"]), None, name)
 
-    
     
     def print_celestial_map(self) -> None:
         """ Print the celestial map, this will likely be done in a popup box
@@ -91,16 +339,11 @@ class celestial_map:
             
             Returns: None
         """
-        if not self.map_data["visited_info"]:
+        if not self._cells:
             return "No locations visited yet."
 
-        lines = []
-        lines.append("\n=== CELESTIAL MAP VISITS ===") 
-        for position, info in self.map_data["visited_info"].items():
-            planets = ', '.join(info.get("planets", [])) or "None"
-            artifacts = ', '.join(info.get("artifacts", [])) or "None"
-            lines.append(f"Position: {position} | Planets: {planets} | Artifacts: {artifacts}")
-        return "\n".join(lines)
+        # Lines are rendered as cells are visited, only the join happens here
+        return "\n=== CELESTIAL MAP VISITS ===\n" + "\n".join(self._lines)
         
         '''
         def print_celestial_map(self) -> str:
@@ -0,0 +1,144 @@
+"""
+Hot-path instrumentation
+
+Counts and times moves, sensor scans, celestial map visits, freighter
+encounters, engine steps and GUI refreshes. Nothing is patched until
+enable() is called: it swaps timed wrappers in for the methods listed in
+HOOKS, and disable() puts the original functions back, so a game that never
+enables instrumentation runs exactly the code it always did.
+
+Every timed call adds to its counter and to a histogram of power-of-two
+microsecond buckets. stats() gives the data as a dict, format_stats() as the
+lines the control panel's STATS button shows, and export_json() writes it to
+a file (App does this on exit when shared_items.instrumentation is set).
+
+Methods:
+    enable() / disable() / is_enabled(): Install or remove the wrappers
+    reset(): Drop the collected data
+    stats(): Counters, totals and histograms by stat name
+    format_stats(): One line per stat for display
+    export_json(path): Write stats() as JSON
+"""
+import functools
+import importlib
+import json
+import os
+import time
+
+# (module, class, method, stat name) of every instrumented method
+HOOKS = (
+    ("Ship", "Ship", "move", "move"),
+    ("Ship", "AbandonFrieghtor", "transfer_items", "frieghtor"),
+    ("Sensor", "Sensor", "scan", "scan"),
+    ("Sensor", "Sensor", "upgrade", "sensor_upgrade"),
+    ("StarMap", "StarMap", "scan_many", "scan_many"),
+    ("celestial_map", "celestial_map", "visit", "visit"),
+    ("celestial_map", "celestial_map", "record_scan_results", "record_scan"),
+    ("GameEngine", "GameEngine", "step", "step"),
+    ("Control_Panel", "Control_Panel", "_flush_display", "gui_refresh"),
+)
+# Histogram buckets: calls under 2**i microseconds, the last bucket takes the rest
+BUCKETS = 24
+
+_installed = {}         # (class, method) -> original function while enabled
+_counts = {}            # stat name -> calls
+_totals = {}            # stat name -> total nanoseconds
+_maxima = {}            # stat name -> slowest call in nanoseconds
+_histograms = {}        # stat name -> list of BUCKETS call counts
+
+
+def _record(name, elapsed_ns):
+    if name not in _counts:
+        _counts[name] = 0
+        _totals[name] = 0
+        _maxima[name] = 0
+        _histograms[name] = [0] * BUCKETS
+    _counts[name] += 1
+    _totals[name] += elapsed_ns
+    if elapsed_ns > _maxima[name]:
+        _maxima[name] = elapsed_ns
+    _histograms[name][min((elapsed_ns // 1000).bit_length(), BUCKETS - 1)] += 1
+
+
+def _timed(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _record(name, time.perf_counter_ns() - start)
+    return wrapper
+
+
+def enable() -> None:
+    """Install the timing wrappers, modules that can't be imported (no tkinter) are skipped"""
+    for module_name, class_name, method, name in HOOKS:
+        try:
+            cls = getattr(importlib.import_module(module_name), class_name)
+        except ImportError:
+            continue
+        if (cls, method) in _installed:
+            continue
+        original = cls.__dict__[method]
+        _installed[(cls, method)] = original
+        setattr(cls, method, _timed(name, original))
+
+
+def disable() -> None:
+    """Put the original methods back, the collected data is kept"""
+    for (cls, method), original in _installed.items():
+        setattr(cls, method, original)
+    _installed.clear()
+
+
+def is_enabled() -> bool:
+    return bool(_installed)
+
+
+def reset() -> None:
+    _counts.clear()
+    _totals.clear()
+    _maxima.clear()
+    _histograms.clear()
+
+
+def stats() -> dict:
+    """ Collected data by stat name
+
+        Returns:
+            dict: name -> {'count', 'total_ms', 'mean_ms', 'max_ms', 'histogram'}, the histogram
+                  mapping bucket labels ('<1us', '<2us', ..., '>=...us') to call counts
+    """
+    labels = [f"<{1 << i}us" for i in range(BUCKETS - 1)] + [f">={1 << (BUCKETS - 2)}us"]
+    result = {}
+    for name in sorted(_counts):
+        count = _counts[name]
+        result[name] = {
+            "count": count,
+            "total_ms": _totals[name] / 1e6,
+            "mean_ms": _totals[name] / count / 1e6,
+            "max_ms": _maxima[name] / 1e6,
+            "histogram": {label: n for label, n in zip(labels, _histograms[name]) if n},
+        }
+    return result
+
+
+def format_stats() -> list:
+    """One 'name: calls, total, mean, max' line per stat"""
+    return [f"{name}: {s['count']} calls, {s['total_ms']:.1f} ms total, "
+            f"{s['mean_ms']:.3f} ms mean, {s['max_ms']:.3f} ms max"
+            for name, s in stats().items()]
+
+
+def export_json(path) -> str:
+    """ Write stats() to path as JSON
+
+        Returns:
+            str: The path written
+    """
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as out:
+        json.dump(stats(), out, indent=2)
+    os.replace(temp_path, path)
+    return path
@@ -1,13 +1,36 @@
 import os
-# This code is designed to load artifacts from a text file
-def get_game_data(filename="ARTIFACT.TXT"):
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+# Parsed game data is shared by every caller in the process. Entries are keyed
+# on the file path and invalidated when the file's mtime or size changes.
+_game_data_cache = {}
+
+
+def clear_game_data_cache():
+    """Drop every cached parse so the next get_game_data() call rereads the file"""
+    _game_data_cache.clear()
+
+
+class GameRecord(NamedTuple):
+    """One entry of an ARTIFACT.TXT style file"""
+    section: str            # "planets", "target" or "artifacts"
+    name: str
+    type: Optional[str]     # "PLANET", the artifact type, or None for the target
+    x: Optional[int]
+    y: Optional[int]
+
+
+def _file_path(filename):
     # I added a relative path to the ARTIFACT.TXT file
     script_dir = os.path.dirname(os.path.abspath(__file__))
-    file_path = os.path.join(script_dir, filename)
-    
-    artifacts = {}
-    planets = {}
-    target = None
+    return os.path.join(script_dir, filename)
+
+
+def iter_game_records(filename="ARTIFACT.TXT"):
+    """Yield a GameRecord per entry, one line at a time, so files of any size
+    can be read in constant memory"""
+    file_path = _file_path(filename)
     section = None
 
     with open(file_path, 'r') as file:
@@ -27,19 +50,46 @@ def get_game_data(filename="ARTIFACT.TXT"):
             if section == "planets":
                 name, coords = line.split()
                 x, y = map(int, coords.split(','))
-                planets[name] = (x, y)
+                yield GameRecord(section, name, "PLANET", x, y)
             elif section == "target":
-                target = line
+                yield GameRecord(section, line, None, None, None)
             elif section == "artifacts":
                 parts = line.split()
                 if len(parts) >= 3:
-                    name = parts[0]
-                    artifact_type = parts[1]
                     x, y = map(int, parts[2].split(','))
-                    artifacts[name] = {"type": artifact_type, "x": x, "y": y}
+                    yield GameRecord(section, parts[0], parts[1], x, y)
+
+
+def _parse_game_data(file_path):
+    artifacts = {}
+    planets = {}
+    target = None
+
+    for record in iter_game_records(file_path):
+        if record.section == "planets":
+            planets[record.name] = (record.x, record.y)
+        elif record.section == "target":
+            target = record.name
+        else:
+            artifacts[record.name] = MappingProxyType({"type": record.type, "x": record.x, "y": record.y})
 
-    return {
-        "planets": planets,
+    # Read-only views so one parsed object can safely be handed to every consumer
+    return MappingProxyType({
+        "planets": MappingProxyType(planets),
         "target": target,
-        "artifacts": artifacts
-    }
+        "artifacts": MappingProxyType(artifacts)
+    })
+
+
+# This code is designed to load artifacts from a text file
+def get_game_data(filename="ARTIFACT.TXT"):
+    file_path = _file_path(filename)
+
+    stat = os.stat(file_path)
+    cached = _game_data_cache.get(file_path)
+    if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    game_data = _parse_game_data(file_path)
+    _game_data_cache[file_path] = (stat.st_mtime_ns, stat.st_size, game_data)
+    return game_data
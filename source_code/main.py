@@ -1,11 +1,12 @@
 # source_code/main.py
 # This is the main entry point for the script
 
+import sys
 from App import App
 
 def main():
-    # Initialize and run the application
-    app = App()
+    # Initialize and run the application, "python main.py session.rec" records the session
+    app = App(record_path=sys.argv[1] if len(sys.argv) > 1 else None)
     app.run()
 
 if __name__ == "__main__":
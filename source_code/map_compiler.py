@@ -0,0 +1,411 @@
+"""
+Compiled map format
+
+ARTIFACT.TXT stays the source of truth. compile_map() turns it into a compact
+binary file that load_compiled_map() memory-maps, so big generated universes
+don't have to be split into strings line by line on every start. The binary is
+written next to the text file (ARTIFACT.TXT -> ARTIFACT.TXT.gmap) and
+get_compiled_map() rebuilds it whenever the text file's mtime or size no longer
+match the ones recorded in its header.
+
+Layout (little-endian):
+    header          magic, version, source mtime_ns and size, planet/artifact/type
+                    counts, target string index (-1 when there is no target),
+                    string table byte length
+    string offsets  uint32[strings + 1], strings are planet names, artifact names,
+                    artifact type names and the target, in that order
+    planets         int32 x and y sorted by x, int32 order (sorted slot -> planet
+                    index) and rank (planet index -> sorted slot)
+    artifacts       the same four arrays for artifacts, plus int32 type codes
+                    indexed by artifact
+    string table    utf-8 bytes
+
+Planet and artifact indices follow the text file order, like get_game_data. The
+x-sorted arrays are exactly what StarMap.scan_many works on, so they are handed
+to StarMap without copying.
+
+StarMap's planet distance tables can be saved next to the binary map
+(ARTIFACT.TXT.gmap.tables.npz) with CompiledMap.save_tables(); star_map() adopts
+them as long as they were built from the same text file.
+"""
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+
+import numpy as np
+
+from load_artifacts import GameRecord, get_game_data, iter_game_records
+from StarMap import StarMap
+
+MAGIC = b"GSSMAP\0\0"
+VERSION = 1
+EXTENSION = ".gmap"
+TABLES_EXTENSION = ".tables.npz"
+_HEADER = struct.Struct("<8sIqqIIIiI")
+
+
+def _source_path(filename):
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(script_dir, filename)
+
+
+def compiled_path(filename="ARTIFACT.TXT") -> str:
+    """Path of the binary map compiled from filename"""
+    return _source_path(filename) + EXTENSION
+
+
+def _sorted_columns(xs, ys):
+    order = np.argsort(xs, kind="stable").astype("<i4")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order), dtype="<i4")
+    return [xs[order], ys[order], order, rank]
+
+
+class _Section:
+    """Coordinates and name lengths of one section, names spooled to a temp file"""
+
+    def __init__(self):
+        self.x = array("i")
+        self.y = array("i")
+        self.types = array("i")
+        self.name_lengths = array("I")
+        self.name_hashes = array("q")
+        self.names = tempfile.TemporaryFile()
+
+    def add(self, name, x, y, type_code=0):
+        encoded = name.encode("utf-8")
+        self.names.write(encoded)
+        self.name_lengths.append(len(encoded))
+        self.name_hashes.append(hash(name))
+        self.x.append(x)
+        self.y.append(y)
+        self.types.append(type_code)
+
+    def has_duplicates(self):
+        hashes = np.frombuffer(self.name_hashes, dtype=np.int64)
+        return len(np.unique(hashes)) != len(hashes)
+
+    def close(self):
+        self.names.close()
+
+
+def _read_sections(records):
+    planets = _Section()
+    artifacts = _Section()
+    type_codes = {}
+    target = None
+    try:
+        for record in records:
+            if record.section == "planets":
+                planets.add(record.name, record.x, record.y)
+            elif record.section == "artifacts":
+                code = type_codes.setdefault(record.type, len(type_codes))
+                artifacts.add(record.name, record.x, record.y, code)
+            else:
+                target = record.name
+    except BaseException:
+        planets.close()
+        artifacts.close()
+        raise
+    return planets, artifacts, type_codes, target
+
+
+def _dict_records(game_data):
+    for name, (x, y) in game_data["planets"].items():
+        yield GameRecord("planets", name, "PLANET", x, y)
+    if game_data["target"] is not None:
+        yield GameRecord("target", game_data["target"], None, None, None)
+    for name, data in game_data["artifacts"].items():
+        yield GameRecord("artifacts", name, data["type"], data["x"], data["y"])
+
+
+def compile_map(filename="ARTIFACT.TXT", out_path=None) -> str:
+    """ Compile an ARTIFACT.TXT style file into the binary map format
+
+        The text is streamed with iter_game_records, names are spooled to temporary
+        files and only the int32 columns are held in memory. Files that repeat a
+        name fall back to get_game_data so later entries replace earlier ones the
+        same way.
+
+        Args:
+            filename (str): Text map, relative to source_code like get_game_data
+            out_path (str): Where to write, defaults to compiled_path(filename)
+
+        Returns:
+            str: Path of the written binary map
+    """
+    source = _source_path(filename)
+    out_path = out_path or compiled_path(filename)
+    stat = os.stat(source)
+
+    planets, artifacts, type_codes, target = _read_sections(iter_game_records(source))
+    if planets.has_duplicates() or artifacts.has_duplicates():
+        planets.close()
+        artifacts.close()
+        planets, artifacts, type_codes, target = _read_sections(_dict_records(get_game_data(source)))
+    try:
+        return _write_map(out_path, stat, planets, artifacts, type_codes, target)
+    finally:
+        planets.close()
+        artifacts.close()
+
+
+def _write_map(out_path, stat, planets, artifacts, type_codes, target):
+    # The caller owns (and closes) the sections' spooled name files
+    extra = [t.encode("utf-8") for t in type_codes]
+    target_index = -1
+    if target is not None:
+        target_index = len(planets.x) + len(artifacts.x) + len(extra)
+        extra.append(target.encode("utf-8"))
+    lengths = np.concatenate([np.frombuffer(planets.name_lengths, dtype=np.uint32),
+                              np.frombuffer(artifacts.name_lengths, dtype=np.uint32),
+                              np.array([len(b) for b in extra], dtype=np.uint32)])
+    offsets = np.zeros(len(lengths) + 1, dtype="<u4")
+    np.cumsum(lengths, out=offsets[1:])
+
+    sections = [offsets]
+    for section in (planets, artifacts):
+        sections += _sorted_columns(np.frombuffer(section.x, dtype=np.int32).astype("<i4"),
+                                    np.frombuffer(section.y, dtype=np.int32).astype("<i4"))
+    sections.append(np.frombuffer(artifacts.types, dtype=np.int32).astype("<i4"))
+
+    temp_path = out_path + ".tmp"
+    with open(temp_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION, stat.st_mtime_ns, stat.st_size,
+                               len(planets.x), len(artifacts.x), len(type_codes),
+                               target_index, int(offsets[-1])))
+        for section in sections:
+            out.write(section.tobytes())
+        for section in (planets, artifacts):
+            section.names.seek(0)
+            shutil.copyfileobj(section.names, out)
+        for b in extra:
+            out.write(b)
+    os.replace(temp_path, out_path)
+    return out_path
+
+
+class _NameSequence(Sequence):
+    """Names decoded from the string table on access"""
+
+    def __init__(self, compiled, start, count):
+        self._compiled = compiled
+        self._start = start
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("name index out of range")
+        return self._compiled.string(self._start + index)
+
+
+class _CoordinateView(Mapping):
+    """Read-only name -> coordinates mapping over the memory-mapped arrays"""
+
+    def __init__(self, names, xs, ys, rank):
+        self._names = names
+        self._xs = xs
+        self._ys = ys
+        self._rank = rank
+        self._index = None      # name -> index, built on the first lookup by name
+
+    def __len__(self):
+        return len(self._names)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __getitem__(self, name):
+        if self._index is None:
+            self._index = {n: i for i, n in enumerate(self._names)}
+        return self._value(self._index[name])
+
+    def _value(self, index):
+        slot = self._rank[index]
+        return (int(self._xs[slot]), int(self._ys[slot]))
+
+    def items(self):
+        return ((name, self._value(i)) for i, name in enumerate(self._names))
+
+    def values(self):
+        return (self._value(i) for i in range(len(self._names)))
+
+
+class _ArtifactView(_CoordinateView):
+
+    def __init__(self, names, xs, ys, rank, types, type_names):
+        super().__init__(names, xs, ys, rank)
+        self._types = types
+        self._type_names = type_names
+
+    def _value(self, index):
+        x, y = super()._value(index)
+        return MappingProxyType({"type": self._type_names[self._types[index]], "x": x, "y": y})
+
+
+class CompiledMap:
+    """ Memory-mapped binary map
+
+        Attributes:
+            planet_names, artifact_names: Names in text file order
+            planets, artifacts: Read-only mappings shaped like get_game_data's
+            target (str): Target planet or None
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.source_mtime_ns, self.source_size, n_planets, n_artifacts,
+         n_types, target_index, string_bytes) = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} compiled map")
+
+        n_strings = n_planets + n_artifacts + n_types + (target_index >= 0)
+        offset = _HEADER.size
+        self._string_offsets, offset = self._array("<u4", n_strings + 1, offset)
+        planet_columns = []
+        for _ in range(4):
+            column, offset = self._array("<i4", n_planets, offset)
+            planet_columns.append(column)
+        artifact_columns = []
+        for _ in range(4):
+            column, offset = self._array("<i4", n_artifacts, offset)
+            artifact_columns.append(column)
+        artifact_type, offset = self._array("<i4", n_artifacts, offset)
+        self._strings_start = offset
+        if offset + string_bytes != len(self._mmap):
+            raise ValueError(f"{path} is truncated or corrupt")
+
+        self.planet_names = _NameSequence(self, 0, n_planets)
+        self.artifact_names = _NameSequence(self, n_planets, n_artifacts)
+        type_names = [self.string(n_planets + n_artifacts + i) for i in range(n_types)]
+        self.target = self.string(target_index) if target_index >= 0 else None
+
+        self._planet_columns = planet_columns
+        self._artifact_columns = artifact_columns
+        self.planets = _CoordinateView(self.planet_names, planet_columns[0], planet_columns[1], planet_columns[3])
+        self.artifacts = _ArtifactView(self.artifact_names, artifact_columns[0], artifact_columns[1],
+                                       artifact_columns[3], artifact_type, type_names)
+
+    def _array(self, dtype, count, offset):
+        array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+        return array, offset + array.nbytes
+
+    def string(self, index) -> str:
+        start = self._strings_start + int(self._string_offsets[index])
+        end = self._strings_start + int(self._string_offsets[index + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def is_stale(self, source) -> bool:
+        """True when source no longer matches the file this map was compiled from"""
+        stat = os.stat(source)
+        return stat.st_mtime_ns != self.source_mtime_ns or stat.st_size != self.source_size
+
+    @property
+    def tables_path(self) -> str:
+        return self.path + TABLES_EXTENSION
+
+    def star_map(self) -> StarMap:
+        """StarMap whose lookups and scan_many arrays are views into the mapped file,
+        with any saved distance and energy tables already loaded"""
+        xs, ys, order, _ = self._planet_columns
+        ax, ay, a_order, _ = self._artifact_columns
+        star_map = StarMap(self.planets, self.target, self.artifacts, coordinate_arrays={
+            "planet_names": self.planet_names,
+            "artifact_names": self.artifact_names,
+            "planets": (xs, ys, order),
+            "artifacts": (ax, ay, a_order),
+        })
+        if os.path.exists(self.tables_path):
+            try:
+                with np.load(self.tables_path) as saved:
+                    source = saved["source"]
+                    if source[0] == self.source_mtime_ns and source[1] == self.source_size:
+                        star_map.import_tables({key: saved[key] for key in saved.files if key != "source"})
+            except (OSError, ValueError, KeyError):
+                pass        # Damaged or foreign file, the tables are rebuilt on demand
+        return star_map
+
+    def save_tables(self, star_map=None, metrics=("manhattan",)) -> str:
+        """ Build the planet distance tables for metrics and save them next to the
+            binary map, energy costs are computed from these when looked up
+
+            Args:
+                star_map (StarMap): Map whose tables to save, defaults to star_map()
+                metrics (tuple): StarMap.METRICS to build
+
+            Returns:
+                str: Path of the tables file
+        """
+        star_map = star_map or self.star_map()
+        for metric in metrics:
+            star_map.distance_table(metric)
+        tables = star_map.export_tables()
+        temp_path = self.tables_path + ".tmp"
+        with open(temp_path, "wb") as out:
+            np.savez(out, source=np.array([self.source_mtime_ns, self.source_size], dtype=np.int64), **tables)
+        os.replace(temp_path, self.tables_path)
+        return self.tables_path
+
+
+def load_compiled_map(path) -> CompiledMap:
+    """Memory-map a binary map written by compile_map"""
+    return CompiledMap(path)
+
+
+def get_compiled_map(filename="ARTIFACT.TXT") -> CompiledMap:
+    """ Load the binary form of filename, compiling it first when missing or stale
+
+        Args:
+            filename (str): Text map, relative to source_code like get_game_data
+
+        Returns:
+            CompiledMap
+    """
+    source = _source_path(filename)
+    path = compiled_path(filename)
+    if os.path.exists(path):
+        try:
+            compiled = CompiledMap(path)
+            if not compiled.is_stale(source):
+                return compiled
+        except (ValueError, struct.error):
+            pass            # Old version or damaged file, recompile it
+    compile_map(filename, path)
+    return CompiledMap(path)
+
+
+def load_star_map(filename="ARTIFACT.TXT") -> StarMap:
+    """ StarMap of filename without writing anything to disk
+
+        The compiled map is used when an up-to-date one already exists, otherwise
+        the text file is parsed with get_game_data.
+
+        Args:
+            filename (str): Text map, relative to source_code like get_game_data
+
+        Returns:
+            StarMap
+    """
+    source = _source_path(filename)
+    path = compiled_path(filename)
+    if os.path.exists(path):
+        try:
+            compiled = CompiledMap(path)
+            if not compiled.is_stale(source):
+                return compiled.star_map()
+        except (ValueError, struct.error):
+            pass
+    game_data = get_game_data(source)
+    return StarMap(game_data["planets"], game_data["target"], game_data["artifacts"])
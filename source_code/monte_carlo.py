@@ -0,0 +1,165 @@
+"""
+Monte Carlo survival simulator
+
+Advances many independent ships at once in NumPy arrays so shared_items
+(energy, supply_useage, frieghtor_rate, starting_engine, ...) can be tuned
+from survival statistics instead of hand-played games.
+
+Every step applies the same rules as one Ship.move(1, angle) call:
+    - supplies drop by supply_useage and energy by the engine cost (MovingEntity.use_*)
+    - the position changes by one unit (MovingEntity.change_position)
+    - with frieghtor_rate percent chance an abandoned freighter hands over its
+      energy and supplies (Ship.encounter_frieghtor / AbandonFrieghtor)
+    - the ship dies when energy or supplies reach 0 (Ship.check_vitals)
+    - leaving the map triggers a wormhole (MovingEntity.check_position)
+
+Only the random draws differ from Ship: they come from a NumPy generator.
+
+Run with: python monte_carlo.py [ships] [max_steps]
+"""
+import sys
+import numpy as np
+
+import shared_items
+from Ship import ENGINE_COSTS, MovingEntity
+
+# Unit step (dx, dy) for the four Control_Panel directions: right, up, left, down
+_STEPS = np.array([[1, 0], [0, 1], [-1, 0], [0, -1]], dtype=np.int64)
+_POLICIES = {"right": 0, "up": 1, "left": 2, "down": 3}
+
+
+def _freighter_cargo(rng, count, low, high):
+    # Average of two draws like MovingEntity(use_rand=True)
+    spread = high - low
+    return np.round((rng.random(count) * spread + rng.random(count) * spread) / 2 + low)
+
+
+def simulate_survival(n_ships: int, max_steps: int = 1000, policy: str = "random", seed=None) -> dict:
+    """ Play n_ships independent games with the current shared_items settings
+
+        Args:
+            n_ships (int): Number of ships to simulate
+            max_steps (int): Moves after which surviving ships stop
+            policy (str): 'random' picks one of the four directions every step,
+                          'up', 'down', 'left' or 'right' always moves that way
+            seed: Seed for the NumPy generator, None for a fresh one
+
+        Returns:
+            dict: Per-ship arrays 'steps' (moves made, including the fatal one),
+                  'died', 'frieghtors' and 'wormholes'
+    """
+    MovingEntity(False)         # Validates the shared_items configuration like every ship does
+    if policy != "random" and policy not in _POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}")
+    if shared_items.playstyle not in ("regular play", "never dies"):
+        raise ValueError(f"Unknown playstyle {shared_items.playstyle!r}")
+
+    cost = ENGINE_COSTS.get(shared_items.starting_engine)
+    if cost is None:
+        print(f"The value of {shared_items.starting_engine} is not valid for the engine type")
+        cost = 0
+    boundary = shared_items.max
+    rate = shared_items.frieghtor_rate
+    can_die = shared_items.playstyle == "regular play"
+    rng = np.random.default_rng(seed)
+
+    steps = np.full(n_ships, max_steps, dtype=np.int64)
+    died = np.zeros(n_ships, dtype=bool)
+    frieghtors = np.zeros(n_ships, dtype=np.int64)
+    wormholes = np.zeros(n_ships, dtype=np.int64)
+
+    # State of the ships still flying, compacted whenever some die
+    ids = np.arange(n_ships)
+    x = np.full(n_ships, shared_items.current_x, dtype=np.int64)
+    y = np.full(n_ships, shared_items.current_y, dtype=np.int64)
+    energy = np.full(n_ships, shared_items.energy, dtype=np.float64)
+    supplies = np.full(n_ships, shared_items.supplies, dtype=np.float64)
+
+    for step in range(1, max_steps + 1):
+        if len(ids) == 0:
+            break
+        count = len(ids)
+
+        supplies -= shared_items.supply_useage
+        energy -= cost
+
+        if policy == "random":
+            moves = _STEPS[rng.integers(0, 4, count)]
+            x += moves[:, 0]
+            y += moves[:, 1]
+        else:
+            dx, dy = _STEPS[_POLICIES[policy]]
+            x += dx
+            y += dy
+
+        found = np.flatnonzero(rng.random(count) * 100 < rate)
+        if len(found):
+            supplies[found] += _freighter_cargo(rng, len(found), shared_items.min_supplies, shared_items.max_supplies)
+            energy[found] += _freighter_cargo(rng, len(found), shared_items.min_energy, shared_items.max_energy)
+            frieghtors[ids[found]] += 1
+
+        out = (x > boundary) | (x < -boundary) | (y > boundary) | (y < -boundary)
+        if can_die:
+            dead = (energy <= 0) | (supplies <= 0)
+            out &= ~dead
+        else:
+            dead = None
+
+        hits = np.flatnonzero(out)
+        if len(hits):
+            wormholes[ids[hits]] += 1
+            if shared_items.set_wormhole == "no":
+                x[hits] = np.round(rng.random(len(hits)) * boundary * 2 - boundary)
+                y[hits] = np.round(rng.random(len(hits)) * boundary * 2 - boundary)
+            else:
+                x[hits] = shared_items.set_position[0]
+                y[hits] = shared_items.set_position[1]
+
+        if dead is not None and dead.any():
+            steps[ids[dead]] = step
+            died[ids[dead]] = True
+            keep = ~dead
+            ids, x, y, energy, supplies = ids[keep], x[keep], y[keep], energy[keep], supplies[keep]
+
+    return {
+        "steps": steps,
+        "died": died,
+        "frieghtors": frieghtors,
+        "wormholes": wormholes,
+    }
+
+
+def summarize_survival(result: dict) -> dict:
+    """ Reduce simulate_survival output to summary statistics
+
+        Args:
+            result (dict): Output of simulate_survival
+
+        Returns:
+            dict: Ship count, death rate, mean/min/max and 10/50/90th percentile of
+                  survival steps, and the survival-time histogram (index = steps)
+    """
+    steps = result["steps"]
+    p10, p50, p90 = np.percentile(steps, [10, 50, 90])
+    return {
+        "ships": len(steps),
+        "death_rate": float(result["died"].mean()),
+        "mean_steps": float(steps.mean()),
+        "min_steps": int(steps.min()),
+        "p10_steps": float(p10),
+        "median_steps": float(p50),
+        "p90_steps": float(p90),
+        "max_steps": int(steps.max()),
+        "mean_frieghtors": float(result["frieghtors"].mean()),
+        "mean_wormholes": float(result["wormholes"].mean()),
+        "histogram": np.bincount(steps),
+    }
+
+
+if __name__ == "__main__":
+    ships = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    max_steps = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    summary = summarize_survival(simulate_survival(ships, max_steps))
+    for key, value in summary.items():
+        if key != "histogram":
+            print(f"{key}: {value}")
@@ -0,0 +1,131 @@
+"""
+Parameter sweep over shared_items configurations
+
+shared_items is a module of globals, so one interpreter can only play one
+configuration at a time. This tool expands a grid of shared_items overrides,
+plays headless games (GameEngine) for every configuration in a process pool
+and merges the results into one table.
+
+Each game is seeded from (seed, configuration index, game index), so the
+results don't depend on the number of processes or on which worker picks
+up which configuration.
+
+Run with: python param_sweep.py
+"""
+import contextlib
+import itertools
+import multiprocessing
+import os
+
+import shared_items
+from GameEngine import GameEngine, DIRECTIONS
+
+
+def expand_grid(grid: dict) -> list:
+    """ Expand {'name': [values, ...], ...} into one override dict per combination
+
+        Args:
+            grid (dict): shared_items variable name -> list of values to try
+
+        Returns:
+            list: Override dicts in itertools.product order
+    """
+    for name in grid:
+        if not hasattr(shared_items, name):
+            raise ValueError(f"shared_items has no setting named {name!r}")
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def play_random_game(max_moves: int, seed=None) -> dict:
+    """ Play one headless game moving in a random direction every turn
+
+        Args:
+            max_moves (int): Moves after which a surviving ship stops
+            seed: Seed of the game's GameRNG, None for an unseeded game
+
+        Returns:
+            dict: 'moves', 'died', 'frieghtors' and 'wormholes' for the game
+    """
+    counts = {"frieghtor": 0, "wormhole": 0}
+
+    def count_event(event):
+        if event["type"] in counts:
+            counts[event["type"]] += 1
+
+    engine = GameEngine(on_event=count_event, seed=seed)
+    directions = list(DIRECTIONS)
+    while engine.steps < max_moves and not engine.game_over:
+        engine.step(engine.rng.choice(directions))
+    return {
+        "moves": engine.steps,
+        "died": engine.game_over,
+        "frieghtors": counts["frieghtor"],
+        "wormholes": counts["wormhole"],
+    }
+
+
+def _run_configuration(task) -> dict:
+    index, overrides, games, max_moves, seed = task
+    saved = {name: getattr(shared_items, name) for name in overrides}
+    results = []
+    try:
+        for name, value in overrides.items():
+            setattr(shared_items, name, value)
+        # The settings as this worker's games see them
+        row = {name: getattr(shared_items, name) for name in overrides}
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for game in range(games):
+                results.append(play_random_game(max_moves, seed=f"{seed}-{index}-{game}"))
+    finally:
+        for name, value in saved.items():
+            setattr(shared_items, name, value)
+
+    row["games"] = games
+    row["mean_moves"] = sum(r["moves"] for r in results) / games
+    row["death_rate"] = sum(r["died"] for r in results) / games
+    row["mean_frieghtors"] = sum(r["frieghtors"] for r in results) / games
+    row["mean_wormholes"] = sum(r["wormholes"] for r in results) / games
+    return row
+
+
+def sweep(grid: dict, games: int = 100, max_moves: int = 1000, seed: int = 0, processes=None) -> list:
+    """ Play every configuration of the grid across a process pool
+
+        Args:
+            grid (dict): shared_items variable name -> list of values to try
+            games (int): Games played per configuration
+            max_moves (int): Move limit per game
+            seed (int): Base seed, the same seed always gives the same table
+            processes (int): Worker processes, defaults to every core
+
+        Returns:
+            list: One row dict per configuration, in expand_grid order
+    """
+    tasks = [(index, overrides, games, max_moves, seed)
+             for index, overrides in enumerate(expand_grid(grid))]
+    with multiprocessing.Pool(processes) as pool:
+        return pool.map(_run_configuration, tasks, chunksize=1)
+
+
+def format_table(rows: list) -> str:
+    """Format sweep rows as an aligned text table"""
+    if not rows:
+        return "No results."
+    columns = list(rows[0])
+    cells = [[f"{row[c]:.3f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in cells)) for i, c in enumerate(columns)]
+    lines = ["  ".join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines.append("  ".join("-" * w for w in widths))
+    for r in cells:
+        lines.append("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    example_grid = {
+        "starting_engine": ["basic", "upgraded", "pro"],
+        "frieghtor_rate": [2, 10, 25],
+        "supply_useage": [1, 2],
+    }
+    print(format_table(sweep(example_grid, games=50)))
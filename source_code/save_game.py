@@ -0,0 +1,225 @@
+"""
+Saved games
+
+save_game() writes the complete state of a GameEngine (ship vitals, money,
+position and engine, sensors, celestial map visits, the GameRNG stream and
+the game progress) to a compact binary file. load_game() builds a
+ready GameEngine from it without rescanning any sensor, the celestial map
+already holds everything they found. It plays on ARTIFACT.TXT unless a star
+map is given, memory-mapping the compiled map when an up-to-date one exists
+(see map_compiler) and never writing one.
+
+Layout (little-endian):
+    header      magic b"GSSSAVE\\0", version u4
+    sections    in the order of _SECTIONS, each one a u8 byte length followed by
+                the bytes: fixed ship/game fields, engine type, seed, RNG state,
+                sensor positions (int64 pairs) and radii (int32), celestial map
+                names and columns, rendered map text, the sensor coverage bitmap
+                (int64 tile keys and packed tile bits), the ship name and the
+                sensor footprints (u1 indices into sensor_masks.FOOTPRINTS)
+
+Numbers are stored as doubles with a flag per value remembering whether it
+was an int, so a loaded game prints exactly like the saved one.
+"""
+import os
+import struct
+from array import array
+
+import numpy as np
+
+from GameEngine import GameEngine
+from GameRNG import GameRNG
+from map_compiler import load_star_map
+from sensor_masks import FOOTPRINTS
+
+MAGIC = b"GSSSAVE\0"
+VERSION = 1
+EXTENSION = ".sav"
+
+_HEADER = struct.Struct("<8sI")
+_LENGTH = struct.Struct("<Q")
+_FIELDS = struct.Struct("<qqdddBBQ")        # x, y, energy, supplies, money, int flags, game_over, steps
+_SEED = struct.Struct("<B")                 # 0 no seed, 1 int, 2 str, followed by the text
+_RNG = struct.Struct("<IBd")                # random.Random state version, has gauss, gauss, then the words
+
+_SECTIONS = ("fields", "engine_type", "seed", "rng", "sensor_positions", "sensor_radii",
+             "names", "cell_x", "cell_y", "entry_cell", "entry_name", "entry_kind",
+             "planet_text", "artifact_text", "lines", "coverage_tiles", "coverage_bits",
+             "ship_name", "sensor_footprints")
+
+
+def _join(strings) -> bytes:
+    # Names and rendered lines never hold a newline (the map format splits on whitespace)
+    return "\n".join(strings).encode("utf-8")
+
+
+def _split(data, count) -> list:
+    return bytes(data).decode("utf-8").split("\n") if count else []
+
+
+def _column(typecode, data, dtype) -> array:
+    # Little-endian file column -> native array of the type celestial_map uses
+    column = array(typecode)
+    column.frombytes(np.frombuffer(data, dtype=dtype).astype(np.dtype(typecode)).tobytes())
+    return column
+
+
+def _encode_seed(seed) -> bytes:
+    if seed is None:
+        return _SEED.pack(0)
+    if isinstance(seed, int):
+        return _SEED.pack(1) + str(seed).encode()
+    return _SEED.pack(2) + str(seed).encode("utf-8")
+
+
+def _decode_seed(data):
+    kind = data[0]
+    text = bytes(data[1:]).decode("utf-8")
+    return None if kind == 0 else int(text) if kind == 1 else text
+
+
+def _encode_rng(state) -> bytes:
+    version, words, gauss = state
+    return (_RNG.pack(version, gauss is not None, gauss or 0.0)
+            + np.asarray(words, dtype="<u4").tobytes())
+
+
+def _decode_rng(data):
+    version, has_gauss, gauss = _RNG.unpack_from(data)
+    words = tuple(np.frombuffer(data, dtype="<u4", offset=_RNG.size).tolist())
+    return (version, words, gauss if has_gauss else None)
+
+
+def save_game(engine: GameEngine, path) -> str:
+    """ Write the game to path, replacing any earlier save atomically
+
+        Args:
+            engine (GameEngine): Game to save
+            path (str): Save file, EXTENSION is the usual suffix
+
+        Returns:
+            str: path
+    """
+    ship = engine.ship.get_state()
+    (names, cell_x, cell_y, entry_cell, entry_name, entry_kind,
+     planet_text, artifact_text, lines) = engine.cel_map.snapshot()
+
+    numbers = (ship["energy"], ship["supplies"], ship["money"])
+    int_flags = sum(1 << i for i, value in enumerate(numbers) if isinstance(value, int))
+    sensors = ship["sensors"]
+    sections = {
+        "fields": _FIELDS.pack(ship["position"][0], ship["position"][1], *numbers,
+                               int_flags, engine.game_over, engine.steps),
+        "engine_type": ship["engine_type"].encode("utf-8"),
+        "seed": _encode_seed(engine.seed),
+        "rng": _encode_rng(engine.rng.getstate()),
+        "sensor_positions": np.array([sensor[0] for sensor in sensors], dtype="<i8").reshape(-1, 2).tobytes(),
+        "sensor_radii": np.fromiter((sensor[1] for sensor in sensors), dtype="<i4", count=len(sensors)).tobytes(),
+        "names": _join(names),
+        "cell_x": np.frombuffer(cell_x, dtype=np.int64).astype("<i8").tobytes(),
+        "cell_y": np.frombuffer(cell_y, dtype=np.int64).astype("<i8").tobytes(),
+        "entry_cell": np.frombuffer(entry_cell, dtype=np.uint32).astype("<u4").tobytes(),
+        "entry_name": np.frombuffer(entry_name, dtype=np.uint32).astype("<u4").tobytes(),
+        "entry_kind": entry_kind.tobytes(),
+        "planet_text": _join(planet_text),
+        "artifact_text": _join(artifact_text),
+        "lines": _join(lines),
+        "coverage_tiles": np.array(list(ship["coverage"]), dtype="<i8").reshape(-1, 2).tobytes(),
+        "coverage_bits": b"".join(ship["coverage"].values()),
+        "ship_name": ship["name"].encode("utf-8"),
+        "sensor_footprints": bytes(FOOTPRINTS.index(sensor[2]) for sensor in sensors),
+    }
+
+    temp_path = path + ".tmp"
+    with open(temp_path, "wb") as out:
+        out.write(_HEADER.pack(MAGIC, VERSION))
+        for name in _SECTIONS:
+            out.write(_LENGTH.pack(len(sections[name])))
+            out.write(sections[name])
+    os.replace(temp_path, path)
+    return path
+
+
+def _read_sections(path) -> dict:
+    with open(path, "rb") as file:
+        data = memoryview(file.read())
+    if len(data) < _HEADER.size:
+        raise ValueError(f"{path} is not a saved game")
+    magic, version = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} saved game")
+
+    sections = {}
+    offset = _HEADER.size
+    for name in _SECTIONS:
+        if offset + _LENGTH.size > len(data):
+            raise ValueError(f"{path} is truncated")
+        (length,) = _LENGTH.unpack_from(data, offset)
+        offset += _LENGTH.size
+        if offset + length > len(data):
+            raise ValueError(f"{path} is truncated")
+        sections[name] = data[offset:offset + length]
+        offset += length
+    return sections
+
+
+def load_game(path, star_map=None, on_event=None) -> GameEngine:
+    """ Rebuild a saved game
+
+        Args:
+            path (str): File written by save_game
+            star_map (StarMap): Star map to play on, defaults to ARTIFACT.TXT (see load_star_map)
+            on_event (callable): Event callback for the new engine
+
+        Returns:
+            GameEngine: The game exactly as it was saved, random stream included
+    """
+    sections = _read_sections(path)
+    x, y, energy, supplies, money, int_flags, game_over, steps = _FIELDS.unpack(sections["fields"])
+    numbers = [int(value) if int_flags & (1 << i) else value
+               for i, value in enumerate((energy, supplies, money))]
+
+    positions = np.frombuffer(sections["sensor_positions"], dtype="<i8").reshape(-1, 2)
+    radii = np.frombuffer(sections["sensor_radii"], dtype="<i4")
+    codes = np.frombuffer(sections["sensor_footprints"], dtype=np.uint8)
+    if len(positions) != len(radii) or len(codes) != len(radii) or (len(codes) and codes.max() >= len(FOOTPRINTS)):
+        raise ValueError(f"{path} is corrupt")
+    cell_x = _column("q", sections["cell_x"], "<i8")
+    n_cells = len(cell_x)
+    tiles = np.frombuffer(sections["coverage_tiles"], dtype="<i8").reshape(-1, 2).tolist()
+    bits = bytes(sections["coverage_bits"])
+    size = len(bits) // len(tiles) if tiles else 0
+
+    ship = {
+        "name": bytes(sections["ship_name"]).decode("utf-8"),
+        "position": (x, y),
+        "energy": numbers[0],
+        "supplies": numbers[1],
+        "money": numbers[2],
+        "engine_type": bytes(sections["engine_type"]).decode("utf-8"),
+        "sensor_columns": (positions, radii, codes),    # indexed lazily by SensorRegistry
+        "coverage": {tuple(key): bits[i * size:(i + 1) * size] for i, key in enumerate(tiles)},
+    }
+
+    if star_map is None:
+        star_map = load_star_map()
+    engine = GameEngine(seed=_decode_seed(sections["seed"]), rng=GameRNG(), star_map=star_map,
+                        on_event=on_event)
+    engine.restore({
+        "ship": ship,
+        "cel_map": (
+            _split(sections["names"], len(sections["names"])),
+            cell_x,
+            _column("q", sections["cell_y"], "<i8"),
+            _column("I", sections["entry_cell"], "<u4"),
+            _column("I", sections["entry_name"], "<u4"),
+            _column("B", sections["entry_kind"], "u1"),
+            _split(sections["planet_text"], n_cells),
+            _split(sections["artifact_text"], n_cells),
+            _split(sections["lines"], n_cells),
+        ),
+        "rng": _decode_rng(sections["rng"]),
+        "game_over": bool(game_over),
+        "steps": steps,
+    })
+    return engine
@@ -0,0 +1,73 @@
+"""
+Sensor footprints
+
+A sensor sees every cell whose offset (dx, dy) from the sensor lies in its
+footprint: a square (|dx| <= r and |dy| <= r, the original Sensor.scan
+bounds) or a circle (dx^2 + dy^2 <= r^2). The offsets of every radius and
+footprint are computed once and cached, so a scan is the sensor position
+plus a precomputed table, looked up cell by cell in the StarMap grid.
+
+Radius tiers come from shared_items.sensor_radius_tiers; upgrading a sensor
+to the next tier only has to look at ring_offsets(old, new), the cells the
+bigger footprint adds.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+import shared_items
+
+FOOTPRINTS = ("square", "circle")
+
+
+def in_footprint(dx, dy, radius, footprint="square"):
+    """Whether offset (dx, dy) is inside the footprint, works on scalars and numpy arrays"""
+    if footprint == "square":
+        return (abs(dx) <= radius) & (abs(dy) <= radius)
+    if footprint == "circle":
+        return dx * dx + dy * dy <= radius * radius
+    raise ValueError(f"Unknown sensor footprint {footprint!r}")
+
+
+@lru_cache(maxsize=None)
+def _mask(radius, footprint):
+    span = np.arange(-radius, radius + 1)
+    return in_footprint(span[:, None], span[None, :], radius, footprint)
+
+
+def _offsets(mask, radius):
+    offsets = np.argwhere(mask) - radius
+    offsets.setflags(write=False)
+    return offsets
+
+
+@lru_cache(maxsize=None)
+def footprint_offsets(radius: int, footprint: str = "square") -> np.ndarray:
+    """ Read-only (N, 2) int array of the (dx, dy) offsets a sensor of radius sees
+
+        Args:
+            radius (int): Search radius, 0 sees only the sensor's own cell
+            footprint (str): 'square' or 'circle'
+    """
+    if radius < 0:
+        raise ValueError("Sensor radius can't be negative")
+    return _offsets(_mask(radius, footprint), radius)
+
+
+@lru_cache(maxsize=None)
+def ring_offsets(old_radius: int, new_radius: int, footprint: str = "square") -> np.ndarray:
+    """Offsets inside the new_radius footprint but outside the old_radius one"""
+    if not 0 <= old_radius <= new_radius:
+        raise ValueError("A sensor ring needs 0 <= old radius <= new radius")
+    mask = _mask(new_radius, footprint).copy()
+    pad = new_radius - old_radius
+    mask[pad:pad + 2 * old_radius + 1, pad:pad + 2 * old_radius + 1] &= ~_mask(old_radius, footprint)
+    return _offsets(mask, new_radius)
+
+
+def next_radius(radius: int):
+    """Radius of the first tier above radius, None when radius is already at the top tier"""
+    for tier in shared_items.sensor_radius_tiers:
+        if tier > radius:
+            return tier
+    return None
@@ -14,6 +14,16 @@ playstyle = "regular play"
 max = 10
 starting_cash = 10000
 sensor_cost = 2
+# sensor search radius per upgrade tier, new sensors start at the first one
+sensor_radius_tiers = [2, 3, 5, 8]
+# "square" (within the radius on both axes) or "circle" (within the radius as the crow flies)
+sensor_footprint = "square"
+# print sensor scan and celestial map visit logging to the console
+verbose = True
+# time moves, scans, visits, freighters and GUI refreshes (see instrumentation.py)
+instrumentation = False
+# where App writes the instrumentation stats on exit
+stats_file = "session_stats.json"
 
 # rate as a percent
 frieghtor_rate = 2
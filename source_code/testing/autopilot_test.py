@@ -0,0 +1,80 @@
+"""
+Pytest Test Suite for the Autopilot
+
+Tests A* routes around hazards, the route cache and flying a route
+through the headless GameEngine.
+
+Run with: pytest autopilot_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from Autopilot import Autopilot
+from GameEngine import GameEngine
+from StarMap import StarMap
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Engine on a small map with a wall of hazards between the ship and the target"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    planets = {"Home": (0, 0), "Goal": (4, 0)}
+    artifacts = {f"Rock{y}": {"type": "ASTEROID" if y % 2 else "BAD-MAX", "x": 2, "y": y} for y in range(-3, 4)}
+    artifacts["Hole"] = {"type": "WORM-HOLE", "x": 1, "y": 4}
+    return GameEngine(seed=0, star_map=StarMap(planets, "Goal", artifacts))
+
+
+def walk(start, directions):
+    steps = {"up": (0, 1), "down": (0, -1), "left": (-1, 0), "right": (1, 0)}
+    cells = [start]
+    for direction in directions:
+        dx, dy = steps[direction]
+        cells.append((cells[-1][0] + dx, cells[-1][1] + dy))
+    return cells
+
+
+def test_route_avoids_hazards(engine):
+    """Test that the route is as short as possible without touching a hazard"""
+    route = Autopilot(engine).plan_to_target()
+    cells = walk((0, 0), route.directions)
+    assert cells[-1] == (4, 0)
+    assert not any(x == 2 and -3 <= y <= 3 for x, y in cells)
+    assert len(route.directions) == 4 + 2 * 4        # around the end of the wall
+    assert route.energy == len(route.directions) * 10
+
+
+def test_routes_cached_until_map_changes(engine):
+    """Test that a plan is reused until the star map is invalidated"""
+    pilot = Autopilot(engine)
+    first = pilot.plan((0, 0), (4, 0))
+    assert pilot.plan((0, 0), (4, 0)) is first
+    del engine.star_map.artifacts["Rock0"]
+    engine.star_map.invalidate_index()
+    assert len(pilot.plan((0, 0), (4, 0)).directions) == 4
+
+
+def test_unreachable_goal(engine):
+    """Test that goals beyond the wormhole boundary have no route"""
+    assert Autopilot(engine).plan((0, 0), (shared_items.max + 1, 0)) is None
+
+
+def test_engage_flies_the_route(engine):
+    """Test that engaging moves the ship to the target in batched steps"""
+    pilot = Autopilot(engine)
+    route = pilot.plan_to_target()
+    energy = engine.ship.debug_energy()
+    events = pilot.engage()
+    assert tuple(engine.ship.debug_position()) == (4, 0)
+    assert engine.ship.debug_energy() == energy - route.energy
+    assert len(events) < len(route.directions)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,241 @@
+"""
+Pytest-benchmark Suite for the game's hot paths
+
+Times get_game_data parsing, Sensor.scan, Ship.addSensor/addSensors with
+many sensors, celestial_map.visit/print_celestial_map and Ship.move on a
+small (ARTIFACT.TXT), medium (10^4 objects) and huge (10^6 objects,
+only with BENCH_HUGE=1) map from universe_generator.
+
+Benchmarks are not functional tests: the module only runs with BENCH=1, so
+a plain pytest run skips it, and it is skipped when pytest-benchmark isn't
+installed.
+
+Median times are compared with the JSON baseline committed next to this file
+and a benchmark fails when it is more than the threshold slower. The
+baseline holds one machine's timings, so record your own before comparing
+(and commit it again when a change is meant to be slower or faster):
+    BENCH=1 BENCH_SAVE=1 pytest benchmark_test.py
+
+Environment variables:
+    BENCH=1          run the benchmarks
+    BENCH_BASELINE   baseline file, defaults to testing/benchmark_baseline.json
+    BENCH_SAVE=1     write this run's medians to the baseline instead of comparing
+    BENCH_THRESHOLD  allowed slowdown as a fraction, defaults to 0.25
+    BENCH_HUGE=1     also run the huge map
+
+Run with: BENCH=1 pytest benchmark_test.py -v
+"""
+
+import contextlib
+import gc
+import json
+import pytest
+import sys
+import os
+
+if os.environ.get("BENCH") != "1":
+    pytest.skip("benchmarks only run with BENCH=1", allow_module_level=True)
+pytest.importorskip("pytest_benchmark")
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from celestial_map import celestial_map
+from GameRNG import GameRNG
+from load_artifacts import clear_game_data_cache, get_game_data
+from Sensor import Sensor
+from Ship import Ship
+from StarMap import StarMap
+from universe_generator import generate_universe
+
+BASELINE_PATH = os.environ.get(
+    "BENCH_BASELINE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json"))
+SAVE_BASELINE = os.environ.get("BENCH_SAVE") == "1"
+THRESHOLD = float(os.environ.get("BENCH_THRESHOLD", "0.25"))
+
+# Map size -> (planets, artifacts), None for ARTIFACT.TXT
+SIZES = {
+    "small": None,
+    "medium": (9000, 1000),
+    "huge": (900000, 100000),
+}
+# Sensors deployed and cells visited per round
+DEPLOYMENTS = 1000
+# Timed rounds per benchmark after one warmup round. The garbage collector is run before
+# and kept off during every round; with fewer rounds single slow ones (the OS, other
+# processes) move the median past the threshold.
+ROUNDS = 25
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    """Baseline medians by benchmark name, written back at the end with BENCH_SAVE=1"""
+    medians = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as file:
+            medians = json.load(file)
+    yield medians
+    if SAVE_BASELINE:
+        with open(BASELINE_PATH, "w") as file:
+            json.dump(medians, file, indent=2, sort_keys=True)
+
+
+@pytest.fixture
+def check_baseline(benchmark, baseline, request):
+    """Call after the benchmark ran to compare its median with the baseline"""
+    def check():
+        if benchmark.stats is None:         # --benchmark-disable
+            return
+        name = request.node.name
+        median = benchmark.stats.stats.median
+        if SAVE_BASELINE:
+            baseline[name] = median
+        elif name in baseline and median > baseline[name] * (1 + THRESHOLD):
+            pytest.fail(f"{name} regressed: median {median:.6f}s vs baseline {baseline[name]:.6f}s")
+    return check
+
+
+@pytest.fixture(scope="module", params=list(SIZES))
+def game_map(request, tmp_path_factory):
+    """(text map path, parsed game data, StarMap) per map size"""
+    counts = SIZES[request.param]
+    if request.param == "huge" and os.environ.get("BENCH_HUGE") != "1":
+        pytest.skip("set BENCH_HUGE=1 to benchmark the huge map")
+    if counts is None:
+        path = "ARTIFACT.TXT"
+    else:
+        path = generate_universe(str(tmp_path_factory.mktemp("maps") / f"{request.param}.TXT"),
+                                 planets=counts[0], artifacts=counts[1], seed=314, clusters=50)
+    data = get_game_data(path)
+    return path, data, StarMap(data["planets"], data["target"], data["artifacts"])
+
+
+@pytest.fixture
+def quiet():
+    """Swallow the scan and visit logging so it doesn't flood the report"""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def measure(benchmark, func, setup=None, args=(), iterations=1):
+    """ Time func over ROUNDS rounds with a collected heap and the collector off
+
+        Args:
+            setup (callable): Returns the (args, kwargs) of a round, for benchmarks that need
+                              fresh state every round
+            args (tuple): Arguments of every call when there is no setup
+            iterations (int): Calls per round, for calls too short to time one by one
+    """
+    def prepare():
+        gc.collect()
+        return setup() if setup else (args, {})
+
+    def timed(*call_args):
+        gc.disable()
+        try:
+            for _ in range(iterations):
+                func(*call_args)
+        finally:
+            gc.enable()
+
+    benchmark.extra_info["iterations"] = iterations
+    benchmark.pedantic(timed, setup=prepare, rounds=ROUNDS, warmup_rounds=1)
+
+
+def deployment_cells(data):
+    """The first DEPLOYMENTS planet positions, repeating when there are fewer planets"""
+    cells = list(data["planets"].values())[:DEPLOYMENTS]
+    return [cells[i % len(cells)] for i in range(DEPLOYMENTS)]
+
+
+def test_parse_game_data(benchmark, check_baseline, game_map):
+    """Benchmark parsing the text map with a cold cache"""
+    path = game_map[0]
+
+    def setup():
+        clear_game_data_cache()
+        return (path,), {}
+
+    measure(benchmark, get_game_data, setup)
+    check_baseline()
+
+
+def test_sensor_scan(benchmark, check_baseline, game_map, quiet):
+    """Benchmark 50 radius 8 scans centred on a planet"""
+    _, data, star_map = game_map
+    position = next(iter(data["planets"].values()))
+    sensor = Sensor(position, 8, star_map, celestial_map({}))
+    measure(benchmark, sensor.scan, args=(position,), iterations=50)
+    check_baseline()
+
+
+def test_add_sensor_one_by_one(benchmark, check_baseline, game_map, quiet):
+    """Benchmark deploying DEPLOYMENTS sensors with Ship.addSensor"""
+    _, data, star_map = game_map
+    cells = deployment_cells(data)
+
+    def setup():
+        return (Ship("Bench", (0, 0), headless=True, star_map=star_map), celestial_map({})), {}
+
+    def deploy(ship, cel_map):
+        for x, y in cells:
+            ship._position = [x, y]
+            ship.addSensor(cel_map)
+
+    measure(benchmark, deploy, setup)
+    check_baseline()
+
+
+def test_add_sensors_bulk(benchmark, check_baseline, game_map, quiet):
+    """Benchmark deploying DEPLOYMENTS sensors with one Ship.addSensors call"""
+    _, data, star_map = game_map
+    cells = deployment_cells(data)
+
+    def setup():
+        return (Ship("Bench", (0, 0), headless=True, star_map=star_map), cells, celestial_map({})), {}
+
+    measure(benchmark, Ship.addSensors, setup)
+    check_baseline()
+
+
+def test_celestial_map_visit(benchmark, check_baseline, game_map, quiet):
+    """Benchmark recording DEPLOYMENTS planet visits in a fresh celestial map"""
+    _, data, _ = game_map
+    visits = list(data["planets"].items())[:DEPLOYMENTS]
+
+    def setup():
+        return (celestial_map({}),), {}
+
+    def visit(cel_map):
+        for name, position in visits:
+            cel_map.visit(position, name, None)
+
+    measure(benchmark, visit, setup)
+    check_baseline()
+
+
+def test_print_celestial_map(benchmark, check_baseline, game_map, quiet):
+    """Benchmark rendering a celestial map holding every planet 100 times"""
+    _, data, _ = game_map
+    cel_map = celestial_map(data["planets"])
+    measure(benchmark, cel_map.print_celestial_map, iterations=100)
+    check_baseline()
+
+
+def test_ship_move(benchmark, check_baseline, game_map, monkeypatch, quiet):
+    """Benchmark 1000 unit moves back and forth, freighter rolls included"""
+    monkeypatch.setattr(shared_items, "playstyle", "never dies")
+    ship = Ship("Bench", (0, 0), headless=True, rng=GameRNG(314), star_map=game_map[2])
+
+    def fly():
+        for _ in range(500):
+            ship.move(1, 0)
+            ship.move(1, 180)
+
+    measure(benchmark, fly)
+    check_baseline()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
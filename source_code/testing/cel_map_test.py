@@ -117,4 +117,106 @@ def test_visit_accepts_position(game_data):
     cm.visit(position, planet, artifact)
 
     assert tuple(position) in cm.map_data["visited"]
-    assert cm.map_data["visited_info"][tuple(position)]
\ No newline at end of file
+    assert cm.map_data["visited_info"][tuple(position)]
+
+
+def test_visit_deduplicates(game_data):
+    """ Test that repeated discoveries are only stored once per position
+
+    Args:
+        game_data (Dict): Python fixture dictionary for game data
+    """
+
+    cm = celestial_map(get_initial_planets(game_data))
+    cm.visit((1, 2), "Earth", None)
+    cm.visit([1, 2], "Earth", "Probe")
+    cm.visit((1, 2), None, "Probe")
+
+    assert cm.map_data["visited_info"][(1, 2)] == {"planets": ["Earth"], "artifacts": ["Probe"]}
+    assert cm.is_visited((1, 2))
+    assert not cm.is_visited((2, 1))
+
+
+def test_map_data_is_read_only(game_data):
+    """ Test that map_data can be read like before but not replaced
+
+    Args:
+        game_data (Dict): Python fixture dictionary for game data
+    """
+
+    cm = celestial_map(get_initial_planets(game_data))
+    with pytest.raises(TypeError):
+        cm.map_data["visited"] = set()
+    assert set(cm.map_data) == {"visited", "visited_info"}
+
+    cm.map_data["visited"].add((5, 5))
+    cm.map_data["visited_info"][(37, 37)]["planets"].append("Fake")
+    assert (5, 5) not in cm.map_data["visited"]
+    assert cm.map_data["visited_info"][(37, 37)]["planets"] == ["Celeron"]
+    assert not cm.is_visited((5, 5))
+
+
+def test_print_celestial_map(game_data):
+    """ Test the printed layout of the celestial map
+
+    Args:
+        game_data (Dict): Python fixture dictionary for game data
+    """
+
+    assert celestial_map({}).print_celestial_map() == "No locations visited yet."
+
+    cm = celestial_map(get_initial_planets(game_data))
+    cm.visit((-4, 9), None, "Rock")
+    assert cm.print_celestial_map().split("\n") == [
+        "",
+        "=== CELESTIAL MAP VISITS ===",
+        "Position: (37, 37) | Planets: Celeron | Artifacts: None",
+        "Position: (62, 100) | Planets: Xeon | Artifacts: None",
+        "Position: (110, 100) | Planets: Ryzen | Artifacts: None",
+        "Position: (-4, 9) | Planets: None | Artifacts: Rock",
+    ]
+
+
+def test_rendered_lines_update_on_visit(game_data):
+    """ Test that the rendered line buffer follows visits and notifies listeners
+
+    Args:
+        game_data (Dict): Python fixture dictionary for game data
+    """
+
+    cm = celestial_map(get_initial_planets(game_data))
+    changes = []
+    cm.add_line_listener(lambda index, appended: changes.append((index, appended)))
+
+    cm.visit((1, 1), "Earth", None)
+    cm.visit((1, 1), None, "Moonbase")
+    cm.visit((1, 1), "Earth", None)
+
+    assert changes == [(3, True), (3, False)]
+    assert cm.line_count() == 4
+    assert cm.rendered_lines(3) == ["Position: (1, 1) | Planets: Earth | Artifacts: Moonbase"]
+    assert cm.print_celestial_map().split("\n")[2:] == cm.rendered_lines()
+
+    state = cm.snapshot()
+    cm.visit((2, 2), "Mars", None)
+    cm.restore(state)
+    assert changes[-1] == (None, False)
+    assert cm.line_count() == 4
+
+
+def test_nearest_planet_only_known(game_data):
+    """ Test that nearest_planet only considers planets recorded on the map
+
+    Args:
+        game_data (Dict): Python fixture dictionary for game data
+    """
+
+    cm = celestial_map(get_initial_planets(game_data))
+    assert cm.nearest_planet((0, 0))[:2] == ("Celeron", (37, 37))
+
+    cm.visit((2, 3), None, "Rock")
+    assert cm.nearest_planet((0, 0))[0] == "Celeron"
+
+    cm.visit((3, 4), "Earth", None)
+    assert cm.nearest_planet((0, 0)) == ("Earth", (3, 4), 5.0)
+    assert celestial_map({}).nearest_planet((0, 0)) is None
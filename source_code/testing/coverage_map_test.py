@@ -0,0 +1,86 @@
+"""
+Pytest Test Suite for coverage-aware scanning
+
+Tests that scans with a CoverageMap only look at cells no earlier scan
+covered and still find everything a full scan finds.
+
+Run with: pytest coverage_map_test.py -v
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CoverageMap import CoverageMap, TILE
+from StarMap import StarMap
+from Sensor import Sensor
+from celestial_map import celestial_map
+
+
+@pytest.fixture
+def star_map():
+    """Random star map spread over several coverage tiles"""
+    rng = random.Random(18)
+    planets = {f"P{i}": (rng.randint(-90, 90), rng.randint(-90, 90)) for i in range(400)}
+    artifacts = {f"A{i}": {"type": "ASTEROID", "x": rng.randint(-90, 90), "y": rng.randint(-90, 90)}
+                 for i in range(400)}
+    return StarMap(planets, None, artifacts)
+
+
+def test_claim_returns_only_new_cells():
+    """Test that overlapping windows only hand back uncovered cells, across tiles"""
+    coverage = CoverageMap()
+    first = coverage.claim(TILE - 2, TILE + 1, -1, 1)
+    assert len(first) == 4 * 3
+    second = coverage.claim(TILE - 1, TILE + 2, -1, 1)
+    assert sorted(map(tuple, second.tolist())) == [(TILE + 2, -1), (TILE + 2, 0), (TILE + 2, 1)]
+    assert coverage.is_covered((TILE, 0)) and not coverage.is_covered((TILE + 3, 0))
+    assert len(coverage) == 15
+
+
+def test_snapshot_round_trip():
+    """Test that restore() brings back exactly the covered cells"""
+    coverage = CoverageMap()
+    coverage.mark_windows([(0, 0), (100, -70)], 2)
+    copy = CoverageMap()
+    copy.restore(coverage.snapshot())
+    assert len(copy) == len(coverage) == 50
+    assert copy.is_covered((102, -72))
+
+
+def test_carpet_finds_same_objects(star_map):
+    """Test that an overlapping sensor carpet records the same map as full scans"""
+    positions = [(x, y) for x in range(-30, 31, 2) for y in range(-30, 31, 3)]
+    full, covered = celestial_map({}), celestial_map({})
+    coverage = CoverageMap()
+    new_counts = []
+    for pos in positions:
+        Sensor(pos, 2, star_map, full).scan(pos)
+        new_counts.append(len(Sensor(pos, 2, star_map, covered, coverage).scan(pos)))
+    assert dict(covered.map_data) == dict(full.map_data)
+    # Every object is reported once, by the first sensor that covered its cell
+    assert sum(new_counts) == len(star_map.query_window(0, 0, 32))
+
+
+def test_invalidate_index_resets_coverage():
+    """Test that editing the star map lets the ship's sensors scan covered cells again"""
+    from Ship import Ship
+    planets = {"Alpha": (1, 1)}
+    star_map = StarMap(planets, None, {})
+    ship = Ship("Probe", (0, 0), headless=True, star_map=star_map)
+    ship.addSensor(None)
+    assert ship._coverage.is_covered((1, 1))
+    planets["Beta"] = (0, 1)
+    star_map.invalidate_index()
+    assert not ship._coverage.is_covered((1, 1))
+    found = ship._sensors.get((0, 0)).scan((0, 0))
+    assert {obj["name"] for obj in found} == {"Alpha", "Beta"}
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
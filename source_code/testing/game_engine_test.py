@@ -0,0 +1,118 @@
+"""
+Pytest Test Suite for the headless GameEngine
+
+Tests that games can be simulated without a display and that the
+engine reports moves, freighters, wormholes and deaths as events.
+
+Run with: pytest game_engine_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from GameEngine import GameEngine
+from Ship import Ship
+from StarMap import StarMap
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Headless engine with freighters switched off"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    return GameEngine()
+
+
+def test_engine_is_headless(engine):
+    """Test that the engine's ship never builds a control panel"""
+    assert engine.ship._control_panel is None
+
+
+def test_step_moves_ship(engine):
+    """Test that a direction command moves one unit and reports it"""
+    events = engine.step("up")
+    assert events == [{"type": "move", "direction": "up", "position": (0, 1)}]
+    engine.step("right")
+    assert engine.ship.debug_position() == [1, 1]
+
+
+def test_repeated_move_matches_single_steps(engine):
+    """Test that one batched move costs the same as that many single moves"""
+    other = GameEngine()
+    engine.step("up", 5)
+    other.run(["up"] * 5)
+    assert engine.ship.debug_position() == other.ship.debug_position() == [0, 5]
+    assert engine.ship.debug_energy() == other.ship.debug_energy()
+    assert engine.ship.debug_supplies() == other.ship.debug_supplies()
+
+
+def test_repeated_move_through_wormhole_matches_single_steps(monkeypatch):
+    """Test that a batch crossing the boundary keeps flying from the wormhole exit"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    batched, single = GameEngine(seed=5), GameEngine(seed=5)
+    events = batched.step("right", shared_items.max + 5)
+    single.run(["right"] * (shared_items.max + 5))
+    assert [e["type"] for e in events] == ["wormhole", "move"]
+    assert batched.ship.debug_position() == single.ship.debug_position()
+    assert batched.ship.debug_supplies() == single.ship.debug_supplies()
+    assert batched.ship.debug_energy() == single.ship.debug_energy()
+
+
+def test_unknown_command(engine):
+    """Test that bad commands are rejected"""
+    with pytest.raises(ValueError):
+        engine.step("sideways")
+
+
+def test_wormhole_event(engine):
+    """Test that leaving the map is reported instead of raised"""
+    events = engine.run(["right"] * (shared_items.max + 1))
+    assert [e["type"] for e in events].count("wormhole") == 1
+
+
+def test_run_stops_at_death(engine):
+    """Test that run() ends the game when supplies run out"""
+    events = engine.run(["up", "down"] * 200)
+    assert engine.game_over
+    assert {"type": "death", "cause": "Supplies"} in events
+    assert engine.step("up") == []
+
+
+def test_frieghtor_event_callback(monkeypatch):
+    """Test that freighter finds reach the callback, no popups"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 100)
+    seen = []
+    engine = GameEngine(on_event=seen.append)
+    engine.step("up")
+    assert seen[0]["type"] == "frieghtor"
+    assert engine.ship.debug_energy() > shared_items.energy - 10
+
+
+def test_sensor_command(engine):
+    """Test that sensor deployment is reported"""
+    events = engine.step("sensor")
+    assert events[-1]["type"] == "sensor"
+    assert events[-1]["added"] is True
+    assert len(engine.sensors) == 1
+
+
+
+def test_cel_map_follows_ship_star_map():
+    """Test that an existing ship's own star map seeds the celestial map"""
+    star_map = StarMap({"Celeron": (5, 5), "Xeon": (-3, 8), "Elsewhere": (40, 40)}, "Xeon", {})
+    ship = Ship("Custom", (0, 0), headless=True, star_map=star_map)
+    engine = GameEngine(ship=ship, seed=1)
+    assert engine.star_map is star_map
+    assert engine.cel_map.map_data["visited_info"] == {
+        (5, 5): {"planets": ["Celeron"], "artifacts": []},
+        (-3, 8): {"planets": ["Xeon"], "artifacts": []},
+    }
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,89 @@
+"""
+Pytest Test Suite for the hot-path instrumentation
+
+Tests that nothing is patched while instrumentation is off, that moves,
+scans, visits and freighters are counted and timed once it is on, and
+that the stats export as JSON. Also tests the shared_items.verbose switch.
+
+Run with: pytest instrumentation_test.py -v
+"""
+
+import json
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import instrumentation
+import shared_items
+from GameEngine import GameEngine
+from Sensor import Sensor
+from Ship import Ship
+
+
+@pytest.fixture
+def instrumented():
+    """Instrumentation switched on with empty stats, and off again afterwards"""
+    instrumentation.reset()
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_leaves_methods_untouched():
+    """Test that enable() wraps methods and disable() restores the originals"""
+    original_move, original_scan = Ship.__dict__["move"], Sensor.__dict__["scan"]
+    instrumentation.enable()
+    try:
+        assert instrumentation.is_enabled()
+        assert Ship.__dict__["move"] is not original_move
+        assert Ship.__dict__["move"].__wrapped__ is original_move
+    finally:
+        instrumentation.disable()
+    assert not instrumentation.is_enabled()
+    assert Ship.__dict__["move"] is original_move
+    assert Sensor.__dict__["scan"] is original_scan
+
+
+def test_counts_moves_scans_and_visits(instrumented, monkeypatch):
+    """Test that a batched move counts its unit moves and sensors count scans and visits"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 100)
+    engine = GameEngine(seed=5)
+    engine.step("up", 3)
+    engine.step("sensor")
+    stats = instrumentation.stats()
+    assert stats["step"]["count"] == 2
+    assert stats["move"]["count"] == 3
+    assert stats["frieghtor"]["count"] == 3
+    assert stats["scan"]["count"] == 1
+    assert sum(stats["move"]["histogram"].values()) == 3
+    assert stats["move"]["max_ms"] <= stats["move"]["total_ms"]
+
+
+def test_export_json(instrumented, tmp_path):
+    """Test that the exported file holds the same stats"""
+    GameEngine(seed=1).step("right")
+    path = instrumentation.export_json(str(tmp_path / "stats.json"))
+    with open(path) as file:
+        assert json.load(file) == json.loads(json.dumps(instrumentation.stats()))
+    assert instrumentation.format_stats()[0].startswith("move: 1 calls")
+
+
+def test_verbose_off_silences_scans(monkeypatch, capsys):
+    """Test that sensor scan logging only prints while shared_items.verbose is set"""
+    ship = Ship("Quiet", (0, 0), headless=True)
+    capsys.readouterr()
+    monkeypatch.setattr(shared_items, "verbose", False)
+    ship.addSensor(None)
+    assert capsys.readouterr().out == ""
+    monkeypatch.setattr(shared_items, "verbose", True)
+    ship.move(1, 0)
+    ship.addSensor(None)
+    assert "Scan complete" in capsys.readouterr().out
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,77 @@
+"""
+Pytest Test Suite for the k-d tree and StarMap nearest-object queries
+
+Tests nearest-k, within-radius and closest-by-type queries against
+brute force passes over the same points.
+
+Run with: pytest kdtree_test.py -v
+"""
+
+import math
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from KDTree import KDTree
+from StarMap import StarMap
+
+
+@pytest.fixture
+def points():
+    """Random integer points with plenty of duplicates and ties"""
+    rng = random.Random(20)
+    return [(rng.randint(-30, 30), rng.randint(-30, 30)) for _ in range(500)]
+
+
+def brute_nearest(points, x, y, k):
+    ranked = sorted((math.sqrt((p[0] - x) * (p[0] - x) + (p[1] - y) * (p[1] - y)), i)
+                    for i, p in enumerate(points))
+    return ranked[:k]
+
+
+def test_nearest_matches_brute_force(points):
+    """Test nearest-k results, including tie order, for many query points"""
+    tree = KDTree(points)
+    rng = random.Random(1)
+    for _ in range(200):
+        x, y = rng.uniform(-40, 40), rng.uniform(-40, 40)
+        k = rng.randint(1, 12)
+        assert tree.nearest(x, y, k) == brute_nearest(points, x, y, k)
+
+
+def test_within_matches_brute_force(points):
+    """Test radius queries, boundary points included"""
+    tree = KDTree(points)
+    for x, y, radius in [(0, 0, 5), (10, -3, 0), (-30, 30, 12.5), (3, 4, 100)]:
+        expected = [i for i, p in enumerate(points) if math.dist(p, (x, y)) <= radius]
+        assert tree.within(x, y, radius) == expected
+
+
+def test_empty_tree():
+    """Test that an empty tree answers every query with nothing"""
+    tree = KDTree([])
+    assert tree.nearest(0, 0, 3) == [] and tree.within(0, 0, 10) == []
+
+
+def test_star_map_queries():
+    """Test the StarMap wrappers, including closest artifact by type"""
+    planets = {"Far": (40, 40), "Near": (1, 1), "Mid": (-5, 0)}
+    artifacts = {"Rock": {"type": "ASTEROID", "x": 2, "y": 0},
+                 "Hole": {"type": "WORM-HOLE", "x": 0, "y": 1},
+                 "Boulder": {"type": "ASTEROID", "x": -9, "y": 9}}
+    star_map = StarMap(planets, "Far", artifacts)
+    assert [name for name, _, _ in star_map.nearest_planets((0, 0), 2)] == ["Near", "Mid"]
+    assert star_map.closest_artifact((0, 0)) == ("Hole", (0, 1), 1.0)
+    assert star_map.closest_artifact((0, 0), "ASTEROID") == ("Rock", (2, 0), 2.0)
+    assert star_map.closest_artifact((0, 0), "BAD-MAX") is None
+    assert [name for name, _, _ in star_map.planets_within((0, 0), 6)] == ["Near", "Mid"]
+    assert star_map.distance_to_target((40, 37)) == 3.0
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Pytest Test Suite for load_artifacts
+
+Tests parsing of ARTIFACT.TXT style files and the shared game-data cache.
+
+Run with: pytest load_artifacts_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import load_artifacts
+from load_artifacts import get_game_data, iter_game_records, GameRecord
+
+
+MAP_TEXT = """# test map
+PLANETS
+Alpha 1,2
+Beta 3,4
+
+TARGET
+Beta
+
+ARTIFACTS
+Rock ASTEROID 5,6   # trailing comment
+"""
+
+
+@pytest.fixture
+def map_file(tmp_path):
+    """Write a small map file and return its absolute path"""
+    path = tmp_path / "MAP.TXT"
+    path.write_text(MAP_TEXT)
+    yield str(path)
+    load_artifacts.clear_game_data_cache()
+
+
+def test_parse_sections(map_file):
+    """Test that all three sections are parsed"""
+    data = get_game_data(map_file)
+    assert dict(data["planets"]) == {"Alpha": (1, 2), "Beta": (3, 4)}
+    assert data["target"] == "Beta"
+    assert dict(data["artifacts"]["Rock"]) == {"type": "ASTEROID", "x": 5, "y": 6}
+
+
+def test_same_object_returned(map_file):
+    """Test that repeated loads share one parsed object"""
+    assert get_game_data(map_file) is get_game_data(map_file)
+
+
+def test_game_data_is_read_only(map_file):
+    """Test that consumers can't mutate the shared parse"""
+    data = get_game_data(map_file)
+    with pytest.raises(TypeError):
+        data["planets"]["Gamma"] = (0, 0)
+    with pytest.raises(TypeError):
+        data["artifacts"]["Rock"]["x"] = 0
+
+
+def test_cache_invalidated_on_change(map_file):
+    """Test that editing the file produces a fresh parse"""
+    first = get_game_data(map_file)
+    with open(map_file, "a") as file:
+        file.write("Comet ASTEROID 7,8\n")
+    second = get_game_data(map_file)
+    assert second is not first
+    assert "Comet" in second["artifacts"]
+
+
+def test_iter_game_records(map_file):
+    """Test that the streaming reader yields typed records in file order"""
+    records = list(iter_game_records(map_file))
+    assert records == [
+        GameRecord("planets", "Alpha", "PLANET", 1, 2),
+        GameRecord("planets", "Beta", "PLANET", 3, 4),
+        GameRecord("target", "Beta", None, None, None),
+        GameRecord("artifacts", "Rock", "ASTEROID", 5, 6),
+    ]
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
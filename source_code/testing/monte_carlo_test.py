@@ -0,0 +1,53 @@
+"""
+Pytest Test Suite for the Monte Carlo survival simulator
+
+Checks the vectorized simulator against the rules Ship.move applies.
+
+Run with: pytest monte_carlo_test.py -v
+"""
+
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from monte_carlo import simulate_survival, summarize_survival
+from GameEngine import GameEngine
+
+
+def test_matches_ship_without_frieghtors(monkeypatch):
+    """Test that every ship dies on the same move a real Ship does"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    engine = GameEngine()
+    engine.run(["up", "down"] * 500)
+
+    result = simulate_survival(1000, policy="random", seed=1)
+    assert result["died"].all()
+    assert (result["steps"] == engine.steps).all()
+
+
+def test_never_dies_playstyle(monkeypatch):
+    """Test that ships survive every step when they can't die"""
+    monkeypatch.setattr(shared_items, "playstyle", "never dies")
+    result = simulate_survival(100, max_steps=30, policy="right", seed=1)
+    assert not result["died"].any()
+    assert (result["steps"] == 30).all()
+    # Moving right from the origin always leaves the map on move max + 1
+    assert (result["wormholes"] >= 1).all()
+
+
+def test_seeded_runs_repeat():
+    """Test that the same seed gives the same distribution"""
+    first = summarize_survival(simulate_survival(5000, seed=7))
+    second = summarize_survival(simulate_survival(5000, seed=7))
+    assert first["mean_steps"] == second["mean_steps"]
+    assert np.array_equal(first["histogram"], second["histogram"])
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,49 @@
+"""
+Pytest Test Suite for the shared_items parameter sweep
+
+Run with: pytest param_sweep_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from param_sweep import expand_grid, sweep
+
+
+def test_expand_grid():
+    """Test that the grid expands to every combination"""
+    combos = expand_grid({"frieghtor_rate": [0, 5], "starting_engine": ["basic", "pro"]})
+    assert len(combos) == 4
+    assert {"frieghtor_rate": 5, "starting_engine": "pro"} in combos
+
+
+def test_expand_grid_rejects_unknown_setting():
+    """Test that typos in setting names are caught"""
+    with pytest.raises(ValueError):
+        expand_grid({"frieghter_rate": [1]})
+
+
+def test_sweep_is_deterministic():
+    """Test that results don't depend on the number of processes"""
+    grid = {"frieghtor_rate": [0, 20], "supply_useage": [1, 2]}
+    one = sweep(grid, games=3, max_moves=200, seed=9, processes=1)
+    two = sweep(grid, games=3, max_moves=200, seed=9, processes=2)
+    assert one == two
+
+
+def test_sweep_workers_use_swept_values():
+    """Test that every worker played its own configuration, read back from the returned rows"""
+    grid = {"frieghtor_rate": [0, 50], "supply_useage": [1, 2]}
+    rows = sweep(grid, games=3, max_moves=200, seed=9, processes=2)
+    assert [(row["frieghtor_rate"], row["supply_useage"]) for row in rows] == [(0, 1), (0, 2), (50, 1), (50, 2)]
+    assert all(row["mean_frieghtors"] == 0 for row in rows if row["frieghtor_rate"] == 0)
+    assert all(row["mean_frieghtors"] > 0 for row in rows if row["frieghtor_rate"] == 50)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+"""
+Pytest Test Suite for session recording and replay
+
+Tests that a recorded game replays to the same state and that seeking
+through checkpoints lands on the same state as playing straight through.
+
+Run with: pytest replay_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from GameEngine import GameEngine
+from Replay import record_session, read_input_log, ReplayEngine
+
+
+COMMANDS = ["up", "up", "sensor", "right", "down", "sensor", "left", "left"] * 6
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """Record a seeded game with freighters and return (log path, final engine)"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 20)
+    path = str(tmp_path / "session.rec")
+    engine = GameEngine(seed=1234)
+    with record_session(engine, path):
+        engine.step("right", 3)         # a batched key repeat
+        engine.run(COMMANDS)
+    return path, engine
+
+
+def test_log_is_one_byte_per_command(session):
+    """Test that the body holds a byte per command with batched moves expanded"""
+    path, engine = session
+    log = read_input_log(path)
+    assert log.seed == 1234
+    assert len(log) == 3 + len(COMMANDS)
+    assert [log.command(i) for i in range(4)] == ["right", "right", "right", "up"]
+
+
+def test_replay_reproduces_session(session):
+    """Test that replaying the log ends in the recorded game's state"""
+    path, engine = session
+    replay = ReplayEngine(path)
+    replay.run()
+    assert replay.engine.ship.get_state() == engine.ship.get_state()
+    assert replay.engine.cel_map.rendered_lines() == engine.cel_map.rendered_lines()
+
+
+def test_replay_batched_move_through_wormhole(tmp_path, monkeypatch):
+    """Test that a batch crossing a wormhole replays to the live game's state"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    path = str(tmp_path / "wormhole.rec")
+    engine = GameEngine(seed=5)
+    with record_session(engine, path):
+        events = engine.step("right", 15)
+        engine.step("up", 2)
+    assert "wormhole" in [e["type"] for e in events]
+    assert len(read_input_log(path)) == 17
+    replay = ReplayEngine(path)
+    replay.run()
+    assert replay.engine.ship.get_state() == engine.ship.get_state()
+
+
+def test_replay_records_units_flown_until_death(tmp_path, monkeypatch):
+    """Test that a batch cut short by death only logs the units flown"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    path = str(tmp_path / "death.rec")
+    engine = GameEngine(seed=2)
+    with record_session(engine, path):
+        engine.step("up", 10)
+        engine.step("down", 1000)
+    assert engine.game_over
+    assert len(read_input_log(path)) == shared_items.supplies // shared_items.supply_useage
+    replay = ReplayEngine(path)
+    replay.run()
+    assert replay.engine.ship.get_state() == engine.ship.get_state()
+
+
+def test_seek_with_checkpoints(session):
+    """Test that seeking back and forth matches a straight replay"""
+    path, _ = session
+    straight = ReplayEngine(path)
+    straight.seek(17)
+    expected = straight.engine.snapshot()
+
+    replay = ReplayEngine(path, checkpoint_interval=5)
+    replay.run()
+    replay.seek(17)
+    assert replay.position == 17
+    assert replay.engine.ship.get_state() == expected["ship"]
+    assert replay.engine.rng.getstate() == expected["rng"]
+    assert replay.engine.cel_map.rendered_lines() == straight.engine.cel_map.rendered_lines()
+
+
+def test_negative_seed(tmp_path):
+    """Test that a game with a negative seed is recorded and replayed"""
+    path = str(tmp_path / "negative.rec")
+    engine = GameEngine(seed=-7)
+    with record_session(engine, path):
+        engine.run(["up", "right"])
+    assert read_input_log(path).seed == -7
+    replay = ReplayEngine(path)
+    replay.run()
+    assert replay.engine.ship.get_state() == engine.ship.get_state()
+
+
+def test_bad_log(tmp_path):
+    """Test that files that aren't session logs are rejected"""
+    path = tmp_path / "junk.rec"
+    path.write_bytes(b"not a log at all")
+    with pytest.raises(ValueError):
+        read_input_log(str(path))
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,106 @@
+"""
+Pytest Test Suite for saved games
+
+Tests that a saved game loads back to the same state, random stream
+included, and that broken files are rejected.
+
+Run with: pytest save_game_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from GameEngine import GameEngine
+from GameRNG import GameRNG
+from save_game import save_game, load_game
+
+
+COMMANDS = ["up", "sensor", "right", "right", "sensor", "down", "left", "sensor"] * 4
+
+
+def test_round_trip(tmp_path, monkeypatch):
+    """Test that a loaded game equals the saved one and plays on identically"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 25)
+    engine = GameEngine(seed="save-test", rng=GameRNG("save-test"))
+    engine.run(COMMANDS)
+    path = save_game(engine, str(tmp_path / "game.sav"))
+
+    loaded = load_game(path, star_map=engine.star_map)
+    assert loaded.seed == "save-test"
+    assert loaded.steps == engine.steps
+    assert loaded.ship.get_state() == engine.ship.get_state()
+    assert type(loaded.ship.debug_energy()) is type(engine.ship.debug_energy())
+    assert loaded.cel_map.print_celestial_map() == engine.cel_map.print_celestial_map()
+    assert dict(loaded.cel_map.map_data) == dict(engine.cel_map.map_data)
+    assert loaded.run(COMMANDS) == engine.run(COMMANDS)
+
+
+def test_load_without_star_map(tmp_path, monkeypatch):
+    """Test that loading without a star map plays on ARTIFACT.TXT without compiling it"""
+    import map_compiler
+
+    def no_compile(*args, **kwargs):
+        raise AssertionError("load_game must not write a compiled map")
+
+    monkeypatch.setattr(map_compiler, "compile_map", no_compile)
+    monkeypatch.setattr(map_compiler, "compiled_path", lambda filename: str(tmp_path / "missing.gmap"))
+    engine = GameEngine(seed=3)
+    engine.step("sensor")
+    loaded = load_game(save_game(engine, str(tmp_path / "game.sav")))
+    assert list(loaded.star_map.planets) == list(engine.star_map.planets)
+    assert loaded.cel_map.rendered_lines() == engine.cel_map.rendered_lines()
+    assert len(loaded.sensors) == 1
+
+
+def test_name_and_footprints_survive(tmp_path, monkeypatch):
+    """Test that the ship name and each sensor's footprint are saved"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    engine = GameEngine(name="Saved Spice", seed=4)
+    engine.step("sensor")
+    monkeypatch.setattr(shared_items, "sensor_footprint", "circle")
+    engine.step("up")
+    engine.step("sensor")
+    path = save_game(engine, str(tmp_path / "game.sav"))
+
+    monkeypatch.setattr(shared_items, "sensor_footprint", "square")
+    loaded = load_game(path, star_map=engine.star_map)
+    assert loaded.ship.debug_name() == "Saved Spice"
+    assert dict(loaded.sensors.footprints()) == {(0, 0): "square", (0, 1): "circle"}
+
+
+def test_sensors_load_without_indexing(tmp_path):
+    """Test that loaded sensors stay columns until first used, and then match the save"""
+    engine = GameEngine(seed=6)
+    engine.ship.addSensors([(x, y) for x in range(-30, 30) for y in range(-30, 30)], None)
+    loaded = load_game(save_game(engine, str(tmp_path / "game.sav")), star_map=engine.star_map)
+    assert loaded.sensors._columns is not None
+    assert len(loaded.sensors) == 3600
+    assert (29, -30) in loaded.sensors
+    assert loaded.sensors._columns is None
+    assert loaded.ship.get_state() == engine.ship.get_state()
+
+
+def test_rejects_bad_files(tmp_path):
+    """Test that foreign and truncated files raise ValueError"""
+    path = str(tmp_path / "game.sav")
+    save_game(GameEngine(seed=1), path)
+    with open(path, "rb") as file:
+        data = file.read()
+    with open(path, "wb") as file:
+        file.write(data[:-3])
+    with pytest.raises(ValueError):
+        load_game(path)
+    with open(path, "wb") as file:
+        file.write(b"hello")
+    with pytest.raises(ValueError):
+        load_game(path)
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,107 @@
+"""
+Pytest Test Suite for sensor footprints and radius tiers
+
+Tests the precomputed square and circular offset tables, ring-only
+rescans on upgrade and tier progression on the ship.
+
+Run with: pytest sensor_masks_test.py -v
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from sensor_masks import footprint_offsets, ring_offsets
+from StarMap import StarMap
+from Sensor import Sensor
+from GameEngine import GameEngine
+
+
+@pytest.fixture
+def star_map():
+    """Dense random star map around the origin"""
+    rng = random.Random(19)
+    planets = {f"P{i}": (rng.randint(-12, 12), rng.randint(-12, 12)) for i in range(150)}
+    artifacts = {f"A{i}": {"type": "ASTEROID", "x": rng.randint(-12, 12), "y": rng.randint(-12, 12)}
+                 for i in range(150)}
+    return StarMap(planets, None, artifacts)
+
+
+def names(found):
+    return sorted(obj["name"] for obj in found)
+
+
+def test_offset_tables():
+    """Test footprint sizes and that a ring is exactly the difference of two footprints"""
+    assert len(footprint_offsets(2, "square")) == 25
+    assert len(footprint_offsets(2, "circle")) == 13
+    for footprint in ("square", "circle"):
+        ring = set(map(tuple, ring_offsets(2, 5, footprint).tolist()))
+        outer = set(map(tuple, footprint_offsets(5, footprint).tolist()))
+        inner = set(map(tuple, footprint_offsets(2, footprint).tolist()))
+        assert ring == outer - inner
+
+
+def test_circle_scan_matches_distance_filter(star_map):
+    """Test that a circular sensor finds exactly the objects within its radius"""
+    found = Sensor((1, -1), 5, star_map, footprint="circle").scan((1, -1))
+    expected = [n for _, _, n, (x, y) in star_map.query_window(1, -1, 5) if (x - 1) ** 2 + (y + 1) ** 2 <= 25]
+    assert names(found) == sorted(expected)
+
+
+@pytest.mark.parametrize("footprint", ["square", "circle"])
+def test_upgrade_scans_only_the_ring(star_map, footprint):
+    """Test that an upgrade reports just the objects the bigger footprint adds"""
+    sensor = Sensor((0, 0), 2, star_map, footprint=footprint)
+    inner = sensor.scan((0, 0))
+    ring = sensor.upgrade(5)
+    full = Sensor((0, 0), 5, star_map, footprint=footprint).scan((0, 0))
+    assert names(inner + ring) == names(full)
+    assert not set(names(inner)) & set(names(ring))
+
+
+def test_scan_many_circle(star_map):
+    """Test the vectorized batch scan with a circular footprint"""
+    (planets, artifacts), = star_map.scan_many([(3, 3)], 4, footprint="circle")
+    batch = [star_map.planet_names[i] for i in planets] + [star_map.artifact_names[i] for i in artifacts]
+    assert sorted(batch) == names(Sensor((3, 3), 4, star_map, footprint="circle").scan((3, 3)))
+
+
+def test_ship_upgrades_through_tiers(monkeypatch):
+    """Test that upgrades follow shared_items.sensor_radius_tiers and stop at the top"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    engine = GameEngine(seed=0)
+    engine.step("sensor")
+    ship = engine.ship
+    for tier in shared_items.sensor_radius_tiers[1:]:
+        assert ship.upgradeSensor((0, 0)) is True
+        assert ship.get_sensor((0, 0)).search_radius == tier
+    assert ship.upgradeSensor((0, 0)) is False
+    assert engine.sensors.radii()[(0, 0)] == shared_items.sensor_radius_tiers[-1]
+
+
+
+def test_sensor_keeps_its_footprint(monkeypatch):
+    """Test that a sensor keeps the footprint it was deployed with through restores"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    monkeypatch.setattr(shared_items, "sensor_footprint", "circle")
+    engine = GameEngine(seed=0)
+    engine.step("sensor")
+    state = engine.snapshot()
+    monkeypatch.setattr(shared_items, "sensor_footprint", "square")
+    engine.step("up")
+    engine.step("sensor")
+    engine.restore(state)
+    assert engine.sensors.footprints() == {(0, 0): "circle"}
+    assert engine.ship.get_sensor((0, 0)).footprint == "circle"
+    assert state["ship"]["sensors"] == [((0, 0), shared_items.sensor_radius_tiers[0], "circle")]
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,111 @@
+"""
+Pytest Test Suite for the ship's sensor registry
+
+Tests duplicate detection, lookup, removal and upgrades of sensors
+keyed by position.
+
+Run with: pytest sensor_registry_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shared_items
+from GameEngine import GameEngine
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Headless engine with freighters switched off"""
+    monkeypatch.setattr(shared_items, "frieghtor_rate", 0)
+    return GameEngine(seed=0)
+
+
+def test_duplicate_sensor_rejected(engine):
+    """Test that a second sensor on the same cell is refused and costs nothing"""
+    ship = engine.ship
+    assert ship.addSensor(engine.cel_map) is True
+    supplies = ship.debug_supplies()
+    assert ship.addSensor(engine.cel_map) is False
+    assert ship.debug_supplies() == supplies
+    assert len(engine.sensors) == 1
+
+
+def test_sensor_stays_put(engine):
+    """Test that a sensor keeps its own position after the ship moves"""
+    engine.step("sensor")
+    engine.step("up")
+    sensor = engine.ship.get_sensor((0, 0))
+    assert sensor.pos == (0, 0)
+    assert engine.ship.get_sensor((0, 1)) is None
+    assert engine.step("sensor")[-1]["added"] is True
+
+
+def test_remove_and_upgrade(engine):
+    """Test removing and upgrading sensors in place"""
+    ship = engine.ship
+    ship.addSensors([(0, 0), (5, 5), (0, 0)], engine.cel_map)
+    assert [sensor.pos for sensor in engine.sensors] == [(0, 0), (5, 5)]
+    assert ship.upgradeSensor((5, 5), 4) is True
+    assert ship.get_sensor((5, 5)).search_radius == 4
+    assert ship.removeSensor((0, 0)) is True
+    assert ship.removeSensor((0, 0)) is False
+    assert ship.upgradeSensor((0, 0), 4) is False
+    assert (0, 0) not in engine.sensors
+
+
+def test_bulk_add_builds_no_sensors(engine):
+    """Test that addSensors only registers positions, Sensor objects come on access"""
+    engine.ship.addSensors([(x, 0) for x in range(-5, 6)], engine.cel_map)
+    assert len(engine.sensors) == 11
+    assert engine.sensors._sensors == {}
+    assert engine.ship.get_sensor((3, 0)).pos == (3, 0)
+    assert list(engine.sensors._sensors) == [(3, 0)]
+
+
+@pytest.mark.parametrize("footprint", ["square", "circle"])
+def test_bulk_add_matches_single_adds(monkeypatch, footprint):
+    """Test that overlapping addSensors records exactly what repeated addSensor calls do"""
+    from celestial_map import celestial_map
+    from Ship import Ship
+    from StarMap import StarMap
+    monkeypatch.setattr(shared_items, "sensor_footprint", footprint)
+    planets = {"Celeron": (50, 50), "Near": (2, 1), "Shared": (3, 0), "Far": (6, 1), "Early": (-2, 0)}
+    artifacts = {"Rock": {"type": "ASTEROID", "x": 4, "y": -1}, "Hole": {"type": "WORM-HOLE", "x": 0, "y": 1}}
+    positions = [(1, 0), (4, 0), (5, 1), (1, 0)]
+    maps = []
+    for bulk in (True, False):
+        ship = Ship("Test", (-1, 0), headless=True, star_map=StarMap(planets, "Celeron", artifacts))
+        ship.addSensor(celestial_map({}))       # covers (-1, 0) and its neighbours first
+        cel_map = celestial_map({})
+        if bulk:
+            assert ship.addSensors(positions, cel_map) == 3
+        else:
+            for x, y in positions:
+                ship._position = [x, y]
+                ship.addSensor(cel_map)
+        maps.append(cel_map)
+    assert maps[0].rendered_lines() == maps[1].rendered_lines()
+    assert "Hole" not in maps[0].print_celestial_map()
+
+
+def test_sensor_records_into_map_of_its_call(engine):
+    """Test that each addSensor call records into the celestial map it was given"""
+    from celestial_map import celestial_map
+    first, second = celestial_map({}), celestial_map({})
+    engine.ship._position = [1, 2]          # TEST sits at (1, 2)
+    engine.ship.addSensor(first)
+    engine.ship._position = [1, 3]
+    engine.ship.addSensor(second)
+    assert first.is_visited((1, 2))
+    assert not second.is_visited((1, 2))
+    assert engine.ship.get_sensor((1, 2)).celestial_map is None
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+"""
+Pytest Test Suite for StarMap queries
+
+Tests the spatial index used by Sensor.scan against a brute force pass
+over every planet and artifact.
+
+Run with: pytest star_map_test.py -v
+"""
+
+import numpy as np
+import pytest
+import random
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from StarMap import StarMap
+from Sensor import Sensor
+from load_artifacts import get_game_data
+from map_compiler import get_compiled_map
+
+
+def brute_force(star_map, pos, radius):
+    """Linear pass with the original Sensor.scan bounds checks"""
+    x, y = pos
+    found = []
+    for name, (px, py) in star_map.planets.items():
+        if x - radius <= px <= x + radius and y - radius <= py <= y + radius:
+            found.append(('PLANET', name, (px, py)))
+    for name, data in star_map.artifacts.items():
+        if x - radius <= data['x'] <= x + radius and y - radius <= data['y'] <= y + radius:
+            found.append((data['type'], name, (data['x'], data['y'])))
+    return found
+
+
+@pytest.fixture
+def star_map():
+    """Random star map with objects on both sides of the origin"""
+    rng = random.Random(314)
+    planets = {f"P{i}": (rng.randint(-40, 40), rng.randint(-40, 40)) for i in range(300)}
+    artifacts = {f"A{i}": {"type": rng.choice(["ASTEROID", "WORM-HOLE"]),
+                           "x": rng.randint(-40, 40), "y": rng.randint(-40, 40)}
+                 for i in range(300)}
+    return StarMap(planets, "P0", artifacts)
+
+
+@pytest.mark.parametrize("radius", [0, 1, 2, 5])
+def test_query_window_matches_brute_force(star_map, radius):
+    """Test that grid queries return exactly the linear-scan results, in order"""
+    for x in range(-45, 46, 3):
+        for y in range(-45, 46, 3):
+            found = [(t, n, p) for _, t, n, p in star_map.query_window(x, y, radius)]
+            assert found == brute_force(star_map, (x, y), radius)
+
+
+def test_scan_detects_boundary_objects():
+    """Test that objects exactly on the window edge are detected"""
+    planets = {"Edge": (2, -2), "Outside": (3, 0)}
+    artifacts = {"Corner": {"type": "ASTEROID", "x": -2, "y": 2}}
+    sensor = Sensor((0, 0), 2, StarMap(planets, None, artifacts))
+    names = [obj['name'] for obj in sensor.scan((0, 0))]
+    assert names == ["Edge", "Corner"]
+
+
+def test_scan_many_matches_query_window(star_map):
+    """Test that the vectorized batch scan agrees with per-sensor queries"""
+    rng = random.Random(5)
+    positions = [(rng.randint(-45, 45), rng.randint(-45, 45)) for _ in range(700)]
+    results = star_map.scan_many(positions, 2, chunk_size=64)
+    assert len(results) == len(positions)
+    for (x, y), (planet_idx, artifact_idx) in zip(positions, results):
+        names = [star_map.planet_names[i] for i in planet_idx]
+        names += [star_map.artifact_names[i] for i in artifact_idx]
+        assert names == [n for _, _, n, _ in star_map.query_window(x, y, 2)]
+
+
+def test_scan_many_within_budget(star_map, monkeypatch):
+    """Test that halved chunks and sliced bands give the same hits as one broadcast"""
+    rng = random.Random(9)
+    positions = [(rng.randint(-45, 45), rng.randint(-45, 45)) for _ in range(200)]
+    expected = star_map.scan_many(positions, 6)
+    monkeypatch.setattr(sys.modules["StarMap"], "SCAN_BUDGET", 7)
+    for (p1, a1), (p2, a2) in zip(expected, star_map.scan_many(positions, 6)):
+        assert p1.tolist() == p2.tolist() and a1.tolist() == a2.tolist()
+
+
+def test_scan_many_empty_map():
+    """Test that a map without artifacts returns empty index arrays"""
+    results = StarMap({"Solo": (0, 0)}, None, {}).scan_many([(0, 0), (9, 9)], 2)
+    assert [list(p) for p, _ in results] == [[0], []]
+    assert all(len(a) == 0 for _, a in results)
+
+
+def test_compiled_map_round_trip(tmp_path):
+    """Test that the binary map holds the same data and scans the same"""
+    source = tmp_path / "MAP.TXT"
+    source.write_text("PLANETS\nAlpha 4,1\nBeta -3,2\nTARGET\nBeta\n"
+                      "ARTIFACTS\nRock ASTEROID 5,0\nHole WORM-HOLE -2,2\n")
+    compiled = get_compiled_map(str(source))
+    text_data = get_game_data(str(source))
+    assert dict(compiled.planets) == dict(text_data["planets"])
+    assert {n: dict(a) for n, a in compiled.artifacts.items()} == \
+           {n: dict(a) for n, a in text_data["artifacts"].items()}
+    assert compiled.target == "Beta"
+
+    star_map = compiled.star_map()
+    text_map = StarMap(text_data["planets"], text_data["target"], text_data["artifacts"])
+    positions = [(x, y) for x in range(-6, 7) for y in range(-3, 4)]
+    for (p1, a1), (p2, a2) in zip(star_map.scan_many(positions, 2), text_map.scan_many(positions, 2)):
+        assert list(p1) == list(p2) and list(a1) == list(a2)
+    assert star_map.query_window(4, 1, 1) == text_map.query_window(4, 1, 1)
+
+
+def test_compiled_map_rebuilt_when_stale(tmp_path):
+    """Test that editing the text file recompiles the binary"""
+    source = tmp_path / "MAP.TXT"
+    source.write_text("PLANETS\nAlpha 4,1\n")
+    assert len(get_compiled_map(str(source)).planets) == 1
+    source.write_text("PLANETS\nAlpha 4,1\nBeta 0,0\n")
+    assert list(get_compiled_map(str(source)).planets) == ["Alpha", "Beta"]
+
+
+def test_compiled_map_duplicate_names(tmp_path):
+    """Test that repeated names compile the same way get_game_data reads them"""
+    source = tmp_path / "MAP.TXT"
+    source.write_text("PLANETS\nAlpha 4,1\nBeta 0,0\nAlpha 7,7\n")
+    compiled = get_compiled_map(str(source))
+    assert dict(compiled.planets) == {"Alpha": (7, 7), "Beta": (0, 0)}
+
+
+def test_compile_map_closes_spooled_names_on_error(tmp_path, monkeypatch):
+    """Test that a malformed text map doesn't leak the spooled name files"""
+    import map_compiler
+    spooled = []
+    real_temporary_file = map_compiler.tempfile.TemporaryFile
+
+    def tracked():
+        spooled.append(real_temporary_file())
+        return spooled[-1]
+
+    monkeypatch.setattr(map_compiler.tempfile, "TemporaryFile", tracked)
+    source = tmp_path / "MAP.TXT"
+    source.write_text("PLANETS\nAlpha 4,1\nBeta zero,0\n")
+    with pytest.raises(ValueError):
+        map_compiler.compile_map(str(source))
+    source.write_text("PLANETS\nAlpha 4,1\n")
+    map_compiler.compile_map(str(source))
+    assert len(spooled) == 4
+    assert all(f.closed for f in spooled)
+
+
+def test_distance_and_energy_tables(star_map):
+    """Test that table lookups match distances computed on the spot"""
+    a, b = "P3", "P42"
+    (ax, ay), (bx, by) = star_map.planets[a], star_map.planets[b]
+    assert star_map.planet_distance(a, b) == abs(ax - bx) + abs(ay - by)
+    assert star_map.planet_distance(a, b, "euclidean") == pytest.approx(((ax - bx) ** 2 + (ay - by) ** 2) ** 0.5)
+    assert star_map.travel_energy(a, b, "upgraded") == 5 * star_map.planet_distance(a, b)
+    assert star_map.distance_table() is star_map.distance_table()
+    assert star_map.distance_table().dtype == np.float32
+    assert (star_map.energy_table("upgraded") == 5 * star_map.distance_table()).all()
+    assert list(star_map.export_tables()) == ["distance_manhattan", "distance_euclidean"]
+    with pytest.raises(ValueError):
+        star_map.energy_table("warp")
+
+
+def test_tables_saved_next_to_compiled_map(tmp_path):
+    """Test that saved tables are adopted by a fresh star map, and dropped when stale"""
+    source = tmp_path / "MAP.TXT"
+    source.write_text("PLANETS\nAlpha 4,1\nBeta -3,2\nGamma 0,0\n")
+    compiled = get_compiled_map(str(source))
+    compiled.save_tables(metrics=("manhattan", "euclidean"))
+    fresh = get_compiled_map(str(source)).star_map()
+    assert sorted(fresh.export_tables()) == ["distance_euclidean", "distance_manhattan"]
+    assert fresh.travel_energy("Alpha", "Beta", "basic") == 10 * 8
+
+    source.write_text("PLANETS\nAlpha 4,1\nBeta -3,2\nGamma 0,0\nDelta 1,1\n")
+    assert get_compiled_map(str(source)).star_map().export_tables() == {}
+
+
+if __name__ == "__main__":
+    # Run tests with verbose output
+    pytest.main([__file__, "-v"])
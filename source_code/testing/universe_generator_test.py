@@ -0,0 +1,73 @@
+"""
+Pytest Test Suite for the procedural universe generator
+
+Tests that generated maps parse with get_game_data, are reproducible from
+their seed, respect the extent and artifact mix, and compile.
+
+Run with: pytest universe_generator_test.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add the parent directory to the path so we can import from source_code
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from load_artifacts import get_game_data
+from map_compiler import load_compiled_map
+from universe_generator import generate_universe, CHUNK
+
+
+def test_generated_map_parses(tmp_path):
+    """Test that every generated object is read back by get_game_data"""
+    path = generate_universe(str(tmp_path / "GEN.TXT"), planets=CHUNK + 5, artifacts=300, seed=3, extent=50)
+    data = get_game_data(path)
+    assert len(data["planets"]) == CHUNK + 5
+    assert len(data["artifacts"]) == 300
+    assert data["target"] in data["planets"]
+    assert all(-50 <= x <= 50 and -50 <= y <= 50 for x, y in data["planets"].values())
+
+
+def test_same_seed_same_file(tmp_path):
+    """Test that a seed always generates the same map and another seed doesn't"""
+    first = generate_universe(str(tmp_path / "A.TXT"), planets=200, artifacts=50, seed=9, clusters=4)
+    second = generate_universe(str(tmp_path / "B.TXT"), planets=200, artifacts=50, seed=9, clusters=4)
+    third = generate_universe(str(tmp_path / "C.TXT"), planets=200, artifacts=50, seed=10, clusters=4)
+    with open(first) as a, open(second) as b, open(third) as c:
+        text = a.read()
+        assert text == b.read()
+        assert text != c.read()
+
+
+def test_artifact_mix_and_clusters(tmp_path):
+    """Test that only types in the mix are drawn and clusters stay near their centres"""
+    path = generate_universe(str(tmp_path / "MIX.TXT"), planets=500, artifacts=500, seed=1, extent=1000,
+                             clusters=1, spread=2, artifact_mix={"ASTEROID": 1, "WORM-HOLE": 0})
+    data = get_game_data(path)
+    assert {a["type"] for a in data["artifacts"].values()} == {"ASTEROID"}
+    xs = [x for x, _ in data["planets"].values()]
+    assert max(xs) - min(xs) < 30
+
+
+def test_compile_writes_binary_map(tmp_path):
+    """Test that compile=True also writes the binary map of the same universe"""
+    path = generate_universe(str(tmp_path / "BIN.TXT"), planets=40, artifacts=10, seed=2, compile=True)
+    compiled = load_compiled_map(path)
+    data = get_game_data(str(tmp_path / "BIN.TXT"))
+    assert dict(compiled.planets.items()) == dict(data["planets"])
+    assert compiled.target == data["target"]
+
+
+def test_bad_arguments(tmp_path):
+    """Test that impossible universes are refused"""
+    with pytest.raises(ValueError):
+        generate_universe(str(tmp_path / "X.TXT"), planets=0)
+    with pytest.raises(ValueError):
+        generate_universe(str(tmp_path / "X.TXT"), planets=10 ** 7, artifacts=1)
+    with pytest.raises(ValueError):
+        generate_universe(str(tmp_path / "X.TXT"), artifact_mix={"ASTEROID": 0})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
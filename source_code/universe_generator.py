@@ -0,0 +1,118 @@
+"""
+Procedural universe generator
+
+Writes ARTIFACT.TXT style maps of any size for scale testing StarMap, Sensor,
+celestial_map and get_game_data. Planets are named P0, P1, ... and artifacts
+A0, A1, ...; positions are uniform over the extent or, with clusters, spread
+normally around cluster centres. Artifact types are drawn from a weighted mix.
+
+Objects are drawn and written CHUNK at a time, so memory use doesn't depend on
+the counts. The same seed and arguments always give the same file.
+
+Run with: python universe_generator.py OUT.TXT --planets 100000 --artifacts 10000 --compile
+"""
+import argparse
+import os
+
+import numpy as np
+
+from load_artifacts import _file_path
+from map_compiler import compile_map
+
+# Largest planets + artifacts a generated universe may hold
+MAX_OBJECTS = 10 ** 7
+# Objects drawn and written per batch
+CHUNK = 1 << 16
+# Artifact type -> relative weight, the types ARTIFACT.TXT uses
+DEFAULT_ARTIFACT_MIX = {
+    "WORM-HOLE": 3,
+    "ASTEROID": 3,
+    "ABANDONED-FREIGHTER": 2,
+    "BAD-MAX": 1,
+    "SPACE-STATION": 1,
+    "METEOR-STORM": 1,
+}
+
+
+def _positions(rng, count, extent, centres, spread):
+    # int64 (count, 2) positions inside +-extent
+    if centres is None:
+        return rng.integers(-extent, extent + 1, size=(count, 2))
+    picked = centres[rng.integers(0, len(centres), size=count)]
+    offsets = np.rint(rng.normal(0.0, spread, size=(count, 2))).astype(np.int64)
+    return np.clip(picked + offsets, -extent, extent)
+
+
+def generate_universe(filename, planets=1000, artifacts=100, seed=0, extent=None,
+                      clusters=0, spread=None, artifact_mix=None, compile=False) -> str:
+    """ Write a generated ARTIFACT.TXT style map
+
+        Args:
+            filename (str): Map to write, relative to source_code like get_game_data
+            planets (int): Number of planets, at least 1
+            artifacts (int): Number of artifacts
+            seed (int): Seed of the generator
+            extent (int): Coordinates stay within +-extent, defaults to grow with the object count
+            clusters (int): Number of cluster centres, 0 for a uniform spread
+            spread (float): Standard deviation around a cluster centre, defaults to extent / 20
+            artifact_mix (dict): Artifact type -> relative weight, defaults to DEFAULT_ARTIFACT_MIX
+            compile (bool): Also write the binary map with compile_map
+
+        Returns:
+            str: Path of the binary map when compile is set, otherwise of the text map
+    """
+    if planets < 1 or artifacts < 0:
+        raise ValueError("a universe needs at least one planet and no negative counts")
+    if planets + artifacts > MAX_OBJECTS:
+        raise ValueError(f"at most {MAX_OBJECTS} objects can be generated")
+    mix = artifact_mix or DEFAULT_ARTIFACT_MIX
+    types = list(mix)
+    weights = np.array([mix[t] for t in types], dtype=np.float64)
+    if len(types) == 0 or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError("artifact_mix needs at least one type with a positive weight")
+    weights /= weights.sum()
+    if extent is None:
+        extent = max(10, int(np.sqrt(planets + artifacts)) * 4)
+    if spread is None:
+        spread = extent / 20
+
+    rng = np.random.Generator(np.random.PCG64(seed))
+    centres = rng.integers(-extent, extent + 1, size=(clusters, 2)) if clusters > 0 else None
+    target = int(rng.integers(0, planets))
+
+    path = _file_path(filename)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as out:
+        out.write(f"# Generated universe: seed {seed}, {planets} planets, {artifacts} artifacts\n\nPLANETS\n")
+        for start in range(0, planets, CHUNK):
+            count = min(CHUNK, planets - start)
+            xy = _positions(rng, count, extent, centres, spread).tolist()
+            out.write("".join(f"P{start + i}\t{x},{y}\n" for i, (x, y) in enumerate(xy)))
+
+        out.write(f"\nTARGET\nP{target}\n\nARTIFACTS\n")
+        for start in range(0, artifacts, CHUNK):
+            count = min(CHUNK, artifacts - start)
+            xy = _positions(rng, count, extent, centres, spread).tolist()
+            codes = rng.choice(len(types), size=count, p=weights).tolist()
+            out.write("".join(f"A{start + i}\t{types[c]}\t{x},{y}\n"
+                              for i, ((x, y), c) in enumerate(zip(xy, codes))))
+    os.replace(temp_path, path)
+
+    if compile:
+        return compile_map(path)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a generated ARTIFACT.TXT style map")
+    parser.add_argument("filename")
+    parser.add_argument("--planets", type=int, default=1000)
+    parser.add_argument("--artifacts", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--extent", type=int, default=None)
+    parser.add_argument("--clusters", type=int, default=0)
+    parser.add_argument("--spread", type=float, default=None)
+    parser.add_argument("--compile", action="store_true")
+    args = parser.parse_args()
+    print(generate_universe(args.filename, args.planets, args.artifacts, args.seed, args.extent,
+                            args.clusters, args.spread, compile=args.compile))